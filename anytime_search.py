@@ -0,0 +1,220 @@
+import time
+
+from search_engine import BucketQueue, scale_cost, unscale_cost
+from state_store import StateStore
+from transition_model import get_transition_model
+
+"""
+anytime_search.py
+
+This file contains an anytime search (Anytime Repairing A*, ARA*), which finds a plan quickly with weighted A*, then
+repeatedly lowers the heuristic weight and improves the plan, reusing the search effort of earlier iterations, until
+a deadline passes or the plan is proven optimal.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Heuristic weight for the first iteration, and the amount the weight is lowered by after each iteration
+DEFAULT_INITIAL_WEIGHT = 5.0
+DEFAULT_WEIGHT_STEP = 0.25
+
+# Number of expansions between deadline checks
+DEADLINE_CHECK_INTERVAL = 1024
+
+
+class AnytimeSolution:
+    """
+    A plan found by AnytimeSearch, with the bound on its cost: plan_cost is at most bound times the optimal cost, and
+    lower_bound is a lower bound on the optimal cost (both as floats).
+    """
+
+    def __init__(self, path, plan_cost, weight, lower_bound, elapsed, nodes_expanded):
+        self.path = path
+        self.plan_cost = plan_cost
+        self.weight = weight
+        self.lower_bound = lower_bound
+        self.bound = plan_cost / lower_bound if lower_bound > 0 else 1.0
+        self.elapsed = elapsed
+        self.nodes_expanded = nodes_expanded
+
+    def __repr__(self):
+        return (f'cost: {self.plan_cost},\t weight: {round(self.weight, 4)},\t lower bound: {self.lower_bound},'
+                f'\t bound: {round(self.bound, 4)},\t time: {round(self.elapsed, 4)}s')
+
+
+class AnytimeSearch:
+    """
+    ARA* over dense state IDs (see GameEnv.encode_state).
+
+    Each iteration runs weighted A* (ordering by g + w * h) until the solved state's g-cost is no greater than the
+    smallest key on the open list; states whose g-cost improves after they were expanded in the current iteration are
+    set aside (the INCONS list) rather than reopened. Between iterations, the weight is lowered, the INCONS states are
+    moved back onto the open list, and the open list is re-keyed, so g-costs and parent pointers carry over. After
+    each iteration, the plan's suboptimality is bounded by its cost divided by the smallest g + h over the open and
+    INCONS states (with an admissible heuristic), and the next weight is never higher than this bound.
+    """
+
+    def __init__(self, game_env, initial_weight=DEFAULT_INITIAL_WEIGHT, weight_step=DEFAULT_WEIGHT_STEP):
+        """
+        :param game_env: GameEnv instance
+        :param initial_weight: heuristic weight for the first iteration
+        :param weight_step: amount the weight is lowered by after each iteration (down to 1)
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+        self.goal_id = game_env.get_solved_state_id()
+
+        self.solutions = []
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.iterations = 0
+        self.plan_cost = None
+
+    def search(self, heuristic, deadline=None, init_state=None, on_solution=None):
+        """
+        Find a plan, improving it until the deadline. The first plan is always completed, even after the deadline.
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in COST_SCALE units, or to None if the solved state is unreachable from it
+        :param deadline: seconds after starting to stop improving the plan (defaults to the level's
+            a_star_time_max_tgt, the run time for the maximum score); 0 stops at the first plan
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :param on_solution: optional function called with an AnytimeSolution for each plan found (the cost bound is
+            reported after every iteration)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS) of the cheapest plan
+            found, or None if the solved state is unreachable
+        """
+        game_env = self.game_env
+        if deadline is None:
+            deadline = game_env.a_star_time_max_tgt
+        if init_state is None:
+            init_state = game_env.get_init_state()
+        t0 = time.perf_counter()
+        stop_time = t0 + deadline
+        init_id = game_env.encode_state(init_state)
+
+        self.solutions = []
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.iterations = 0
+        self.plan_cost = None
+
+        get_successor_ids = game_env.get_successor_ids
+        action_costs = self.action_costs
+        goal_id = self.goal_id
+        store = StateStore(game_env)
+        h_values = {}
+
+        init_h = heuristic(init_id)
+        if init_h is None:
+            return None
+        h_values[init_id] = init_h
+        store.set(init_id, 0)
+
+        weight = self.initial_weight
+        # State ID -> key of its current open list entry; older entries for the state are stale
+        open_keys = {}
+        incons = set()
+        frontier = BucketQueue()
+        key = int(weight * init_h)
+        open_keys[init_id] = key
+        frontier.push(key, init_id)
+        best_path = None
+        checks_until_deadline = DEADLINE_CHECK_INTERVAL
+
+        while True:
+            self.iterations += 1
+            closed = set()
+            timed_out = False
+            while len(frontier) > 0:
+                key, state_id = frontier.pop()
+                if open_keys.get(state_id) != key:
+                    # Stale entry
+                    continue
+                if store.get_g(goal_id) <= key:
+                    # The plan is within the weight's bound; keep this entry for the next iteration
+                    frontier.push(key, state_id)
+                    break
+                if best_path is not None:
+                    checks_until_deadline -= 1
+                    if checks_until_deadline == 0:
+                        checks_until_deadline = DEADLINE_CHECK_INTERVAL
+                        if time.perf_counter() >= stop_time:
+                            # Keep the entry, so the state still counts towards the lower bound
+                            frontier.push(key, state_id)
+                            timed_out = True
+                            break
+                del open_keys[state_id]
+                closed.add(state_id)
+                self.nodes_expanded += 1
+
+                g = store.get_g(state_id)
+                for action_index, next_id in get_successor_ids(state_id):
+                    next_g = g + action_costs[action_index]
+                    if next_g < store.get_g(next_id):
+                        next_h = h_values.get(next_id)
+                        if next_h is None:
+                            next_h = heuristic(next_id)
+                            if next_h is None:
+                                continue
+                            h_values[next_id] = next_h
+                        store.set(next_id, next_g, action_index)
+                        self.nodes_generated += 1
+                        if next_id in closed:
+                            incons.add(next_id)
+                        else:
+                            key = int(next_g) + int(weight * next_h)
+                            open_keys[next_id] = key
+                            frontier.push(key, next_id)
+
+            goal_g = store.get_g(goal_id)
+            if goal_g == float('inf'):
+                # Open list exhausted without reaching the solved state
+                return None
+
+            # Lower bound on the optimal cost: every cheaper plan passes through an open or INCONS state
+            lower_bound = goal_g
+            for state_id in open_keys.keys() | incons:
+                f = store.get_g(state_id) + h_values[state_id]
+                if f < lower_bound:
+                    lower_bound = f
+            if best_path is None or unscale_cost(int(goal_g)) < self.plan_cost:
+                best_path = store.extract_path(goal_id)
+                self.plan_cost = unscale_cost(int(goal_g))
+            solution = AnytimeSolution(best_path, self.plan_cost, weight, unscale_cost(int(lower_bound)),
+                                       time.perf_counter() - t0, self.nodes_expanded)
+            self.solutions.append(solution)
+            if on_solution is not None:
+                on_solution(solution)
+
+            if timed_out or solution.bound <= 1.0 or weight <= 1.0 or time.perf_counter() >= stop_time:
+                break
+
+            # Lower the weight, move INCONS states back onto the open list and re-key it
+            weight = max(1.0, min(weight - self.weight_step, solution.bound))
+            for state_id in incons:
+                open_keys[state_id] = None
+            incons = set()
+            frontier = BucketQueue()
+            for state_id in open_keys:
+                key = int(store.get_g(state_id)) + int(weight * h_values[state_id])
+                open_keys[state_id] = key
+                frontier.push(key, state_id)
+
+        return best_path
+
+    def get_stats(self):
+        """
+        Get statistics of the most recent search.
+        :return: dict of statistic name to value
+        """
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "iterations": self.iterations,
+            "plan_cost": self.plan_cost,
+            "cost_bound": self.solutions[-1].bound if self.solutions else None,
+            "cost_lower_bound": self.solutions[-1].lower_bound if self.solutions else None,
+        }
@@ -0,0 +1,12 @@
+"""
+benchmarks
+
+This package contains benchmarks for the hot paths of the solver: GameEnv.perform_action throughput, successor
+generation, state memory usage, and end-to-end Solver searches on every testcase. Run with
+
+    python -m benchmarks.run [--output results.json] [--baseline baseline.json]
+
+from the repository root (see benchmarks/run.py for all options).
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
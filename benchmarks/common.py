@@ -0,0 +1,95 @@
+import glob
+import os
+import time
+from collections import deque
+
+"""
+common.py
+
+This file contains helpers shared by the benchmark modules: testcase discovery, sampling of reachable states,
+call timing and the metric record format.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+DEFAULT_TESTCASE_DIR = "testcases"
+
+# Minimum total measured time (in seconds) per timing sample
+DEFAULT_MIN_TIME = 0.2
+
+# Number of timing samples taken per measurement (the fastest is reported)
+DEFAULT_REPEAT = 3
+
+
+def find_testcases(testcase_dir=DEFAULT_TESTCASE_DIR, levels=None):
+    """
+    Find testcase files.
+    :param testcase_dir: directory containing level_<n>.txt files
+    :param levels: list of level names to include (e.g. ['level_1']), or None for all
+    :return: sorted list of (level name, filename) pairs
+    """
+    testcases = []
+    for filename in sorted(glob.glob(os.path.join(testcase_dir, "*.txt"))):
+        name = os.path.splitext(os.path.basename(filename))[0]
+        if levels is None or name in levels:
+            testcases.append((name, filename))
+    return testcases
+
+
+def sample_states(game_env, n_states):
+    """
+    Collect reachable states in breadth-first order from the initial state, so benchmarks exercise realistic states.
+    :param game_env: GameEnv instance
+    :param n_states: maximum number of states to collect
+    :return: list of GameState objects
+    """
+    init_state = game_env.get_init_state()
+    seen = {init_state}
+    states = [init_state]
+    queue = deque([init_state])
+    while queue and len(states) < n_states:
+        state = queue.popleft()
+        for action in game_env.ACTION_LIST:
+            try:
+                success, next_state = game_env.perform_action(state, action)
+            except (IndexError, ValueError):
+                continue
+            if success and next_state not in seen:
+                seen.add(next_state)
+                states.append(next_state)
+                queue.append(next_state)
+                if len(states) >= n_states:
+                    break
+    return states
+
+
+def time_per_call(func, n_calls, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Measure the time taken by func, which performs n_calls operations per invocation.
+    func is invoked repeatedly until min_time has elapsed, and this is repeated; the fastest sample is reported, as
+    it is the least affected by other load on the machine.
+    :return: seconds per operation (float)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        invocations = 0
+        t0 = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            func()
+            invocations += 1
+            elapsed = time.perf_counter() - t0
+        best = min(best, elapsed / (invocations * n_calls))
+    return best
+
+
+def make_metric(value, unit, higher_is_better, valid=True):
+    """
+    Build a metric record, as stored in benchmark JSON output.
+    :param value: measured value (int or float), or None if there is no valid measurement
+    :param unit: unit string (e.g. 'ops/s', 's', 'bytes')
+    :param higher_is_better: True if larger values are improvements (e.g. throughput)
+    :param valid: False if the measurement failed (e.g. the plan found does not solve the level)
+    :return: dict
+    """
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better, "valid": valid}
@@ -0,0 +1,119 @@
+import tracemalloc
+
+from benchmarks.common import make_metric, sample_states, time_per_call
+from game_env import GameEnv
+
+"""
+env_benchmarks.py
+
+This file contains micro-benchmarks for GameEnv: perform_action throughput per action type (with the reference and
+compiled transition rules), successor generation time per state, and memory used per stored state object.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+DEFAULT_SAMPLE_SIZE = 2000
+
+
+def bench_perform_action(level_name, filename, n_states=DEFAULT_SAMPLE_SIZE, **timing_args):
+    """
+    Measure perform_action throughput for each action type, over a sample of reachable states.
+    :return: dict of metric name -> metric record
+    """
+    metrics = {}
+    for compiled in (False, True):
+        game_env = GameEnv(filename, compiled=compiled)
+        states = sample_states(game_env, n_states)
+        mode = "compiled" if compiled else "reference"
+        for action in game_env.ACTION_LIST:
+            # Keep only states where the action does not raise, so every call does the same kind of work
+            valid_states = []
+            for state in states:
+                try:
+                    game_env.perform_action(state, action)
+                except (IndexError, ValueError):
+                    continue
+                valid_states.append(state)
+            if not valid_states:
+                continue
+
+            def run(perform_action=game_env.perform_action, valid_states=valid_states, action=action):
+                for state in valid_states:
+                    perform_action(state, action)
+
+            seconds = time_per_call(run, len(valid_states), **timing_args)
+            metrics[f"perform_action/{mode}/{level_name}/{action}"] = make_metric(1.0 / seconds, "ops/s", True)
+    return metrics
+
+
+def bench_successors(level_name, filename, n_states=DEFAULT_SAMPLE_SIZE, **timing_args):
+    """
+    Measure successor generation time per state, with the successor cache disabled, for GameState successors and
+    for dense state ID successors (one state per call, and all sampled states in one batched call).
+    :return: dict of metric name -> metric record
+    """
+    metrics = {}
+    game_env = GameEnv(filename, successor_cache_size=0)
+    states = sample_states(game_env, n_states)
+    state_ids = [game_env.encode_state(state) for state in states]
+
+    def run_states():
+        for state in states:
+            game_env.get_successors(state)
+
+    def run_ids():
+        for state_id in state_ids:
+            game_env.get_successor_ids(state_id)
+
+    def run_batch():
+        game_env.get_successor_ids_batch(state_ids)
+
+    metrics[f"get_successors/{level_name}"] = make_metric(
+        time_per_call(run_states, len(states), **timing_args), "s/state", False
+    )
+    metrics[f"get_successor_ids/{level_name}"] = make_metric(
+        time_per_call(run_ids, len(state_ids), **timing_args), "s/state", False
+    )
+    metrics[f"get_successor_ids_batch/{level_name}"] = make_metric(
+        time_per_call(run_batch, len(state_ids), **timing_args), "s/state", False
+    )
+    return metrics
+
+
+def bench_state_memory(level_name, filename, n_states=DEFAULT_SAMPLE_SIZE):
+    """
+    Measure the memory allocated per stored GameState and CompactState (including its trap status container),
+    using tracemalloc.
+    :return: dict of metric name -> metric record
+    """
+    metrics = {}
+    game_env = GameEnv(filename)
+    compact_states = [game_env.to_compact(state) for state in sample_states(game_env, n_states)]
+    # Each state is rebuilt with its own trap status container, as it would be when generated by perform_action
+    for name, build in (
+        ("GameState", game_env.from_compact),
+        ("CompactState", lambda s: type(s)(s.row, s.col, s.trap_bits)),
+    ):
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        stored = [build(compact_state) for compact_state in compact_states]
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Exclude the list holding the states
+        per_state = (after - before - stored.__sizeof__()) / len(stored)
+        metrics[f"state_memory/{name}/{level_name}"] = make_metric(round(per_state, 1), "bytes", False)
+    return metrics
+
+
+def run_all(testcases, **timing_args):
+    """
+    Run every environment benchmark on every testcase.
+    :param testcases: list of (level name, filename) pairs
+    :return: dict of metric name -> metric record
+    """
+    metrics = {}
+    for level_name, filename in testcases:
+        metrics.update(bench_perform_action(level_name, filename, **timing_args))
+        metrics.update(bench_successors(level_name, filename, **timing_args))
+        metrics.update(bench_state_memory(level_name, filename))
+    return metrics
@@ -0,0 +1,167 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks import env_benchmarks, search_benchmarks
+from benchmarks.common import DEFAULT_MIN_TIME, DEFAULT_REPEAT, DEFAULT_TESTCASE_DIR, find_testcases
+
+"""
+run.py
+
+Command line entry point for the benchmark suite. Results are written as JSON, and may be compared against a
+previously saved results file (the baseline): any metric which is worse than its baseline value by more than the
+regression threshold, or which is in the baseline but missing from the current run, is reported, and the exit status
+is 1.
+
+Usage: python -m benchmarks.run [--suite env|search|fallback|all] [--levels level_1 ...] [--output results.json]
+                                [--baseline baseline.json] [--threshold 0.1]
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.1
+
+
+def get_metadata():
+    """
+    Describe the environment the benchmarks were run in.
+    :return: dict
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": commit,
+    }
+
+
+def compare(metrics, baseline_metrics, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare metrics against baseline metrics.
+    :param metrics: dict of metric name -> metric record
+    :param baseline_metrics: dict of metric name -> metric record
+    :param threshold: allowed relative change in the worse direction (e.g. 0.1 for 10%)
+    :return: list of (name, baseline value, value, relative change, is regression) tuples for metrics present in
+        both, where relative change is positive when the metric improved. Invalid measurements have a value of None;
+        becoming invalid counts as an infinite regression, and becoming valid as an infinite improvement
+    """
+    rows = []
+    for name in sorted(metrics):
+        if name not in baseline_metrics:
+            continue
+        value = metrics[name]["value"]
+        old_value = baseline_metrics[name]["value"]
+        valid = metrics[name].get("valid", True)
+        old_valid = baseline_metrics[name].get("valid", True)
+        if not valid or not old_valid:
+            if valid == old_valid:
+                change = 0.0
+            else:
+                change = float('inf') if valid else float('-inf')
+        elif old_value == value:
+            change = 0.0
+        elif old_value == 0 or old_value == float('inf'):
+            change = float('inf') if value < old_value else float('-inf')
+            if metrics[name]["higher_is_better"]:
+                change = -change
+        else:
+            change = (value - old_value) / abs(old_value)
+            if not metrics[name]["higher_is_better"]:
+                change = -change
+        rows.append((name, old_value, value, change, change < -threshold))
+    return rows
+
+
+def find_missing(metrics, baseline_metrics):
+    """
+    Find the baseline metrics which the current run did not measure (e.g. a benchmark which failed to run, or was
+    renamed).
+    :param metrics: dict of metric name -> metric record
+    :param baseline_metrics: dict of metric name -> metric record
+    :return: sorted list of metric names
+    """
+    return sorted(name for name in baseline_metrics if name not in metrics)
+
+
+def main(arglist):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Run the solver benchmark suite.")
+    parser.add_argument("--suite", choices=["env", "search", "fallback", "all"], default="all", help="benchmarks to run")
+    parser.add_argument("--levels", nargs="+", help="level names to run (e.g. level_1 level_2; default all)")
+    parser.add_argument("--testcase-dir", default=DEFAULT_TESTCASE_DIR, help="directory of testcase files")
+    parser.add_argument("--search-types", nargs="+", choices=search_benchmarks.SEARCH_TYPES,
+                        default=list(search_benchmarks.SEARCH_TYPES), help="searches to benchmark")
+    parser.add_argument("--search-repeat", type=int, default=1, help="minimum runs per search (fastest is reported)")
+    parser.add_argument("--search-min-time", type=float, default=search_benchmarks.DEFAULT_MIN_SEARCH_TIME,
+                        help="minimum seconds spent repeating each search")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="minimum seconds per micro-benchmark timing sample")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timing samples per micro-benchmark (fastest is reported)")
+    parser.add_argument("--output", help="file to write JSON results to (default: print to stdout)")
+    parser.add_argument("--baseline", help="JSON results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change counted as a regression (default 0.1)")
+    args = parser.parse_args(arglist)
+
+    testcases = find_testcases(args.testcase_dir, args.levels)
+    if not testcases:
+        print("/!\\ ERROR: No testcases found")
+        return 2
+
+    metrics = {}
+    if args.suite in ("env", "all"):
+        metrics.update(env_benchmarks.run_all(testcases, min_time=args.min_time, repeat=args.repeat))
+    if args.suite in ("search", "all"):
+        metrics.update(search_benchmarks.run_all(
+            testcases, args.search_types, args.search_repeat, args.search_min_time
+        ))
+    if args.suite in ("fallback", "all"):
+        metrics.update(search_benchmarks.run_fallback(testcases))
+
+    results = {"version": RESULTS_VERSION, "metadata": get_metadata(), "metrics": metrics}
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True, allow_nan=False)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True, allow_nan=False)
+        print()
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(metrics, baseline["metrics"], args.threshold)
+    n_regressions = 0
+    print(f"{'metric':<55} {'baseline':>14} {'current':>14} {'change':>9}", file=sys.stderr)
+    for name, old_value, value, change, is_regression in rows:
+        flag = "  REGRESSION" if is_regression else ""
+        n_regressions += is_regression
+        old_text = "invalid" if old_value is None else f"{old_value:.6g}"
+        text = "invalid" if value is None else f"{value:.6g}"
+        print(f"{name:<55} {old_text:>14} {text:>14} {change:>+8.1%}{flag}", file=sys.stderr)
+    missing = find_missing(metrics, baseline["metrics"])
+    for name in missing:
+        old_value = baseline["metrics"][name]["value"]
+        old_text = "invalid" if old_value is None else f"{old_value:.6g}"
+        print(f"{name:<55} {old_text:>14} {'missing':>14} {'':>9}  MISSING", file=sys.stderr)
+    print(f"{n_regressions} regression(s) beyond {args.threshold:.0%} out of {len(rows)} compared metrics",
+          file=sys.stderr)
+    if missing:
+        print(f"{len(missing)} baseline metric(s) missing from this run (run the same --suite and --levels as the "
+              f"baseline)", file=sys.stderr)
+    return 1 if n_regressions > 0 or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
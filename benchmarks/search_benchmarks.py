@@ -0,0 +1,161 @@
+import time
+
+from benchmarks.common import make_metric
+from control.game_env import GameEnv as ControlEnv
+from game_env import GameEnv
+from memory_bounded_search import IDAStarSearch
+from memory_budget import MemoryBudget, MemoryBudgetExceeded
+from move_pruning import MovePruning
+from search_engine import SearchEngine
+from solution import Solver
+
+"""
+search_benchmarks.py
+
+This file contains end-to-end benchmarks of Solver.search_ucs and Solver.search_a_star, recording run time (with A*
+heuristic preprocessing timed separately), node counts and plan cost for each testcase, and of the IDA* memory
+fallback with and without move pruning (see move_pruning.py).
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+SEARCH_TYPES = ('ucs', 'a_star')
+
+# Minimum total time (in seconds) spent repeating each search
+DEFAULT_MIN_SEARCH_TIME = 1.0
+
+# State limit at which A* hands over to IDA* in the fallback benchmark (A* solves levels 1-5 within it, so IDA* runs
+# from the initial state there)
+FALLBACK_STATE_LIMIT = 100000
+
+
+def run_search(filename, search_type):
+    """
+    Run one search on a fresh environment and solver.
+    :return: (preprocess time, search time, solver, actions)
+    """
+    game_env = GameEnv(filename)
+    solver = Solver(game_env)
+    preprocess_time = 0.0
+    if search_type == 'ucs':
+        t0 = time.perf_counter()
+        actions = solver.search_ucs()
+        search_time = time.perf_counter() - t0
+    else:
+        t0 = time.perf_counter()
+        solver.preprocess_heuristic()
+        preprocess_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        actions = solver.search_a_star()
+        search_time = time.perf_counter() - t0
+    return preprocess_time, search_time, solver, actions
+
+
+def plan_cost(filename, actions):
+    """
+    Compute the cost of a plan, checking that it solves the level under the unmodified reference environment
+    (control.game_env), not the environment being benchmarked.
+    :return: plan cost (float), or None if the plan is invalid
+    """
+    game_env = ControlEnv(filename)
+    state = game_env.get_init_state()
+    total_cost = 0.0
+    for action in actions:
+        success, state = game_env.perform_action(state, action)
+        if not success:
+            return None
+        total_cost += game_env.ACTION_COST[action]
+    if not game_env.is_solved(state):
+        return None
+    return round(total_cost, 1)
+
+
+def bench_search(level_name, filename, search_type, repeat=1, min_time=DEFAULT_MIN_SEARCH_TIME):
+    """
+    Benchmark one search type on one testcase. The search is run at least repeat times, and until min_time seconds
+    have been spent (so fast searches are sampled many times); the fastest run is reported.
+    :return: dict of metric name -> metric record
+    """
+    best_preprocess = best_search = float('inf')
+    solver = actions = None
+    runs = 0
+    t0 = time.perf_counter()
+    while runs < repeat or time.perf_counter() - t0 < min_time:
+        preprocess_time, search_time, solver, actions = run_search(filename, search_type)
+        best_preprocess = min(best_preprocess, preprocess_time)
+        best_search = min(best_search, search_time)
+        runs += 1
+
+    prefix = f"search/{search_type}/{level_name}"
+    metrics = {
+        f"{prefix}/search_time": make_metric(best_search, "s", False),
+        f"{prefix}/nodes_expanded": make_metric(solver.nodes_expanded, "nodes", False),
+        f"{prefix}/nodes_generated": make_metric(solver.nodes_generated, "nodes", False),
+    }
+    if search_type == 'a_star':
+        metrics[f"{prefix}/preprocess_time"] = make_metric(best_preprocess, "s", False)
+    cost = plan_cost(filename, actions) if actions is not None else None
+    # An invalid plan is recorded with no value, and always shows up as a regression against a valid baseline
+    metrics[f"{prefix}/plan_cost"] = make_metric(cost, "cost", False, valid=cost is not None)
+    return metrics
+
+
+def bench_fallback(level_name, filename, max_states=FALLBACK_STATE_LIMIT):
+    """
+    Benchmark the IDA* memory fallback on one testcase, with and without move pruning: A* with the Solver's
+    heuristic runs until it holds max_states states, and IDA* (with a transposition table of the same capacity)
+    continues from its open states, or starts from the initial state if A* finished within the limit. Each variant is
+    run once, since the searches are long.
+    :return: dict of metric name -> metric record
+    """
+    game_env = GameEnv(filename)
+    solver = Solver(game_env)
+    solver.preprocess_heuristic()
+    heuristic = solver.heuristic.compute_scaled
+    metrics = {}
+    for variant, move_pruning in (("unpruned", None), ("move_pruning", MovePruning(game_env))):
+        explored = None
+        engine = SearchEngine(game_env)
+        try:
+            engine.search(heuristic=heuristic, memory_budget=MemoryBudget(max_states=max_states))
+        except MemoryBudgetExceeded:
+            explored = engine.store
+        engine = None
+        ida_star = IDAStarSearch(game_env, table_capacity=max_states)
+        t0 = time.perf_counter()
+        actions = ida_star.search(heuristic=heuristic, move_pruning=move_pruning, explored=explored)
+        search_time = time.perf_counter() - t0
+        explored = None
+
+        prefix = f"fallback/{variant}/{level_name}"
+        metrics[f"{prefix}/search_time"] = make_metric(search_time, "s", False)
+        metrics[f"{prefix}/nodes_expanded"] = make_metric(ida_star.nodes_expanded, "nodes", False)
+        metrics[f"{prefix}/nodes_generated"] = make_metric(ida_star.nodes_generated, "nodes", False)
+        cost = plan_cost(filename, actions) if actions is not None else None
+        metrics[f"{prefix}/plan_cost"] = make_metric(cost, "cost", False, valid=cost is not None)
+    return metrics
+
+
+def run_all(testcases, search_types=SEARCH_TYPES, repeat=1, min_time=DEFAULT_MIN_SEARCH_TIME):
+    """
+    Run every search benchmark on every testcase.
+    :param testcases: list of (level name, filename) pairs
+    :return: dict of metric name -> metric record
+    """
+    metrics = {}
+    for level_name, filename in testcases:
+        for search_type in search_types:
+            metrics.update(bench_search(level_name, filename, search_type, repeat, min_time))
+    return metrics
+
+
+def run_fallback(testcases, max_states=FALLBACK_STATE_LIMIT):
+    """
+    Run the IDA* fallback benchmark on every testcase.
+    :param testcases: list of (level name, filename) pairs
+    :return: dict of metric name -> metric record
+    """
+    metrics = {}
+    for level_name, filename in testcases:
+        metrics.update(bench_fallback(level_name, filename, max_states))
+    return metrics
@@ -0,0 +1,156 @@
+import heapq
+
+from search_engine import SearchEngine, scale_cost
+from transition_model import get_transition_model
+
+"""
+corridor_compression.py
+
+This file contains a compressed position graph for GameEnv levels. Cells whose moves never depend on the trap status
+(and which are not levers, the goal or the start) are corridor cells; runs of them, such as ladder shafts and empty
+corridors, are collapsed into weighted macro-edges between the remaining junction cells. Each macro-edge carries its
+expanded action sequence, so plans found over the compressed graph unfold into plain GameEnv.ACTIONS.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+class CorridorCompression:
+    """
+    UCS/A* over the compressed graph, whose states are dense state IDs (see GameEnv.encode_state) at junction cells.
+
+    A state's successors are found with GameEnv.get_successor_ids (so moves out of junctions, which may depend on the
+    trap status, follow the real rules). A successor at a corridor cell is replaced by one macro-edge per junction
+    reachable from it through corridor cells only, at the cheapest such cost (precomputed once per level, as moves
+    between corridor cells are the same under every trap status). Plans are optimal for the reason given in
+    SearchEngine.search_macro.
+    """
+
+    def __init__(self, game_env):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        n_cols = game_env.n_cols
+        self.n_cells = game_env.n_rows * n_cols
+        self.action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+
+        special_cells = {game_env.goal_row * n_cols + game_env.goal_col, game_env.init_row * n_cols + game_env.init_col}
+        special_cells.update(row * n_cols + col for row, col in game_env.lever_positions)
+        activate_index = game_env.ACTION_LIST.index(game_env.ACTIVATE)
+
+        # Static moves out of each corridor cell: corridor_moves[cell] = [(action index, next cell), ...]
+        self.is_junction = bytearray(self.n_cells)
+        corridor_moves = [None] * self.n_cells
+        for cell in range(self.n_cells):
+            row, col = divmod(cell, n_cols)
+            if game_env.grid_data[row][col] == game_env.SOLID_TILE:
+                continue
+            moves = []
+            for action_index, dep_mask, outcomes in game_env.get_cell_transitions(cell):
+                if outcomes is None or dep_mask:
+                    moves = None
+                    break
+                outcome = outcomes[0]
+                if outcome is not None and action_index != activate_index and outcome[0] != cell:
+                    moves.append((action_index, outcome[0]))
+            if moves is None or cell in special_cells:
+                self.is_junction[cell] = 1
+            else:
+                corridor_moves[cell] = moves
+
+        # corridor_exits[cell] = ((junction cell, scaled cost, action indices), ...) for every corridor cell
+        self.corridor_exits = [None] * self.n_cells
+        for cell in range(self.n_cells):
+            if corridor_moves[cell] is not None:
+                self.corridor_exits[cell] = self._find_exits(cell, corridor_moves)
+
+        self.engine = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.plan_cost = None
+
+    def _find_exits(self, start_cell, corridor_moves):
+        """
+        Dijkstra from a corridor cell, through corridor cells only, to every junction it can reach.
+        :return: tuple of (junction cell, scaled cost, tuple of action indices)
+        """
+        action_costs = self.action_costs
+        best = {start_cell: 0}
+        parents = {start_cell: None}
+        exits = []
+        frontier = [(0, start_cell)]
+        while frontier:
+            cost, cell = heapq.heappop(frontier)
+            if cost > best[cell]:
+                continue
+            if self.is_junction[cell]:
+                actions = []
+                step = cell
+                while parents[step] is not None:
+                    step, action_index = parents[step]
+                    actions.append(action_index)
+                exits.append((cell, cost, tuple(reversed(actions))))
+                continue
+            for action_index, next_cell in corridor_moves[cell]:
+                next_cost = cost + action_costs[action_index]
+                if next_cost < best.get(next_cell, float('inf')):
+                    best[next_cell] = next_cost
+                    parents[next_cell] = (cell, action_index)
+                    heapq.heappush(frontier, (next_cost, next_cell))
+        return tuple(exits)
+
+    def get_macro_successors(self, state_id):
+        """
+        Get the successors of a state in the compressed graph.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: list of (next state ID, scaled cost, tuple of action indices) triples
+        """
+        n_cells = self.n_cells
+        action_costs = self.action_costs
+        successors = []
+        for action_index, next_id in self.game_env.get_successor_ids(state_id):
+            trap_bits, next_cell = divmod(next_id, n_cells)
+            exits = self.corridor_exits[next_cell]
+            if exits is None:
+                successors.append((next_id, action_costs[action_index], (action_index,)))
+                continue
+            base = trap_bits * n_cells
+            for exit_cell, cost, actions in exits:
+                exit_id = base + exit_cell
+                if exit_id != state_id:
+                    successors.append((exit_id, action_costs[action_index] + cost, (action_index,) + actions))
+        return successors
+
+    def count_junctions(self):
+        """
+        Count the junction cells (the cells kept in the compressed graph).
+        :return: (number of junction cells, number of corridor cells)
+        """
+        n_corridor = sum(1 for exits in self.corridor_exits if exits is not None)
+        return sum(self.is_junction), n_corridor
+
+    def search(self, heuristic=None, init_state=None):
+        """
+        Find an optimal path to the solved state over the compressed graph (see SearchEngine.search_macro), using UCS
+        if no heuristic is given and A* otherwise.
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in COST_SCALE units, or to None if the solved state is unreachable from it (None for UCS)
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        self.engine = SearchEngine(self.game_env)
+        path = self.engine.search_macro(self.get_macro_successors, heuristic=heuristic, init_state=init_state)
+        self.nodes_expanded = self.engine.nodes_expanded
+        self.nodes_generated = self.engine.nodes_generated
+        self.plan_cost = self.engine.plan_cost
+        return path
+
+    def get_stats(self):
+        """
+        Get statistics of the most recent search.
+        :return: dict of statistic name to value
+        """
+        n_junctions, n_corridor = self.count_junctions()
+        if self.engine is None:
+            return {"junction_cells": n_junctions, "corridor_cells": n_corridor}
+        return self.engine.get_stats(junction_cells=n_junctions, corridor_cells=n_corridor)
@@ -0,0 +1,165 @@
+import copy
+
+from heuristics import UNREACHABLE
+from pattern_database import PatternDatabase
+from transition_model import TransitionModel, get_transition_model
+
+"""
+dead_states.py
+
+This file contains a precomputed dead state check for GameEnv levels. A state is dead if the solved state can never be
+reached from it (e.g. after falling into a pocket below a trapdoor which cannot be reopened), so search can drop it
+before it is queued.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+class DeadStateDetector:
+    """
+    Dead state check over dense state IDs (see GameEnv.encode_state).
+
+    Each trap is analysed on its own, with a single-trap pattern database (see pattern_database.py): the abstraction
+    keeps the player's cell and the status of that trap, and allows every move which succeeds for some status of the
+    other traps. A state whose abstract state cannot reach the abstract goal in one of these abstractions is dead.
+    This misses states which are only dead because of several traps at once, but never marks a live state as dead.
+    Building it costs one backward search per trap over (cell, trap status) pairs, O(n_traps * n_cells * n_actions),
+    rather than a search over every state ID.
+
+    The result is stored as a table of cells dead under every trap configuration, plus, for each trap, the cells
+    which are dead under one of its statuses, so is_dead is O(number of such traps). prune_transitions folds the same
+    check into the successor tables, which costs nothing per successor.
+    """
+
+    def __init__(self, game_env):
+        """
+        :param game_env: GameEnv instance
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.n_cells = game_env.n_rows * game_env.n_cols
+        n_traps = len(game_env.trap_positions)
+
+        # Cells dead for both statuses of some trap (so for every configuration), and per-trap pages of the cells
+        # which are only dead for one status: (trap index, [dead cells if not activated, dead cells if activated])
+        dead_cells = bytearray(self.n_cells)
+        trap_pages = []
+        for pattern in ([(i,) for i in range(n_traps)] or [()]):
+            values = PatternDatabase(game_env, pattern).values
+            pages = [bytearray(values[bit * self.n_cells + cell] == UNREACHABLE for cell in range(self.n_cells))
+                     for bit in range(1 << len(pattern))]
+            for cell in range(self.n_cells):
+                if all(page[cell] == 1 for page in pages):
+                    dead_cells[cell] = 1
+            if pattern:
+                trap_pages.append((pattern[0], pages))
+
+        # Keep only the traps with cells dead for one status, so is_dead_id checks as few pages as possible
+        self._dead_cells = dead_cells
+        self._trap_pages = []
+        # Bitmask of the traps whose status decides whether each cell is dead
+        self._cell_trap_masks = [0] * self.n_cells
+        for trap_index, pages in trap_pages:
+            for page in pages:
+                for cell in range(self.n_cells):
+                    if dead_cells[cell] == 1:
+                        page[cell] = 0
+                    elif page[cell] == 1:
+                        self._cell_trap_masks[cell] |= 1 << trap_index
+            if any(page.count(1) for page in pages):
+                self._trap_pages.append((trap_index, pages))
+
+    def is_dead(self, state):
+        """
+        Check whether the solved state is unreachable from the given state.
+        :param state: GameState or CompactState
+        :return: True if the state is dead
+        """
+        return self.is_dead_id(self.game_env.encode_state(state))
+
+    def is_dead_id(self, state_id):
+        """
+        Equivalent of is_dead for dense state IDs (see GameEnv.encode_state).
+        :param state_id: state ID
+        :return: True if the state is dead
+        """
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        if self._dead_cells[cell] == 1:
+            return True
+        if self._cell_trap_masks[cell] == 0:
+            return False
+        for trap_index, pages in self._trap_pages:
+            if pages[(trap_bits >> trap_index) & 1][cell] == 1:
+                return True
+        return False
+
+    def count_dead(self):
+        """
+        Count the dead states found.
+        :return: (number of dead states, number of state IDs)
+        """
+        n_configurations = 1 << len(self.game_env.trap_positions)
+        n_dead = 0
+        for cell in range(self.n_cells):
+            if self._dead_cells[cell] == 1:
+                n_dead += n_configurations
+            else:
+                # Each trap constraining this cell rules out half of the configurations, independently
+                n_dead += n_configurations - (n_configurations >> bin(self._cell_trap_masks[cell]).count("1"))
+        return n_dead, n_configurations * self.n_cells
+
+    def prune_transitions(self):
+        """
+        Build a copy of the level's TransitionModel whose successor tables leave out every transition into a dead
+        state, so a search using it (e.g. SearchEngine(detector.prune_transitions())) never generates dead successors.
+        Each compiled outcome whose target cell is dead under some trap status is split on the status of those traps.
+        Transitions which could not be compiled are kept. Predecessor tables are not pruned.
+        :return: TransitionModel
+        """
+        game_env = self.game_env
+        model = game_env if isinstance(game_env, TransitionModel) else game_env.get_transition_model()
+        dead_cells = self._dead_cells
+        cell_trap_masks = self._cell_trap_masks
+        trap_pages = dict(self._trap_pages)
+
+        def is_dead_outcome(next_cell, next_bits):
+            if dead_cells[next_cell] == 1:
+                return True
+            mask = cell_trap_masks[next_cell]
+            for trap_index, pages in trap_pages.items():
+                if (mask >> trap_index) & 1 and pages[(next_bits >> trap_index) & 1][next_cell] == 1:
+                    return True
+            return False
+
+        cell_transitions = []
+        for cell_entries in model.cell_transitions:
+            pruned_entries = []
+            for action_index, dep_mask, outcomes in cell_entries:
+                if outcomes is None:
+                    pruned_entries.append((action_index, dep_mask, outcomes))
+                    continue
+                extra_mask = 0
+                for outcome in outcomes.values():
+                    if outcome is not None:
+                        extra_mask |= cell_trap_masks[outcome[0]]
+                extra_mask &= ~dep_mask
+                pruned_outcomes = {}
+                for key, outcome in outcomes.items():
+                    # Every status of the extra traps (subsets of extra_mask, from extra_mask down to 0)
+                    extra_key = extra_mask
+                    while True:
+                        if outcome is None or is_dead_outcome(outcome[0], (key | extra_key) ^ outcome[1]):
+                            pruned_outcomes[key | extra_key] = None
+                        else:
+                            pruned_outcomes[key | extra_key] = outcome
+                        if extra_key == 0:
+                            break
+                        extra_key = (extra_key - 1) & extra_mask
+                if all(outcome is None for outcome in pruned_outcomes.values()):
+                    continue
+                pruned_entries.append((action_index, dep_mask | extra_mask, pruned_outcomes))
+            cell_transitions.append(tuple(pruned_entries))
+
+        pruned_model = copy.copy(model)
+        pruned_model.cell_transitions = cell_transitions
+        return pruned_model
@@ -1,4 +1,7 @@
-from game_state import GameState
+from collections import OrderedDict
+
+from game_state import GameState, CompactState
+from transition_model import StateIdEncoding, TransitionModel
 
 """
 game_env.py
@@ -10,7 +13,7 @@ COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
 """
 
 
-class GameEnv:
+class GameEnv(StateIdEncoding):
     """
     Instance of a Cheese Hunter environment. Stores the dimensions of the environment, initial player position,
     goal position, lever positions, trap positions, mapping of levers to traps, time limit, cost target,
@@ -72,15 +75,19 @@ class GameEnv:
         SPRINT_RIGHT: 1.9,
     }
 
-    def __init__(self, filename):
+    def __init__(self, filename, compiled=False, successor_cache_size=100000):
         """
         Process the given input file and create a new game environment instance based on the input file.
         :param filename: name of input file
+        :param compiled: if True, precompute a transition table used by perform_action (see compile_transitions)
+        :param successor_cache_size: max number of states memoised by get_successors (None for unbounded, 0 to
+            disable)
         """
         try:
             f = open(filename, "r")
         except FileNotFoundError:
             assert False, "/!\\ ERROR: Testcase file not found"
+        self.filename = filename
 
         grid_data = []
         schematic_data = []
@@ -225,6 +232,24 @@ class GameEnv:
         )
         self.grid_data = grid_data
 
+        # Fixed action ordering and state ID layout (see transition_model.StateIdEncoding)
+        self._init_encoding(self)
+
+        # Instrumentation counters (None unless enable_instrumentation is called)
+        self.instrumentation = None
+
+        # Compiled transition table (None until compile_transitions is called)
+        self._transitions = None
+        self._transition_model = None
+        if compiled:
+            self.compile_transitions()
+
+        # LRU cache used by get_successors
+        self.successor_cache_size = successor_cache_size
+        self.successor_cache_hits = 0
+        self.successor_cache_misses = 0
+        self._successor_cache = OrderedDict()
+
     def get_init_state(self):
         """
         Get a state representation instance for the initial state.
@@ -234,6 +259,31 @@ class GameEnv:
             self.init_row, self.init_col, tuple(0 for _ in self.trap_positions)
         )
 
+    def to_compact(self, state):
+        """
+        Convert a GameState into the equivalent CompactState.
+        :param state: GameState
+        :return: CompactState
+        """
+        trap_bits = 0
+        for i, status in enumerate(state.trap_status):
+            if status != 0:
+                trap_bits |= 1 << i
+        return CompactState(state.row, state.col, trap_bits)
+
+    def from_compact(self, compact_state):
+        """
+        Convert a CompactState into the equivalent GameState.
+        :param compact_state: CompactState
+        :return: GameState
+        """
+        trap_bits = compact_state.trap_bits
+        return GameState(
+            compact_state.row,
+            compact_state.col,
+            tuple((trap_bits >> i) & 1 for i in range(len(self.trap_positions))),
+        )
+
     def check_valid_action(self, state, action):
         """Check a given action is able to be performed in a given state.
         :param state: current GameState
@@ -380,6 +430,17 @@ class GameEnv:
         :param action: an element of self.ACTIONS
         :return: (successful [True/False], next_state [GameState])
         """
+        if self._transitions is not None:
+            return self._perform_compiled_action(state, action)
+        return self._simulate_action(state, action)
+
+    def _simulate_action(self, state, action):
+        """
+        Reference implementation of perform_action, applying check_valid_action and check_collision directly.
+        :param state: current GameState
+        :param action: an element of self.ACTIONS
+        :return: (successful [True/False], next_state [GameState])
+        """
 
         # Check action is valid
         if not self.check_valid_action(state, action):
@@ -440,12 +501,410 @@ class GameEnv:
 
         return True, GameState(next_row, next_col, tuple(next_trap_status))
 
+    def compile_transitions(self):
+        """
+        Precompute the outcome of every action from every grid cell, so that perform_action becomes a table lookup.
+
+        For each (cell, action) pair, the reference rules (check_valid_action and check_collision) are evaluated once
+        for every combination of the trap statuses they can read, and the result is stored as a
+        (next_row, next_col, toggled trap index or -1) tuple, or None if the action fails (see
+        transition_model.TransitionModel). Pairs for which the reference rules raise an error (e.g. reading beyond the
+        grid border) are left uncompiled, and perform_action falls back to the reference rules for them.
+        """
+        self._transitions = None
+        # Reference rule evaluations made while compiling are not counted by instrumentation
+        instrumentation = self.instrumentation
+        self.instrumentation = None
+        try:
+            model = TransitionModel(self, simulate=self._simulate_action)
+        finally:
+            self.instrumentation = instrumentation
+        self._transition_model = model
+        self._transitions = model.action_transitions
+
+    def _perform_compiled_action(self, state, action):
+        """
+        Table-driven equivalent of _simulate_action (see compile_transitions).
+        :param state: current GameState
+        :param action: an element of self.ACTIONS
+        :return: (successful [True/False], next_state [GameState])
+        """
+        row, col = state.row, state.col
+        if not (0 <= row < self.n_rows and 0 <= col < self.n_cols) or action not in self._transitions:
+            return self._simulate_action(state, action)
+        entry = self._transitions[action][row * self.n_cols + col]
+        if entry is None:
+            return self._simulate_action(state, action)
+
+        _, deps, outcomes = entry
+        trap_status = state.trap_status
+        key = 0
+        for i in deps:
+            if trap_status[i] != 0:
+                key |= 1 << i
+        outcome = outcomes[key]
+        if outcome is None:
+            return False, state.deepcopy()
+
+        next_row, next_col, toggled = outcome
+        if toggled >= 0:
+            next_trap_status = list(trap_status)
+            next_trap_status[toggled] = 1 if trap_status[toggled] == 0 else 0
+            trap_status = tuple(next_trap_status)
+        return True, GameState(next_row, next_col, trap_status)
+
+    def perform_compact_action(self, compact_state, action):
+        """
+        Equivalent of perform_action for CompactState instances. Compiles the transition table on first use.
+        :param compact_state: current CompactState
+        :param action: an element of self.ACTIONS
+        :return: (successful [True/False], next_state [CompactState])
+        """
+        if self._transitions is None:
+            self.compile_transitions()
+
+        row, col = compact_state.row, compact_state.col
+        if not (0 <= row < self.n_rows and 0 <= col < self.n_cols) or action not in self._transitions:
+            entry = None
+        else:
+            entry = self._transitions[action][row * self.n_cols + col]
+        if entry is None:
+            success, next_state = self._simulate_action(self.from_compact(compact_state), action)
+            return success, self.to_compact(next_state)
+
+        dep_mask, _, outcomes = entry
+        outcome = outcomes[compact_state.trap_bits & dep_mask]
+        if outcome is None:
+            return False, compact_state
+
+        next_row, next_col, toggled = outcome
+        trap_bits = compact_state.trap_bits
+        if toggled >= 0:
+            trap_bits ^= 1 << toggled
+        return True, CompactState(next_row, next_col, trap_bits)
+
+    def get_successors(self, state):
+        """
+        Get the outcome of every valid, collision free action from the given state. Results are memoised in an LRU
+        cache holding up to successor_cache_size states, which stores the state ID and (action index, next state ID)
+        pairs of each state (see encode_state) rather than the next states, which are built on each call. Compiles the transition table on
+        first use.
+        :param state: current GameState (or CompactState)
+        :return: tuple of (action, next_state, cost) triples, in GameEnv.ACTION_LIST order, where next_state has the
+            same type as state
+        """
+        cache = self._successor_cache
+        entry = cache.get(state)
+        if entry is not None:
+            self.successor_cache_hits += 1
+            cache.move_to_end(state)
+            state_id, successor_ids = entry
+        else:
+            self.successor_cache_misses += 1
+            state_id = self.encode_state(state)
+            successor_ids = tuple(self.get_transition_model().get_successor_ids(state_id))
+            if self.successor_cache_size is None or self.successor_cache_size > 0:
+                cache[state] = (state_id, successor_ids)
+                if self.successor_cache_size is not None and len(cache) > self.successor_cache_size:
+                    cache.popitem(last=False)
+
+        n_cells, n_cols = self.n_cells, self.n_cols
+        action_list, action_cost = self.ACTION_LIST, self.ACTION_COST
+        compact = isinstance(state, CompactState)
+        trap_bits = state_id // n_cells
+        successors = []
+        for action_index, next_id in successor_ids:
+            next_trap_bits, next_cell = divmod(next_id, n_cells)
+            next_row, next_col = divmod(next_cell, n_cols)
+            if compact:
+                next_state = CompactState(next_row, next_col, next_trap_bits)
+            elif next_trap_bits == trap_bits:
+                next_state = GameState(next_row, next_col, state.trap_status)
+            else:
+                next_state = self.decode_state(next_id)
+            action = action_list[action_index]
+            successors.append((action, next_state, action_cost[action]))
+        return tuple(successors)
+
+    def get_successor_ids(self, state_id):
+        """
+        Equivalent of get_successors operating on dense state IDs (see encode_state), without memoisation. Compiles
+        the transition table on first use.
+        :param state_id: current state ID
+        :return: list of (action index into GameEnv.ACTION_LIST, next state ID) pairs
+        """
+        return self.get_transition_model().get_successor_ids(state_id)
+
+    def get_successor_ids_batch(self, state_ids):
+        """
+        Batched equivalent of get_successor_ids (see TransitionModel.get_successor_ids_batch). Compiles the transition
+        table on first use.
+        :param state_ids: sequence of state IDs
+        :return: (sources, action indices, next state IDs) parallel lists, with one entry per successor, where
+            sources[k] is the position in state_ids of the state which next_ids[k] was generated from
+        """
+        return self.get_transition_model().get_successor_ids_batch(state_ids)
+
+    def get_reachable_ids(self, max_states=None):
+        """
+        Get the state IDs reachable from the initial state, in breadth-first order (see
+        TransitionModel.get_reachable_ids). Compiles the transition table on first use.
+        :param max_states: maximum number of state IDs to return, or None for every reachable state
+        :return: list of state IDs
+        """
+        return self.get_transition_model().get_reachable_ids(max_states)
+
+    def get_cell_transitions(self, cell):
+        """
+        Get the compiled transitions from the given cell (see TransitionModel.get_cell_transitions). Compiles the
+        transition table on first use.
+        :param cell: cell index (row * n_cols + col)
+        :return: tuple of (action index into GameEnv.ACTION_LIST, dependency bitmask, outcomes) triples
+        """
+        return self.get_transition_model().get_cell_transitions(cell)
+
+    def get_relaxed_successors(self, cell):
+        """
+        Get every cell reachable in one action from the given cell under at least one trap configuration (i.e. with
+        traps relaxed to their most permissive status). Lever activations are omitted, as they do not move the player.
+        Compiles the transition table on first use.
+        :param cell: cell index (row * n_cols + col)
+        :return: list of (action index into GameEnv.ACTION_LIST, next cell index) pairs
+        """
+        return self.get_transition_model().get_relaxed_successors(cell)
+
+    def get_predecessor_ids(self, state_id):
+        """
+        Get every (action, previous state) pair for which performing the action in the previous state successfully
+        leads to the given state, on dense state IDs (see encode_state). Compiles the transition table on first use.
+        :param state_id: current state ID
+        :return: list of (action index into GameEnv.ACTION_LIST, previous state ID) pairs
+        """
+        return self.get_transition_model().get_predecessor_ids(state_id)
+
+    def get_transition_model(self):
+        """
+        Get the compiled transition model of this level (see transition_model.py). Compiles the transition table on
+        first use.
+        :return: TransitionModel
+        """
+        if self._transitions is None:
+            self.compile_transitions()
+        return self._transition_model
+
+    def get_predecessors(self, state):
+        """
+        Get every (previous state, action) pair for which performing the action in the previous state successfully
+        leads to the given state, including lever toggles. Compiles the transition table on first use.
+        :param state: current GameState (or CompactState)
+        :return: list of (prev_state, action, cost) triples, where prev_state has the same type as state
+        """
+        predecessors = []
+        for action_index, prev_id in self.get_predecessor_ids(self.encode_state(state)):
+            if isinstance(state, CompactState):
+                prev_state = self.decode_compact_state(prev_id)
+            else:
+                prev_state = self.decode_state(prev_id)
+            action = self.ACTION_LIST[action_index]
+            predecessors.append((prev_state, action, self.ACTION_COST[action]))
+        return predecessors
+
+    def get_successor_cache_info(self):
+        """
+        Get statistics for the get_successors cache.
+        :return: dict with keys hits, misses, maxsize and currsize
+        """
+        return {
+            "hits": self.successor_cache_hits,
+            "misses": self.successor_cache_misses,
+            "maxsize": self.successor_cache_size,
+            "currsize": len(self._successor_cache),
+        }
+
+    def clear_successor_cache(self):
+        """
+        Empty the get_successors cache and reset its statistics.
+        """
+        self._successor_cache.clear()
+        self.successor_cache_hits = 0
+        self.successor_cache_misses = 0
+
+    def enable_instrumentation(self):
+        """
+        Start counting calls made to this environment (see get_instrumentation_counters).
+
+        Instrumentation works by shadowing perform_action, check_valid_action, check_collision, get_successors and
+        get_successor_ids with counting wrappers on this instance only, so a GameEnv without instrumentation enabled
+        runs with no extra overhead at all. Calls made by compile_transitions are not counted.
+        """
+        if self.instrumentation is not None:
+            return
+        self.reset_instrumentation_counters()
+        self.perform_action = self._instrumented_perform_action
+        self.check_valid_action = self._instrumented_check_valid_action
+        self.check_collision = self._instrumented_check_collision
+        self.get_successors = self._instrumented_get_successors
+        self.get_successor_ids = self._instrumented_get_successor_ids
+
+    def disable_instrumentation(self):
+        """
+        Stop counting calls and remove the counting wrappers (counters are discarded).
+        """
+        for name in ("perform_action", "check_valid_action", "check_collision", "get_successors",
+                     "get_successor_ids"):
+            self.__dict__.pop(name, None)
+        self.instrumentation = None
+
+    def reset_instrumentation_counters(self):
+        """
+        Reset all instrumentation counters to zero.
+        """
+        self.instrumentation = {
+            "perform_action": {action: 0 for action in self.ACTION_LIST},
+            "successor_evaluations": {action: 0 for action in self.ACTION_LIST},
+            "succeeded": {action: 0 for action in self.ACTION_LIST},
+            "invalid": {action: 0 for action in self.ACTION_LIST},
+            "collision": {action: 0 for action in self.ACTION_LIST},
+            "check_valid_action": 0,
+            "check_collision": 0,
+            "table_lookups": 0,
+            "states_expanded": 0,
+            "states_generated": 0,
+        }
+
+    def get_instrumentation_counters(self):
+        """
+        Get a copy of the instrumentation counters.
+        :return: dict with keys
+            perform_action - calls per action (dict)
+            successor_evaluations - evaluations of each action by get_successors/get_successor_ids (dict), i.e. one
+                per action for every state expanded
+            succeeded - successful actions per action (dict), from perform_action calls and from successor
+                generation
+            invalid, collision - unsuccessful actions per action (dict), from the same sources, split by whether
+                check_valid_action or check_collision rejects them (so perform_action + successor_evaluations =
+                succeeded + invalid + collision for each action)
+            check_valid_action, check_collision - number of calls made (both by callers and by the reference
+                rules; the compiled transition table does not call them)
+            table_lookups - actions resolved by the compiled transition table instead of the reference rules, by
+                perform_action and by successor generation (get_successors counts cache misses only)
+            states_expanded - number of get_successors/get_successor_ids calls
+            states_generated - number of successor states returned by those calls
+            or None if instrumentation is not enabled
+        """
+        counters = self.instrumentation
+        if counters is None:
+            return None
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in counters.items()}
+
+    def _count_failure(self, state, action):
+        """
+        Record an unsuccessful action as invalid or colliding, using the reference rules (calls made here are not
+        counted).
+        """
+        counters = self.instrumentation
+        if isinstance(state, CompactState):
+            state = self.from_compact(state)
+        try:
+            valid = GameEnv.check_valid_action(self, state, action)
+        except (IndexError, ValueError):
+            valid = False
+        if valid:
+            counters["collision"][action] += 1
+        else:
+            counters["invalid"][action] += 1
+
+    def _is_compiled(self, row, col, action):
+        """
+        Check whether perform_action resolves an action from a cell with the compiled transition table.
+        """
+        return (
+            self._transitions is not None
+            and 0 <= row < self.n_rows
+            and 0 <= col < self.n_cols
+            and action in self._transitions
+            and self._transitions[action][row * self.n_cols + col] is not None
+        )
+
+    def _instrumented_perform_action(self, state, action):
+        compiled = self._is_compiled(state.row, state.col, action)
+        success, next_state = GameEnv.perform_action(self, state, action)
+        counters = self.instrumentation
+        if counters is not None:
+            counters["perform_action"][action] += 1
+            if compiled:
+                counters["table_lookups"] += 1
+            if success:
+                counters["succeeded"][action] += 1
+            else:
+                self._count_failure(state, action)
+        return success, next_state
+
+    def _instrumented_check_valid_action(self, state, action):
+        if self.instrumentation is not None:
+            self.instrumentation["check_valid_action"] += 1
+        return GameEnv.check_valid_action(self, state, action)
+
+    def _instrumented_check_collision(self, next_position, next_trap_status):
+        if self.instrumentation is not None:
+            self.instrumentation["check_collision"] += 1
+        return GameEnv.check_collision(self, next_position, next_trap_status)
+
+    def _instrumented_get_successors(self, state):
+        misses = self.successor_cache_misses
+        successors = GameEnv.get_successors(self, state)
+        counters = self.instrumentation
+        if counters is not None:
+            if self.successor_cache_misses != misses:
+                counters["table_lookups"] += sum(
+                    1 for action in self.ACTION_LIST if self._is_compiled(state.row, state.col, action)
+                )
+            counters["states_expanded"] += 1
+            counters["states_generated"] += len(successors)
+            succeeded = {action for action, _, _ in successors}
+            for action in self.ACTION_LIST:
+                counters["successor_evaluations"][action] += 1
+                if action in succeeded:
+                    counters["succeeded"][action] += 1
+                else:
+                    self._count_failure(state, action)
+        return successors
+
+    def _instrumented_get_successor_ids(self, state_id):
+        successors = GameEnv.get_successor_ids(self, state_id)
+        counters = self.instrumentation
+        if counters is not None:
+            # Actions missing from the cell's transitions never succeed, which the table also resolves
+            cell_transitions = self.get_cell_transitions(state_id % (self.n_rows * self.n_cols))
+            counters["table_lookups"] += len(self.ACTION_LIST) - sum(
+                1 for _, _, outcomes in cell_transitions if outcomes is None
+            )
+            counters["states_expanded"] += 1
+            counters["states_generated"] += len(successors)
+            succeeded = {action_index for action_index, _ in successors}
+            state = None
+            for action_index, action in enumerate(self.ACTION_LIST):
+                counters["successor_evaluations"][action] += 1
+                if action_index in succeeded:
+                    counters["succeeded"][action] += 1
+                else:
+                    if state is None:
+                        state = self.decode_state(state_id)
+                    self._count_failure(state, action)
+        return successors
+
     def is_solved(self, state):
         """
         Check if the game has been solved (i.e. player at exit and all levers activated)
-        :param state: current GameState
+        :param state: current GameState (or CompactState)
         :return: True if solved, False otherwise
         """
+        if isinstance(state, CompactState):
+            return (
+                state.row == self.goal_row
+                and state.col == self.goal_col
+                and state.trap_bits == (1 << len(self.trap_positions)) - 1
+            )
         all_traps_activated = True
         for status in state.trap_status:
             if status == 0:
@@ -36,3 +36,51 @@ class GameState:
 
     def deepcopy(self):
         return GameState(self.row, self.col, self.trap_status)
+
+
+class CompactState:
+    """
+    Compact alternative to GameState. row and col represent the current player position, and trap_bits packs the
+    trap status into a single integer (bit i is set if trap_status[i] would be 1).
+
+    Instances are immutable (assigning or deleting an attribute raises AttributeError), so their hash is computed once
+    on construction. Use GameEnv.to_compact and GameEnv.from_compact to convert to and from GameState.
+    """
+
+    __slots__ = ('row', 'col', 'trap_bits', '_hash')
+
+    def __init__(self, row, col, trap_bits):
+        object.__setattr__(self, 'row', row)
+        object.__setattr__(self, 'col', col)
+        object.__setattr__(self, 'trap_bits', trap_bits)
+        object.__setattr__(self, '_hash', hash((row, col, trap_bits)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CompactState is immutable (cannot set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"CompactState is immutable (cannot delete '{name}')")
+
+    def __reduce__(self):
+        # Rebuild through __init__ (used by pickle and copy, which would otherwise assign the slots)
+        return CompactState, (self.row, self.col, self.trap_bits)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactState):
+            return False
+        return self.row == other.row and self.col == other.col and self.trap_bits == other.trap_bits
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f'row: {self.row},\t\t col: {self.col}, \t\t trap bits: {self.trap_bits:#x}'
+
+    def get_trap(self, index):
+        return (self.trap_bits >> index) & 1
+
+    def toggle(self, index):
+        return CompactState(self.row, self.col, self.trap_bits ^ (1 << index))
+
+    def deepcopy(self):
+        return self
@@ -0,0 +1,153 @@
+import heapq
+from array import array
+
+from search_engine import scale_cost, unscale_cost
+from transition_model import get_transition_model
+
+"""
+heuristics.py
+
+This file contains precomputed heuristic providers for A* search over GameEnv levels. Heuristic values are computed
+in SearchEngine fixed-point cost units (see search_engine.COST_SCALE).
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Distance value for cells from which the target cannot be reached
+UNREACHABLE = -1
+
+
+def reverse_dijkstra(game_env, target_cells):
+    """
+    Compute the cheapest cost of reaching any of the target cells from every cell, over the position graph with traps
+    relaxed to their most permissive status (see GameEnv.get_relaxed_successors).
+    :param game_env: GameEnv instance
+    :param target_cells: iterable of cell indices (row * n_cols + col)
+    :return: array of scaled costs indexed by cell, with UNREACHABLE for cells which cannot reach any target
+    """
+    n_cells = game_env.n_rows * game_env.n_cols
+    action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+
+    # Reverse adjacency: predecessors[next_cell] = [(cell, cost), ...]
+    predecessors = [[] for _ in range(n_cells)]
+    for cell in range(n_cells):
+        for action_index, next_cell in game_env.get_relaxed_successors(cell):
+            if next_cell != cell:
+                predecessors[next_cell].append((cell, action_costs[action_index]))
+
+    dist = array('l', [UNREACHABLE]) * n_cells
+    frontier = [(0, cell) for cell in target_cells]
+    heapq.heapify(frontier)
+    while frontier:
+        d, cell = heapq.heappop(frontier)
+        if dist[cell] != UNREACHABLE:
+            continue
+        dist[cell] = d
+        for prev_cell, cost in predecessors[cell]:
+            if dist[prev_cell] == UNREACHABLE:
+                heapq.heappush(frontier, (d + cost, prev_cell))
+    return dist
+
+
+class RelaxedDistanceHeuristic:
+    """
+    Admissible and consistent heuristic built from relaxed distances (traps relaxed to their most permissive status).
+
+    For a state at cell c with unactivated levers U, the estimate is
+        max(dist(c, goal), max over l in U of dist(c, l) + dist(l, goal)) + |U| * ACTION_COST[ACTIVATE]
+    since every unactivated lever must be visited and activated on the way to the goal. All distances are looked up
+    in flat arrays indexed by cell, computed once per level by reverse Dijkstra from the goal and from each lever.
+    """
+
+    def __init__(self, game_env):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.n_cells = game_env.n_rows * game_env.n_cols
+        self.activate_cost = scale_cost(game_env.ACTION_COST[game_env.ACTIVATE])
+        n_cols = game_env.n_cols
+
+        goal_cell = game_env.goal_row * n_cols + game_env.goal_col
+        self.goal_dist = reverse_dijkstra(game_env, [goal_cell])
+
+        # lever_dist[i][c]: cost from cell c to lever i, then on to the goal (trap i is toggled by lever i)
+        self.lever_dist = []
+        for lever_row, lever_col in game_env.lever_positions:
+            lever_cell = lever_row * n_cols + lever_col
+            to_lever = reverse_dijkstra(game_env, [lever_cell])
+            lever_to_goal = self.goal_dist[lever_cell]
+            via_lever = array('l', [UNREACHABLE]) * self.n_cells
+            if lever_to_goal != UNREACHABLE:
+                for cell in range(self.n_cells):
+                    if to_lever[cell] != UNREACHABLE:
+                        via_lever[cell] = to_lever[cell] + lever_to_goal
+            self.lever_dist.append(via_lever)
+
+    def compute_scaled(self, state_id):
+        """
+        Compute the heuristic value of a state.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: heuristic value in fixed-point cost units, or None if the solved state is unreachable
+        """
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        h = self.goal_dist[cell]
+        if h == UNREACHABLE:
+            return None
+        n_unactivated = 0
+        for i, via_lever in enumerate(self.lever_dist):
+            if not (trap_bits >> i) & 1:
+                d = via_lever[cell]
+                if d == UNREACHABLE:
+                    return None
+                if d > h:
+                    h = d
+                n_unactivated += 1
+        return h + n_unactivated * self.activate_cost
+
+    def compute(self, state):
+        """
+        Compute the heuristic value of a state.
+        :param state: GameState or CompactState
+        :return: heuristic value (float), or inf if the solved state is unreachable
+        """
+        h = self.compute_scaled(self.game_env.encode_state(state))
+        if h is None:
+            return float('inf')
+        return unscale_cost(h)
+
+
+class MaxHeuristic:
+    """
+    Maximum of several admissible heuristic providers (each with compute_scaled and compute methods), which is itself
+    admissible (and consistent if every provider is consistent).
+    """
+
+    def __init__(self, game_env, providers):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.providers = list(providers)
+
+    def compute_scaled(self, state_id):
+        """
+        Compute the heuristic value of a state.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: heuristic value in fixed-point cost units, or None if any provider finds the solved state unreachable
+        """
+        h = 0
+        for provider in self.providers:
+            value = provider.compute_scaled(state_id)
+            if value is None:
+                return None
+            if value > h:
+                h = value
+        return h
+
+    def compute(self, state):
+        """
+        Compute the heuristic value of a state.
+        :param state: GameState or CompactState
+        :return: heuristic value (float), or inf if the solved state is unreachable
+        """
+        h = self.compute_scaled(self.game_env.encode_state(state))
+        if h is None:
+            return float('inf')
+        return unscale_cost(h)
@@ -0,0 +1,277 @@
+import heapq
+
+from search_engine import SearchEngine, scale_cost
+from transition_model import get_transition_model
+
+"""
+hierarchical_search.py
+
+This file contains a hierarchical pathfinding search (HPA*) for large GameEnv levels. The grid is split into square
+clusters; the abstract graph connects the entrance cells of each cluster by the cheapest paths inside it, which are
+computed on demand and cached per cluster and per status of the traps that cluster depends on. Plans are found over
+the abstract graph and then refined into plain GameEnv.ACTIONS by a search inside each cluster the plan crosses.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Default cluster width and height, in cells
+DEFAULT_CLUSTER_SIZE = 8
+
+
+def get_hierarchy(game_env, cluster_size=DEFAULT_CLUSTER_SIZE):
+    """
+    Get the HierarchicalSearch for a level. It is built on first use and kept on the environment (one per cluster
+    size), so its cached intra-cluster edges are shared by every later query and Solver on the same level.
+    :param game_env: GameEnv instance (modified or unmodified)
+    :param cluster_size: cluster width and height, in cells
+    :return: HierarchicalSearch
+    """
+    hierarchies = game_env.__dict__.get("_hierarchies")
+    if hierarchies is None:
+        hierarchies = {}
+        game_env._hierarchies = hierarchies
+    hierarchy = hierarchies.get(cluster_size)
+    if hierarchy is None:
+        hierarchy = HierarchicalSearch(game_env, cluster_size=cluster_size)
+        hierarchies[cluster_size] = hierarchy
+    return hierarchy
+
+
+class HierarchicalSearch:
+    """
+    UCS/A* over an abstract graph whose states are dense state IDs (see GameEnv.encode_state) at node cells.
+
+    A move is internal if it is compiled, toggles no trap and stays within one cluster; every other move is external,
+    and node cells are the cells external moves start or end at, plus the goal and each query's start cell. From a
+    node, the abstract graph has the external moves (from GameEnv.get_successor_ids) and an intra-cluster edge to each
+    other node of its cluster, at the cost of the cheapest path of internal moves. Intra-cluster edges are computed
+    when a node is first expanded, cached under (cluster, trap bits & the mask of traps the cluster's moves read), and
+    refined into actions only for the plan found. Plans are optimal for the reason given in SearchEngine.search_macro.
+    """
+
+    def __init__(self, game_env, cluster_size=DEFAULT_CLUSTER_SIZE):
+        """
+        :param game_env: GameEnv instance
+        :param cluster_size: cluster width and height, in cells
+        """
+        assert cluster_size > 0, "/!\\ ERROR: HierarchicalSearch cluster_size must be positive"
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.cluster_size = cluster_size
+        n_cols = game_env.n_cols
+        self.n_cells = game_env.n_rows * n_cols
+        self.action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+        clusters_per_row = (n_cols + cluster_size - 1) // cluster_size
+
+        self.cluster_of = [
+            (cell // n_cols // cluster_size) * clusters_per_row + (cell % n_cols) // cluster_size
+            for cell in range(self.n_cells)
+        ]
+        self.is_node = bytearray(self.n_cells)
+        self.is_node[game_env.goal_row * n_cols + game_env.goal_col] = 1
+        # Internal moves out of each cell: internal_moves[cell] = ((action index, dependency bitmask, outcomes), ...)
+        self.internal_moves = [()] * self.n_cells
+        # cluster_masks[cluster] = bitmask of the traps read by the cluster's internal moves
+        self.cluster_masks = [0] * (max(self.cluster_of) + 1)
+        for cell in range(self.n_cells):
+            if game_env.grid_data[cell // n_cols][cell % n_cols] == game_env.SOLID_TILE:
+                continue
+            internal = []
+            for action_index, dep_mask, outcomes in game_env.get_cell_transitions(cell):
+                if outcomes is None:
+                    self.is_node[cell] = 1
+                    d_row, d_col = game_env.ACTION_DELTAS[game_env.ACTION_LIST[action_index]]
+                    next_row, next_col = cell // n_cols + d_row, cell % n_cols + d_col
+                    if (
+                        0 <= next_row < game_env.n_rows
+                        and 0 <= next_col < n_cols
+                        and game_env.grid_data[next_row][next_col] != game_env.SOLID_TILE
+                    ):
+                        self.is_node[next_row * n_cols + next_col] = 1
+                    continue
+                is_internal = True
+                for outcome in outcomes.values():
+                    if outcome is None:
+                        continue
+                    next_cell, toggle = outcome
+                    if toggle or self.cluster_of[next_cell] != self.cluster_of[cell]:
+                        is_internal = False
+                        self.is_node[cell] = 1
+                        self.is_node[next_cell] = 1
+                if is_internal:
+                    internal.append((action_index, dep_mask, outcomes))
+                    self.cluster_masks[self.cluster_of[cell]] |= dep_mask
+            self.internal_moves[cell] = tuple(internal)
+
+        # (cluster, trap bits & cluster mask) -> {node cell: ((node cell, scaled cost), ...)}
+        self.edge_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.refined_edges = 0
+
+        self.engine = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.plan_cost = None
+
+    def _get_intra_edges(self, cell, trap_bits, cache=True):
+        """
+        Get the intra-cluster edges from a cell under the given trap status, searching the cluster on a cache miss.
+        :param cell: cell index (row * n_cols + col)
+        :param trap_bits: trap status bitmask
+        :param cache: if False, the edges are not stored (used for a start cell which is not a node)
+        :return: tuple of (node cell, scaled cost) pairs
+        """
+        cluster = self.cluster_of[cell]
+        key = (cluster, trap_bits & self.cluster_masks[cluster])
+        cluster_edges = self.edge_cache.get(key)
+        if cluster_edges is None:
+            cluster_edges = {}
+            if cache:
+                self.edge_cache[key] = cluster_edges
+        edges = cluster_edges.get(cell)
+        if edges is not None:
+            self.cache_hits += 1
+            return edges
+        self.cache_misses += 1
+        edges = self._search_cluster(cell, trap_bits)
+        if cache:
+            cluster_edges[cell] = edges
+        return edges
+
+    def _search_cluster(self, start_cell, trap_bits, target_cell=None):
+        """
+        Dijkstra from a cell over internal moves (which never leave its cluster) to every node cell it can reach, or
+        to the given target cell only.
+        :param start_cell: cell index (row * n_cols + col)
+        :param trap_bits: trap status bitmask
+        :param target_cell: if given, the cell to refine a path to
+        :return: tuple of (node cell, scaled cost) pairs, or, if target_cell is given, the tuple of action indices of
+            a cheapest path to it
+        """
+        action_costs = self.action_costs
+        internal_moves = self.internal_moves
+        is_node = self.is_node
+        best = {start_cell: 0}
+        parents = {start_cell: None}
+        edges = []
+        frontier = [(0, start_cell)]
+        while frontier:
+            cost, cell = heapq.heappop(frontier)
+            if cost > best[cell]:
+                continue
+            if cell == target_cell:
+                actions = []
+                while parents[cell] is not None:
+                    cell, action_index = parents[cell]
+                    actions.append(action_index)
+                return tuple(reversed(actions))
+            if target_cell is None and is_node[cell] and cell != start_cell:
+                edges.append((cell, cost))
+            for action_index, dep_mask, outcomes in internal_moves[cell]:
+                outcome = outcomes[trap_bits & dep_mask]
+                if outcome is None:
+                    continue
+                next_cell = outcome[0]
+                next_cost = cost + action_costs[action_index]
+                if next_cost < best.get(next_cell, float('inf')):
+                    best[next_cell] = next_cost
+                    parents[next_cell] = (cell, action_index)
+                    heapq.heappush(frontier, (next_cost, next_cell))
+        assert target_cell is None, "/!\\ ERROR: HierarchicalSearch intra-cluster edge cannot be refined"
+        return tuple(edges)
+
+    def refine_edge(self, state_id, next_id, edge):
+        """
+        Get the actions an edge of the abstract graph stands for (see get_abstract_successors).
+        :param state_id: state ID the edge starts from
+        :param next_id: state ID the edge leads to
+        :param edge: tuple of action indices for an external move, or None for an intra-cluster edge
+        :return: tuple of action indices into GameEnv.ACTION_LIST
+        """
+        if edge is not None:
+            return edge
+        self.refined_edges += 1
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        return self._search_cluster(cell, trap_bits, target_cell=next_id % self.n_cells)
+
+    def get_abstract_successors(self, state_id, cache=True):
+        """
+        Get the successors of a state in the abstract graph.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :param cache: if False, intra-cluster edges are not cached (used for a start cell which is not a node)
+        :return: list of (next state ID, scaled cost, edge) triples, where edge is a tuple of action indices for an
+            external move, or None for an intra-cluster edge (see refine_edge)
+        """
+        n_cells = self.n_cells
+        cluster_of = self.cluster_of
+        trap_bits, cell = divmod(state_id, n_cells)
+        successors = []
+        if self.is_node[cell]:
+            internal = {action_index for action_index, _, _ in self.internal_moves[cell]}
+            for action_index, next_id in self.game_env.get_successor_ids(state_id):
+                if (action_index not in internal or next_id // n_cells != trap_bits
+                        or cluster_of[next_id % n_cells] != cluster_of[cell]):
+                    successors.append((next_id, self.action_costs[action_index], (action_index,)))
+        base = trap_bits * n_cells
+        for next_cell, cost in self._get_intra_edges(cell, trap_bits, cache):
+            successors.append((base + next_cell, cost, None))
+        return successors
+
+    def count_nodes(self):
+        """
+        Count the node cells of the abstract graph.
+        :return: (number of node cells, number of non-solid cells)
+        """
+        game_env = self.game_env
+        n_open = sum(1 for row in game_env.grid_data for tile in row if tile != game_env.SOLID_TILE)
+        return sum(self.is_node), n_open
+
+    def search(self, heuristic=None, init_state=None):
+        """
+        Find an optimal path to the solved state over the abstract graph (see SearchEngine.search_macro), using UCS
+        if no heuristic is given and A* otherwise, and refine it into actions (see refine_edge).
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in COST_SCALE units, or to None if the solved state is unreachable from it (None for UCS)
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        game_env = self.game_env
+        if init_state is None:
+            init_state = game_env.get_init_state()
+        init_id = game_env.encode_state(init_state)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.refined_edges = 0
+        # A start cell which is not a node is only inserted into the abstract graph for this query
+        init_is_node = self.is_node[init_id % self.n_cells]
+
+        def get_successors(state_id):
+            return self.get_abstract_successors(state_id, cache=init_is_node or state_id != init_id)
+
+        self.engine = SearchEngine(game_env)
+        path = self.engine.search_macro(get_successors, heuristic=heuristic, init_state=init_state,
+                                        refine_edge=self.refine_edge)
+        self.nodes_expanded = self.engine.nodes_expanded
+        self.nodes_generated = self.engine.nodes_generated
+        self.plan_cost = self.engine.plan_cost
+        return path
+
+    def get_stats(self):
+        """
+        Get statistics of the most recent search.
+        :return: dict of statistic name to value
+        """
+        n_nodes, n_open = self.count_nodes()
+        stats = {
+            "node_cells": n_nodes,
+            "open_cells": n_open,
+            "cached_clusters": len(self.edge_cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "refined_edges": self.refined_edges,
+        }
+        if self.engine is None:
+            return stats
+        return self.engine.get_stats(**stats)
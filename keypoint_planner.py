@@ -0,0 +1,279 @@
+import heapq
+
+from search_engine import scale_cost, unscale_cost
+from transition_model import get_transition_model
+
+"""
+keypoint_planner.py
+
+This file contains a planner which works on an abstraction of the level built around its keypoints (the player's
+initial position, each lever and the goal). Trap statuses only change when a lever is activated, so any plan is a
+sequence of walks under a fixed trap configuration, separated by lever activations. The planner searches over
+(keypoint, trap configuration) pairs, using cheapest low-level paths between keypoints (computed lazily, once per
+source keypoint and trap configuration) as edges, and then expands the result back into a list of actions.
+
+Since every walk segment of an optimal plan is a cheapest path between consecutive activation points, the plans
+returned are optimal.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+class KeypointPlanner:
+    """
+    Optimal planner over the keypoint abstraction of a GameEnv level.
+
+    The abstract search is A* (or UCS without a heuristic) over (cell, trap bits) nodes at keypoints. Edges are lever
+    activations and walks to levers (or, once every trap is activated, to the goal), weighted by the cheapest
+    low-level path cost. Closed nodes are reopened if a cheaper path to them is found, so admissible (but
+    inconsistent) heuristics still give optimal plans. Cheapest walks are kept between searches.
+    """
+
+    def __init__(self, game_env):
+        """
+        :param game_env: GameEnv instance
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.n_cells = game_env.n_rows * game_env.n_cols
+        self.action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+        self.activate_index = game_env.ACTION_LIST.index(game_env.ACTIVATE)
+        self.full_trap_bits = (1 << len(game_env.trap_positions)) - 1
+
+        n_cols = game_env.n_cols
+        self.init_cell = game_env.init_row * n_cols + game_env.init_col
+        self.goal_cell = game_env.goal_row * n_cols + game_env.goal_col
+        self.lever_cells = [row * n_cols + col for row, col in game_env.lever_positions]
+        self.keypoints = []
+        for cell in [self.init_cell] + self.lever_cells + [self.goal_cell]:
+            if cell not in self.keypoints:
+                self.keypoints.append(cell)
+
+        # Walks only ever need to end at a lever (to activate it) or at the goal
+        self.target_cells = set(self.lever_cells) | {self.goal_cell}
+
+        # Movement actions from each cell (see _build_moves)
+        self._moves = [self._build_moves(cell) for cell in range(self.n_cells)]
+
+        # source cell -> list of (dep_mask, trap_bits & dep_mask, keypoint distances)
+        self._path_cache = {}
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.low_level_searches = 0
+        self.plan_cost = None
+
+    def _build_moves(self, cell):
+        """
+        Get the movement actions (i.e. everything except activation) which can succeed from a cell.
+        :return: list of (action index, dependency bitmask, relevant bitmask, outcomes) tuples, where outcomes maps
+            (trap bits & dependency bitmask) to the next cell (or None if the move fails), or is None if the move was
+            not compiled. The relevant bitmask holds only the traps whose status can actually change the outcome.
+        """
+        moves = []
+        for action_index, dep_mask, outcomes in self.game_env.get_cell_transitions(cell):
+            if action_index == self.activate_index:
+                continue
+            if outcomes is None:
+                # Uncompiled - conservatively depend on every trap
+                moves.append((action_index, 0, self.full_trap_bits, None))
+                continue
+            next_cells = {key: None if outcome is None else outcome[0] for key, outcome in outcomes.items()}
+            relevant_mask = 0
+            for key, next_cell in next_cells.items():
+                for i in range(dep_mask.bit_length()):
+                    bit = 1 << i
+                    if dep_mask & bit and next_cells[key ^ bit] != next_cell:
+                        relevant_mask |= bit
+            moves.append((action_index, dep_mask, relevant_mask, next_cells))
+        return moves
+
+    def _dijkstra(self, source_cell, trap_bits, targets=None):
+        """
+        Run a Dijkstra search over cells from the given cell, under fixed trap bits (i.e. without activating levers).
+        :param targets: set of cells, or None; the search stops early once every target has been reached
+        :return: (dist, parents, dep_mask), where dist and parents map cell to scaled cost and to (action index,
+            previous cell), and dep_mask holds every trap bit the search depended on
+        """
+        game_env = self.game_env
+        moves = self._moves
+        action_costs = self.action_costs
+        n_cells = self.n_cells
+        dist = {}
+        parents = {source_cell: None}
+        best = {source_cell: 0}
+        dep_mask = 0
+        remaining = len(targets) if targets is not None else -1
+        frontier = [(0, source_cell)]
+        while frontier:
+            d, cell = heapq.heappop(frontier)
+            if cell in dist:
+                continue
+            dist[cell] = d
+            if targets is not None and cell in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+            for action_index, cell_dep_mask, relevant_mask, next_cells in moves[cell]:
+                dep_mask |= relevant_mask
+                if next_cells is None:
+                    next_cell = None
+                    state_id = trap_bits * n_cells + cell
+                    for next_index, next_id in game_env.get_successor_ids(state_id):
+                        if next_index == action_index:
+                            next_cell = next_id % n_cells
+                else:
+                    next_cell = next_cells[trap_bits & cell_dep_mask]
+                if next_cell is None or next_cell in dist:
+                    continue
+                next_d = d + action_costs[action_index]
+                if next_d < best.get(next_cell, next_d + 1):
+                    best[next_cell] = next_d
+                    parents[next_cell] = (action_index, cell)
+                    heapq.heappush(frontier, (next_d, next_cell))
+        return dist, parents, dep_mask
+
+    def _keypoint_distances(self, source_cell, trap_bits):
+        """
+        Get the cheapest walking costs from a cell to every lever and the goal under fixed trap bits. Results are
+        cached per source cell and per status of the traps the walks actually depend on, so trap configurations which
+        differ only in irrelevant traps share one low-level search.
+        :return: dict mapping target cell to scaled cost
+        """
+        entries = self._path_cache.setdefault(source_cell, [])
+        for dep_mask, masked_bits, distances in entries:
+            if trap_bits & dep_mask == masked_bits:
+                return distances
+        self.low_level_searches += 1
+
+        dist, _, dep_mask = self._dijkstra(source_cell, trap_bits)
+        distances = {cell: dist[cell] for cell in self.target_cells if cell in dist and cell != source_cell}
+        entries.append((dep_mask, trap_bits & dep_mask, distances))
+        return distances
+
+    def _activate(self, cell, trap_bits):
+        """
+        Get the trap bits after activating the lever at a cell, or None if activation fails or has no effect.
+        """
+        for action_index, dep_mask, outcomes in self.game_env.get_cell_transitions(cell):
+            if action_index != self.activate_index:
+                continue
+            if outcomes is None:
+                state_id = trap_bits * self.n_cells + cell
+                for next_index, next_id in self.game_env.get_successor_ids(state_id):
+                    if next_index == action_index and next_id != state_id:
+                        return next_id // self.n_cells
+                return None
+            outcome = outcomes[trap_bits & dep_mask]
+            if outcome is None or outcome[1] == 0:
+                return None
+            return trap_bits ^ outcome[1]
+        return None
+
+    def _expand_walk(self, source_cell, target_cell, trap_bits):
+        """
+        Expand a walk between two cells under fixed trap bits into a list of actions.
+        """
+        _, parents, _ = self._dijkstra(source_cell, trap_bits, {target_cell})
+        actions = []
+        cell = target_cell
+        while cell != source_cell:
+            action_index, cell = parents[cell]
+            actions.append(self.game_env.ACTION_LIST[action_index])
+        actions.reverse()
+        return actions
+
+    def search(self, heuristic=None):
+        """
+        Find an optimal plan by searching over (keypoint, trap bits) pairs.
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in SearchEngine fixed-point cost units, or to None if the solved state is unreachable from it (None for
+            uniform cost)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the level
+            cannot be solved
+        """
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.plan_cost = None
+        activate_cost = self.action_costs[self.activate_index]
+        lever_cells = set(self.lever_cells)
+        n_cells = self.n_cells
+
+        start = (self.init_cell, 0)
+        goal = (self.goal_cell, self.full_trap_bits)
+        start_h = heuristic(self.init_cell) if heuristic is not None else 0
+        if start_h is None:
+            return None
+        best = {start: 0}
+        # node -> (previous node, is activation)
+        parents = {start: None}
+        closed = set()
+        # Entries are (f, -g, tie-breaking counter, node): ties prefer deeper nodes, then insertion order
+        counter = 0
+        frontier = [(start_h, 0, counter, start)]
+        while frontier:
+            _, neg_cost, _, node = heapq.heappop(frontier)
+            cost = -neg_cost
+            if node in closed or cost > best[node]:
+                # Stale entry (node already expanded, or reached again more cheaply)
+                continue
+            closed.add(node)
+            if node == goal:
+                self.plan_cost = unscale_cost(cost)
+                return self._expand_plan(parents, goal)
+            self.nodes_expanded += 1
+
+            cell, trap_bits = node
+            edges = []
+            if cell in lever_cells:
+                next_trap_bits = self._activate(cell, trap_bits)
+                if next_trap_bits is not None:
+                    edges.append(((cell, next_trap_bits), activate_cost, True))
+            for target_cell, walk_cost in self._keypoint_distances(cell, trap_bits).items():
+                if target_cell == self.goal_cell and trap_bits != self.full_trap_bits:
+                    continue
+                edges.append(((target_cell, trap_bits), walk_cost, False))
+
+            for next_node, edge_cost, is_activation in edges:
+                next_cost = cost + edge_cost
+                if next_cost < best.get(next_node, next_cost + 1):
+                    if heuristic is None:
+                        next_h = 0
+                    else:
+                        next_h = heuristic(next_node[1] * n_cells + next_node[0])
+                        if next_h is None:
+                            continue
+                    best[next_node] = next_cost
+                    parents[next_node] = (node, is_activation)
+                    closed.discard(next_node)
+                    self.nodes_generated += 1
+                    counter += 1
+                    heapq.heappush(frontier, (next_cost + next_h, -next_cost, counter, next_node))
+        return None
+
+    def get_stats(self):
+        """
+        Get statistics of the most recent search.
+        :return: dict with keys nodes_expanded, nodes_generated (abstract nodes), low_level_searches (cheapest walk
+            searches run so far, including earlier searches) and plan_cost
+        """
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "low_level_searches": self.low_level_searches,
+            "plan_cost": self.plan_cost,
+        }
+
+    def _expand_plan(self, parents, goal):
+        segments = []
+        node = goal
+        while parents[node] is not None:
+            prev_node, is_activation = parents[node]
+            if is_activation:
+                segments.append([self.game_env.ACTIVATE])
+            else:
+                segments.append(self._expand_walk(prev_node[0], node[0], prev_node[1]))
+            node = prev_node
+        plan = []
+        for segment in reversed(segments):
+            plan.extend(segment)
+        return plan
@@ -0,0 +1,248 @@
+from collections import deque
+
+from heuristics import UNREACHABLE, reverse_dijkstra
+from search_engine import scale_cost, unscale_cost
+from transition_model import get_transition_model
+
+"""
+lever_analysis.py
+
+This file contains an analysis of the dependencies between levers: which levers can only be reached after another
+lever's trap has been locked. The dependencies give a heuristic which accounts for levers which must be visited in
+sequence.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Smallest number of levers for which Solver uses LeverDependencyGraph in place of RelaxedDistanceHeuristic (on
+# smaller levels, the analysis costs more than it saves)
+MIN_LEVERS_FOR_HEURISTIC = 8
+
+
+def relaxed_reverse_reachability(game_env, target_cell, trap_index, trap_status):
+    """
+    Find the cells from which the target cell can be reached without changing the status of one trap, over the
+    position graph with every other trap relaxed to its most permissive status.
+    :param game_env: GameEnv instance
+    :param target_cell: cell index (row * n_cols + col)
+    :param trap_index: index of the trap with a fixed status
+    :param trap_status: status of that trap (0 for open, 1 for locked)
+    :return: bytearray indexed by cell, set to 1 for cells which can reach the target
+    """
+    return _reachability(_fixed_trap_predecessors(game_env, trap_index, trap_status), target_cell)
+
+
+def _fixed_trap_predecessors(game_env, trap_index, trap_status):
+    n_cells = game_env.n_rows * game_env.n_cols
+    activate_index = game_env.ACTION_LIST.index(game_env.ACTIVATE)
+    bit = 1 << trap_index
+    fixed = bit if trap_status else 0
+    predecessors = [[] for _ in range(n_cells)]
+    for cell in range(n_cells):
+        for action_index, dep_mask, outcomes in game_env.get_cell_transitions(cell):
+            if action_index == activate_index:
+                continue
+            if outcomes is None:
+                for _, next_cell in game_env.get_relaxed_successors(cell):
+                    predecessors[next_cell].append(cell)
+                continue
+            next_cells = {
+                outcome[0] for key, outcome in outcomes.items()
+                if outcome is not None and (not dep_mask & bit or key & bit == fixed)
+            }
+            for next_cell in next_cells:
+                if next_cell != cell:
+                    predecessors[next_cell].append(cell)
+    return predecessors
+
+
+def _reachability(predecessors, target_cell):
+    reached = bytearray(len(predecessors))
+    reached[target_cell] = 1
+    queue = deque([target_cell])
+    while queue:
+        cell = queue.popleft()
+        for prev_cell in predecessors[cell]:
+            if not reached[prev_cell]:
+                reached[prev_cell] = 1
+                queue.append(prev_cell)
+    return reached
+
+
+class LeverDependencyGraph:
+    """
+    Dependencies between levers (lever i toggles trap i), from relaxed reachability with one trap's status fixed.
+
+    For each ordered pair of levers (j, i), a table records the cells from which lever i can be reached while trap j
+    stays open (every other trap relaxed). If the player is at a cell which cannot reach lever i while trap j stays
+    open, and trap j is open, lever j must be activated before lever i is first reached. Only pairs for which keeping
+    trap j open cuts some cells off from lever i are stored.
+
+    get_dependencies lists the dependencies which apply to a state, and is_dead_id detects states from which some
+    unactivated lever can no longer be reached (so the solved state is unreachable), either directly or because the
+    dependencies between unactivated levers form a cycle; SearchEngine.search can drop these states as successors.
+
+    compute_scaled is an admissible heuristic for A*, which extends RelaxedDistanceHeuristic (and is never lower
+    than it): it chains the dependencies which apply to a state into orders in which levers must be first visited,
+    and takes the longest such route to the goal (in relaxed distances), plus one activation per unactivated lever.
+    """
+
+    def __init__(self, game_env):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        n_cols = game_env.n_cols
+        self.n_cells = game_env.n_rows * n_cols
+        self.n_levers = len(game_env.lever_positions)
+        self.activate_cost = scale_cost(game_env.ACTION_COST[game_env.ACTIVATE])
+        self.lever_cells = [row * n_cols + col for row, col in game_env.lever_positions]
+        goal_cell = game_env.goal_row * n_cols + game_env.goal_col
+
+        # Relaxed distances: to_lever[i][cell], lever_to_lever[j][i] and lever_to_goal[i]
+        self.goal_dist = goal_dist = reverse_dijkstra(game_env, [goal_cell])
+        self.to_lever = [reverse_dijkstra(game_env, [cell]) for cell in self.lever_cells]
+        self.lever_to_lever = [[self.to_lever[i][cell] for i in range(self.n_levers)] for cell in self.lever_cells]
+        self.lever_to_goal = [goal_dist[cell] for cell in self.lever_cells]
+
+        # (j, i) -> bytearray of cells which can reach lever i while trap j stays open
+        self.reachable_open = {}
+        for j in range(self.n_levers):
+            predecessors = _fixed_trap_predecessors(game_env, j, 0)
+            for i in range(self.n_levers):
+                if i == j:
+                    continue
+                reached = _reachability(predecessors, self.lever_cells[i])
+                if any(not reached[cell] and self.to_lever[i][cell] != UNREACHABLE for cell in range(self.n_cells)):
+                    self.reachable_open[(j, i)] = reached
+        # Per cell: relaxed distance to each lever, a bitmask of the levers which cannot be reached, and the
+        # dependencies which apply there as (bitmask of traps j and i, j, i, lever j to lever i
+        # distance), in topological order (None if they form a cycle)
+        self._cell_to_lever = [tuple(to_lever[cell] for to_lever in self.to_lever) for cell in range(self.n_cells)]
+        self._cell_unreachable = [
+            sum(1 << i for i, d in enumerate(dists) if d == UNREACHABLE) for dists in self._cell_to_lever
+        ]
+        self._cell_edges = []
+        for cell in range(self.n_cells):
+            edges = [((1 << j) | (1 << i), j, i, self.lever_to_lever[j][i])
+                     for (j, i), reached in self.reachable_open.items() if not reached[cell]]
+            self._cell_edges.append(self._topological_sort(edges))
+        # Trap bits -> tuple of unactivated lever indices
+        self._unactivated = {}
+
+    def _topological_sort(self, edges):
+        """
+        Sort dependency edges so that every edge into a lever comes before every edge out of it.
+        :param edges: list of (mask, j, i, distance) tuples
+        :return: sorted tuple of edges, or None if the edges contain a cycle
+        """
+        in_degree = {}
+        for _, j, i, _ in edges:
+            in_degree[i] = in_degree.get(i, 0) + 1
+            in_degree.setdefault(j, 0)
+        ready = sorted(lever for lever, degree in in_degree.items() if degree == 0)
+        ordered = []
+        while ready:
+            lever = ready.pop()
+            for edge in edges:
+                if edge[1] == lever:
+                    ordered.append(edge)
+                    in_degree[edge[2]] -= 1
+                    if in_degree[edge[2]] == 0:
+                        ready.append(edge[2])
+        if len(ordered) < len(edges):
+            return None
+        return tuple(ordered)
+
+    def get_dependencies(self, state_id):
+        """
+        List the dependencies which apply to a state.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: list of (j, i) pairs, where unactivated lever j must be activated before unactivated lever i is
+            first reached
+        """
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        return [(j, i) for (j, i), reached in self.reachable_open.items()
+                if not reached[cell] and not (trap_bits >> j) & 1 and not (trap_bits >> i) & 1]
+
+    def is_dead_id(self, state_id):
+        """
+        Check whether the solved state is unreachable from a state according to the lever dependencies (exactly when
+        compute_scaled returns None, but without computing the heuristic value).
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: True if the state is dead
+        """
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        if self.goal_dist[cell] == UNREACHABLE or ~trap_bits & self._cell_unreachable[cell]:
+            return True
+        # Dependencies at cells without a cycle never make a state dead
+        return self._cell_edges[cell] is None and self._relax_cyclic(trap_bits, cell) is None
+
+    def compute_scaled(self, state_id):
+        """
+        Compute the heuristic value of a state.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: heuristic value in fixed-point cost units, or None if the solved state is unreachable
+        """
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        h = self.goal_dist[cell]
+        if h == UNREACHABLE or ~trap_bits & self._cell_unreachable[cell]:
+            return None
+        unactivated = self._unactivated.get(trap_bits)
+        if unactivated is None:
+            unactivated = tuple(i for i in range(self.n_levers) if not (trap_bits >> i) & 1)
+            self._unactivated[trap_bits] = unactivated
+
+        # arrival[i]: lower bound on the cost of first reaching lever i (if unactivated)
+        edges = self._cell_edges[cell]
+        if edges is None:
+            arrival = self._relax_cyclic(trap_bits, cell)
+            if arrival is None:
+                return None
+        elif edges:
+            arrival = list(self._cell_to_lever[cell])
+            for mask, j, i, d in edges:
+                if not trap_bits & mask:
+                    d += arrival[j]
+                    if d > arrival[i]:
+                        arrival[i] = d
+        else:
+            arrival = self._cell_to_lever[cell]
+
+        lever_to_goal = self.lever_to_goal
+        for i in unactivated:
+            d = arrival[i] + lever_to_goal[i]
+            if d > h:
+                h = d
+        return h + len(unactivated) * self.activate_cost
+
+    def _relax_cyclic(self, trap_bits, cell):
+        """
+        Compute the lever arrival bounds for compute_scaled at a cell whose dependencies contain a cycle, by relaxing
+        them repeatedly.
+        :return: list of arrival bounds indexed by lever, or None if the unactivated levers form a dependency cycle
+            (each must be reached before the others, so the state is dead)
+        """
+        arrival = list(self._cell_to_lever[cell])
+        edges = [((1 << j) | (1 << i), j, i, self.lever_to_lever[j][i])
+                 for (j, i), reached in self.reachable_open.items() if not reached[cell]]
+        for _ in range(self.n_levers + 1):
+            changed = False
+            for mask, j, i, d in edges:
+                if not trap_bits & mask:
+                    d += arrival[j]
+                    if d > arrival[i]:
+                        arrival[i] = d
+                        changed = True
+            if not changed:
+                return arrival
+        return None
+
+    def compute(self, state):
+        """
+        Compute the heuristic value of a state.
+        :param state: GameState or CompactState
+        :return: heuristic value (float), or inf if the solved state is unreachable
+        """
+        h = self.compute_scaled(self.game_env.encode_state(state))
+        if h is None:
+            return float('inf')
+        return unscale_cost(h)
@@ -0,0 +1,333 @@
+from collections import OrderedDict
+
+from search_engine import scale_cost, unscale_cost
+from transition_model import get_transition_model
+
+"""
+memory_bounded_search.py
+
+This file contains an iterative deepening A* (IDA*) search for levels whose reachable state space does not fit in
+memory. Memory use is bounded by the length of the current path plus a transposition table with a fixed capacity.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Default maximum number of transposition table entries
+DEFAULT_TABLE_CAPACITY = 1000000
+
+# Target ratio between the numbers of nodes expanded by successive iterations (see IDAStarSearch._next_threshold)
+THRESHOLD_GROWTH = 2
+
+
+class TranspositionTable:
+    """
+    Fixed-capacity table mapping state ID to [learned heuristic value, iteration last reached, g-cost when last
+    reached].
+
+    Eviction policy: least recently used. Every lookup or update moves the entry to the most recently used end, and
+    inserting into a full table evicts the least recently used entry. States near the current search path are looked
+    up most often, so they stay resident, while states from abandoned subtrees are evicted first.
+    """
+
+    def __init__(self, capacity=DEFAULT_TABLE_CAPACITY):
+        assert capacity > 0, "/!\\ ERROR: TranspositionTable capacity must be positive"
+        self.capacity = capacity
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, state_id):
+        """
+        :return: [learned h, iteration, g] list (which may be updated in place), or None if not stored
+        """
+        entry = self._entries.get(state_id)
+        if entry is not None:
+            self._entries.move_to_end(state_id)
+        return entry
+
+    def put(self, state_id, h, iteration, g):
+        """
+        Store an entry, evicting the least recently used entry if the table is full.
+        :return: the stored [h, iteration, g] list
+        """
+        entries = self._entries
+        entry = entries.get(state_id)
+        if entry is not None:
+            entry[0], entry[1], entry[2] = h, iteration, g
+            entries.move_to_end(state_id)
+            return entry
+        if len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entry = [h, iteration, g]
+        entries[state_id] = entry
+        return entry
+
+
+class IDAStarSearch:
+    """
+    Iterative deepening A* over dense state IDs (see GameEnv.encode_state), using GameEnv.get_successor_ids for
+    expansion, so it accepts the same heuristic functions as SearchEngine.
+
+    Each iteration is a depth-first search which cuts off states with f = g + h above a threshold. The threshold is
+    raised so that the next iteration should expand about THRESHOLD_GROWTH times as many nodes (as in IDA*_CR; see
+    _next_threshold), rather than to the smallest f cut off, and may overshoot the optimal cost, so once a plan is
+    found the rest of that iteration is a branch and bound search for a cheaper one. The transposition table skips
+    states reached again within an iteration at no lower g-cost, and stores learned heuristic values (the smallest f
+    found below a state, minus its g-cost). Evicted entries only lose this information, so plans remain optimal for
+    any table capacity (given an admissible heuristic).
+
+    Given the StateStore of a best-first search which ran out of memory, the search continues from its open states
+    (as in A*+IDA*) and skips successors reached at no lower g-cost than stored, instead of restarting.
+
+    A depth-first search re-expands states reached along different paths, so IDA* expands several times as many
+    states as A*, and far more once the table is much smaller than the set of states with f below the optimal cost.
+    """
+
+    def __init__(self, game_env, table_capacity=DEFAULT_TABLE_CAPACITY):
+        """
+        :param game_env: GameEnv instance
+        :param table_capacity: maximum number of transposition table entries
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.table_capacity = table_capacity
+        self.action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+        self.goal_id = game_env.get_solved_state_id()
+
+        self.table = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+        self.iterations = 0
+        self.max_path_length = 0
+        self.plan_cost = None
+
+    def get_stats(self, **extra):
+        """
+        Get statistics for the most recent search.
+        :return: dict with keys nodes_expanded, nodes_generated, nodes_pruned, iterations, max_path_length,
+            table_size, table_evictions and plan_cost
+        """
+        stats = {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "nodes_pruned": self.nodes_pruned,
+            "iterations": self.iterations,
+            "max_path_length": self.max_path_length,
+            "table_size": len(self.table) if self.table is not None else 0,
+            "table_evictions": self.table.evictions if self.table is not None else 0,
+            "plan_cost": self.plan_cost,
+        }
+        stats.update(extra)
+        return stats
+
+    def search(self, heuristic=None, init_state=None, move_pruning=None, explored=None):
+        """
+        Find an optimal path to the solved state.
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in COST_SCALE units, or to None if the solved state is unreachable from it (None for h = 0)
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :param move_pruning: optional MovePruning, used to skip successors which are redundant given the action
+            which led to the state being expanded (see move_pruning.py)
+        :param explored: optional StateStore left by a SearchEngine.search (with weight 1) which exceeded its memory
+            budget; the search then continues from its open states instead of the initial state (see class
+            docstring), and init_state is ignored
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        self.table = TranspositionTable(self.table_capacity)
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+        self.iterations = 0
+        self.max_path_length = 0
+        self.plan_cost = None
+
+        if explored is None:
+            game_env = self.game_env
+            if init_state is None:
+                init_state = game_env.get_init_state()
+            roots = [(0, game_env.encode_state(init_state))]
+        else:
+            roots = [(int(explored.get_g(state_id)), state_id) for state_id in explored.get_open_ids()]
+        # Search the roots in order of f, so a plan is found early and bounds the rest of the iteration
+        root_f = {}
+        for g, state_id in roots:
+            h = self._get_h(state_id, heuristic)
+            if h is not None and h != float('inf'):
+                root_f[state_id] = g + h
+        roots = sorted((root for root in roots if root[1] in root_f), key=lambda root: root_f[root[1]])
+        if not roots:
+            return None
+
+        threshold = root_f[roots[0][1]]
+        # Number of cut off states admitted per node the next iteration should expand (see _next_threshold)
+        cutoffs_per_node = THRESHOLD_GROWTH - 1
+        last_expanded = None
+        while True:
+            self.iterations += 1
+            nodes_expanded = self.nodes_expanded
+            path, cutoffs = self._bounded_search(roots, heuristic, threshold, move_pruning, explored)
+            if path is not None:
+                return path
+            if not cutoffs:
+                return None
+            nodes_expanded = self.nodes_expanded - nodes_expanded
+            if last_expanded is not None and nodes_expanded < THRESHOLD_GROWTH * last_expanded:
+                cutoffs_per_node *= 2
+            last_expanded = nodes_expanded
+            threshold = self._next_threshold(cutoffs, cutoffs_per_node * nodes_expanded)
+
+    @staticmethod
+    def _next_threshold(cutoffs, target):
+        """
+        Choose the threshold for the next iteration: the smallest f at which the number of states cut off with f at
+        or below it reaches the target. The same state is often cut off along several paths, so the number of nodes
+        gained per cut off state is unknown; the search doubles the target per node expanded whenever an iteration
+        grew by less than THRESHOLD_GROWTH.
+        :param cutoffs: dict mapping f to the number of states cut off with that f in the last iteration
+        :param target: number of cut off states to admit
+        :return: next threshold, in COST_SCALE units
+        """
+        target = max(1, target)
+        count = 0
+        for f in sorted(cutoffs):
+            count += cutoffs[f]
+            if count >= target:
+                return f
+        return f
+
+    def _get_h(self, state_id, heuristic):
+        """
+        Get the best known heuristic value of a state (learned, or from the heuristic function).
+        :return: scaled heuristic value, inf if the state is known to be a dead end, or None if the heuristic
+            finds the solved state unreachable
+        """
+        entry = self.table.get(state_id)
+        if entry is not None:
+            return entry[0]
+        if heuristic is None:
+            return 0
+        return heuristic(state_id)
+
+    def _bounded_search(self, roots, heuristic, threshold, move_pruning=None, explored=None):
+        """
+        Depth-first search from each root in turn, cutting off states with f above the threshold. Once the solved
+        state is reached, the threshold is lowered below the plan's cost, so the rest of the search only looks for a
+        cheaper plan. The search is iterative, with an explicit stack of frames, so long plans do not hit the
+        recursion limit.
+        :param roots: list of (g, state ID) pairs to search from
+        :param explored: StateStore whose open states are the roots, or None
+        :return: (path, None) with the cheapest plan within the threshold if the solved state was reached, otherwise
+            (None, dict mapping f to the number of states cut off with that f)
+        """
+        table = self.table
+        iteration = self.iterations
+        action_costs = self.action_costs
+        get_successor_ids = self.game_env.get_successor_ids
+        action_list = self.game_env.ACTION_LIST
+        goal_id = self.goal_id
+        n_cells = self.game_env.n_rows * self.game_env.n_cols
+        cutoffs = {}
+        best_path = None
+
+        for root_g, root_id in roots:
+            root_h = self._get_h(root_id, heuristic)
+            if root_h is None or root_h == float('inf'):
+                continue
+            if root_g + root_h > threshold:
+                if best_path is None:
+                    cutoffs[root_g + root_h] = cutoffs.get(root_g + root_h, 0) + 1
+                continue
+            entry = table.get(root_id)
+            if entry is not None and entry[1] == iteration and entry[2] <= root_g:
+                # Already searched from an earlier root in this iteration at no higher cost
+                continue
+
+            # Frame: [state ID, g, children, next child position, smallest f bound found below, action index]
+            on_path = {root_id}
+            stack = [[root_id, root_g, None, 0, float('inf'), -1]]
+            table.put(root_id, root_h, iteration, root_g)
+            while stack:
+                frame = stack[-1]
+                state_id, g, children = frame[0], frame[1], frame[2]
+                if state_id == goal_id and children is None:
+                    # Keep the plan, and search on only for cheaper ones (all action costs are positive integers)
+                    self.plan_cost = unscale_cost(g)
+                    best_path = explored.extract_path(root_id) if explored is not None else []
+                    best_path += [action_list[f[5]] for f in stack[1:]]
+                    threshold = g - 1
+                    frame[2] = children = []
+                    frame[4] = g
+
+                if children is None:
+                    # First visit to this frame: generate children, ordered by f so the solution is found early
+                    self.nodes_expanded += 1
+                    children = []
+                    rules = None
+                    if move_pruning is not None:
+                        rules = move_pruning.get_rules(state_id % n_cells, frame[5])
+                    for action_index, next_id in get_successor_ids(state_id):
+                        next_h = self._get_h(next_id, heuristic)
+                        if next_h is None or next_h == float('inf'):
+                            continue
+                        next_g = g + action_costs[action_index]
+                        if rules is not None and move_pruning.is_pruned(rules, action_index, next_id,
+                                                                        state_id // n_cells):
+                            # A cheaper path reaches this child without passing through this state, but it still
+                            # bounds the learned h of this state (which may be reached along other paths)
+                            self.nodes_pruned += 1
+                            frame[4] = min(frame[4], next_g + next_h)
+                            continue
+                        if explored is not None and next_g >= explored.get_g(next_id):
+                            # Reached at no lower cost by the explored part of the graph, so the child is a root
+                            # or was expanded there; it still bounds the learned h of this state
+                            frame[4] = min(frame[4], next_g + next_h)
+                            continue
+                        children.append((next_g + next_h, action_index, next_id, next_g))
+                    self.nodes_generated += len(children)
+                    children.sort()
+                    frame[2] = children
+
+                if frame[3] < len(children):
+                    child_f, action_index, next_id, next_g = children[frame[3]]
+                    frame[3] += 1
+                    # Use the latest learned value (it may have been raised since the children were generated)
+                    next_h = self._get_h(next_id, heuristic)
+                    if next_h is None or next_h == float('inf'):
+                        continue
+                    child_f = next_g + next_h
+                    if child_f > threshold:
+                        if best_path is None:
+                            cutoffs[child_f] = cutoffs.get(child_f, 0) + 1
+                        frame[4] = min(frame[4], child_f)
+                        continue
+                    if next_id in on_path:
+                        # Cycle - only a bound is recorded
+                        frame[4] = min(frame[4], child_f)
+                        continue
+                    entry = table.get(next_id)
+                    if entry is not None and entry[1] == iteration and entry[2] <= next_g:
+                        # Already searched in this iteration at no higher cost
+                        frame[4] = min(frame[4], child_f)
+                        continue
+                    table.put(next_id, next_h, iteration, next_g)
+                    on_path.add(next_id)
+                    stack.append([next_id, next_g, None, 0, float('inf'), action_index])
+                    self.max_path_length = max(self.max_path_length, len(stack) - 1)
+                    continue
+
+                # All children searched: learn h, and pass the bound to the parent
+                stack.pop()
+                on_path.discard(state_id)
+                bound = frame[4]
+                entry = table.get(state_id)
+                old_h = entry[0] if entry is not None else self._get_h(state_id, heuristic)
+                learned_h = max(old_h, bound - g)
+                table.put(state_id, learned_h, iteration, g if entry is None else entry[2])
+                if stack:
+                    stack[-1][4] = min(stack[-1][4], g + learned_h)
+        return best_path, cutoffs
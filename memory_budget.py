@@ -0,0 +1,136 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+"""
+memory_budget.py
+
+This file contains MemoryBudget, which lets a search track its peak memory use (open list size, stored states and
+process resident set size) and stop cleanly once a configured limit is crossed, by raising MemoryBudgetExceeded
+with the partial statistics of the search. A budget may instead ask the solver to fall back to a memory-bounded
+search.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Number of node expansions between RSS checks (the state limit is checked on every insertion)
+DEFAULT_CHECK_INTERVAL = 4096
+
+# What a solver does when a search exceeds its budget: stop with MemoryBudgetExceeded, or switch to a memory-bounded
+# search (see memory_bounded_search.py)
+ABORT = "abort"
+FALLBACK = "fallback"
+
+
+def get_rss():
+    """
+    Get the current resident set size of this process.
+    :return: RSS in bytes, or None if it cannot be measured on this platform
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return get_peak_rss()
+
+
+def get_peak_rss():
+    """
+    Get the peak resident set size of this process so far.
+    :return: peak RSS in bytes, or None if it cannot be measured on this platform
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and in KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryBudgetExceeded(Exception):
+    """
+    Raised by a search when its MemoryBudget is exceeded. stats holds the partial statistics of the search at that
+    point (see SearchEngine.search).
+    """
+
+    def __init__(self, reason, stats):
+        super().__init__(reason)
+        self.reason = reason
+        self.stats = stats
+
+
+class MemoryBudget:
+    """
+    Memory limits for a search. Either limit may be None (no limit). The state limit is checked by the search each
+    time it stores a state, which costs one comparison. Reading the RSS costs a system call, so it is only sampled
+    every check_interval node expansions.
+
+    The peak sizes seen at each check (and at the end of the search) are recorded, so a budget can also be used with
+    no limits just to measure a search.
+    """
+
+    def __init__(self, max_rss=None, max_states=None, check_interval=DEFAULT_CHECK_INTERVAL, on_exceeded=ABORT):
+        """
+        :param max_rss: limit on the process resident set size, in bytes
+        :param max_states: limit on the number of states held by the search (open list entries plus stored states)
+        :param check_interval: number of node expansions between RSS checks
+        :param on_exceeded: ABORT or FALLBACK (used by Solver)
+        """
+        assert on_exceeded in (ABORT, FALLBACK), "/!\\ ERROR: Invalid on_exceeded given to MemoryBudget"
+        self.max_rss = max_rss
+        self.max_states = max_states
+        self.check_interval = check_interval
+        self.on_exceeded = on_exceeded
+        self.peak_rss = None
+        self.peak_frontier_size = 0
+        self.peak_stored_states = 0
+
+    def start(self):
+        """
+        Reset the recorded peaks at the start of a search.
+        """
+        self.peak_rss = get_rss()
+        self.peak_frontier_size = 0
+        self.peak_stored_states = 0
+
+    def record(self, frontier_size, stored_states):
+        """
+        Record the current memory use of a search.
+        :param frontier_size: number of open list entries
+        :param stored_states: number of states with stored search data (e.g. len(StateStore))
+        :return: current RSS in bytes, or None if unavailable
+        """
+        self.peak_frontier_size = max(self.peak_frontier_size, frontier_size)
+        self.peak_stored_states = max(self.peak_stored_states, stored_states)
+        rss = get_rss()
+        if rss is not None:
+            self.peak_rss = rss if self.peak_rss is None else max(self.peak_rss, rss)
+        return rss
+
+    def check(self, frontier_size, stored_states):
+        """
+        Record the current memory use of a search, and check it against the limits.
+        :param frontier_size: number of open list entries
+        :param stored_states: number of states with stored search data (e.g. len(StateStore))
+        :return: description of the exceeded limit, or None if within budget
+        """
+        rss = self.record(frontier_size, stored_states)
+        if self.max_states is not None and frontier_size + stored_states > self.max_states:
+            return f"State limit exceeded ({frontier_size + stored_states} > {self.max_states} states)"
+        if self.max_rss is not None and rss is not None and rss > self.max_rss:
+            return f"Memory limit exceeded (RSS {rss / 2 ** 20:.1f} MiB > {self.max_rss / 2 ** 20:.1f} MiB)"
+        return None
+
+    def get_stats(self):
+        """
+        :return: dict of recorded peaks (peak_rss in bytes, or None if unavailable)
+        """
+        return {
+            "peak_rss": self.peak_rss,
+            "peak_frontier_size": self.peak_frontier_size,
+            "peak_stored_states": self.peak_stored_states,
+        }
@@ -0,0 +1,130 @@
+from transition_model import get_transition_model
+
+"""
+move_pruning.py
+
+This file contains move pruning rules for search over GameEnv levels, derived from the compiled move rules (see
+GameEnv.compile_transitions). Given the action which led to a state, some actions from that state can never be part of
+an optimal plan (e.g. a second walk in the same direction, where a cheaper sprint covers both cells), so they can be
+skipped. Searches with a closed list already discard such successors by their g-cost, so the rules are only used by
+IDA* (see memory_bounded_search.py). Since IDA* raises its threshold past the optimal cost and re-reaches states along
+more expensive paths, the rules cut both successors generated and states expanded there (measured by
+benchmarks/search_benchmarks.py).
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+class MovePruning:
+    """
+    Pruning rules keyed by (cell, index of the action which led to it). Each rule prunes an action a2 from the cell
+    if it leads to a given target cell and a list of alternative steps from the previous cell p is valid under the
+    current trap status. There are two kinds of rule:
+    - Reversal: a2 returns to p (or repeats a lever activation), so the state repeats; always pruned
+    - Dominance: a single action from p reaches the same cell for less than a1 followed by a2 (e.g. a sprint in place
+      of two walks)
+    Both replace the pruned pair with a strictly cheaper path from p, so no optimal plan is lost, even when states
+    are also pruned as duplicates. Pairs which only reorder moves at equal cost are not pruned, since pruning them
+    is unsafe in combination with duplicate detection (the reordered path may itself be cut off as a duplicate).
+    """
+
+    def __init__(self, game_env):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        n_cols = game_env.n_cols
+        self.n_cells = game_env.n_rows * n_cols
+        costs = [game_env.ACTION_COST[a] for a in game_env.ACTION_LIST]
+        activate_index = game_env.ACTION_LIST.index(game_env.ACTIVATE)
+
+        # outcomes[cell][action index] = (dependency bitmask, {trap key: (next cell, toggle) or None}), for compiled
+        # actions only; next_cells[cell][action index] = set of cells the action can lead to
+        self._outcomes = []
+        next_cells = []
+        for cell in range(self.n_cells):
+            cell_outcomes = {}
+            cell_next = {}
+            for action_index, dep_mask, outcomes in game_env.get_cell_transitions(cell):
+                if outcomes is None:
+                    continue
+                cell_outcomes[action_index] = (dep_mask, outcomes)
+                cell_next[action_index] = {o[0] for o in outcomes.values() if o is not None and o[1] == 0}
+            self._outcomes.append(cell_outcomes)
+            next_cells.append(cell_next)
+
+        # rules[(cell, a1)] = {a2: ((target cell, steps), ...)}, where steps is a tuple of (cell, action index,
+        # next cell) which must all succeed (an empty tuple always prunes)
+        self._rules = {}
+        for prev_cell in range(self.n_cells):
+            for a1 in self._outcomes[prev_cell]:
+                if a1 == activate_index:
+                    # Activating twice restores the previous state
+                    self._add_rule(prev_cell, a1, a1, prev_cell, ())
+                    continue
+                for cell in next_cells[prev_cell][a1]:
+                    for a2, targets in next_cells[cell].items():
+                        if a2 == activate_index:
+                            continue
+                        for target in targets:
+                            steps = self._find_alternative(prev_cell, a1, a2, target, costs, next_cells)
+                            if steps is not None:
+                                self._add_rule(cell, a1, a2, target, steps)
+        self._rules = {key: {a2: tuple(rules) for a2, rules in by_action.items()}
+                       for key, by_action in self._rules.items()}
+
+    def _add_rule(self, cell, a1, a2, target, steps):
+        self._rules.setdefault((cell, a1), {}).setdefault(a2, []).append((target, steps))
+
+    @staticmethod
+    def _find_alternative(prev_cell, a1, a2, target, costs, next_cells):
+        """
+        Find alternative steps from prev_cell to target, making a1 followed by a2 redundant.
+        :return: tuple of (cell, action index, next cell) steps, or None if there is no alternative
+        """
+        if target == prev_cell:
+            return ()
+        for a3, targets in next_cells[prev_cell].items():
+            if target in targets and costs[a3] < costs[a1] + costs[a2]:
+                return ((prev_cell, a3, target),)
+        return None
+
+    def get_rules(self, cell, action_index):
+        """
+        Get the pruning rules for a cell entered by the given action.
+        :param cell: cell index (row * n_cols + col)
+        :param action_index: index into GameEnv.ACTION_LIST of the action which led to the cell
+        :return: dict mapping action index to a tuple of (target cell, steps) rules, or None if there are none
+        """
+        return self._rules.get((cell, action_index))
+
+    def is_pruned(self, rules, action_index, next_id, trap_bits):
+        """
+        Check whether a successor is pruned.
+        :param rules: rules for the current cell and the action which led to it (see get_rules)
+        :param action_index: index into GameEnv.ACTION_LIST of the action leading to the successor
+        :param next_id: successor state ID
+        :param trap_bits: trap bits of the current state
+        :return: True if the successor can be skipped
+        """
+        action_rules = rules.get(action_index)
+        if action_rules is None:
+            return False
+        next_cell = next_id % self.n_cells
+        outcomes = self._outcomes
+        for target, steps in action_rules:
+            if target != next_cell:
+                continue
+            for cell, step_action, step_next in steps:
+                dep_mask, step_outcomes = outcomes[cell][step_action]
+                outcome = step_outcomes[trap_bits & dep_mask]
+                if outcome is None or outcome[0] != step_next or outcome[1] != 0:
+                    break
+            else:
+                return True
+        return False
+
+    def count_rules(self):
+        """
+        Count the pruning rules.
+        :return: number of (cell, a1, a2, target) rules
+        """
+        return sum(len(rules) for by_action in self._rules.values() for rules in by_action.values())
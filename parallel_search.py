@@ -0,0 +1,284 @@
+import multiprocessing
+import queue
+import time
+
+from search_engine import BucketQueue, scale_cost, unscale_cost
+from transition_model import get_transition_model
+
+"""
+parallel_search.py
+
+This file contains a hash-distributed parallel A* (HDA*) search. Each state is owned by one worker process, chosen
+by hashing its state ID. Workers expand the states they own, and send generated states owned by other workers to
+them in batches, through multiprocessing queues. The parent process detects termination, then rebuilds the plan by
+asking the owner of each state on the solution path for its parent.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Number of generated states sent to another worker per message (a partial batch is sent whenever a worker runs
+# out of work, or after EXPANSIONS_PER_POLL expansions)
+DEFAULT_BATCH_SIZE = 256
+
+# Number of expansions between checks of a worker's inbox
+EXPANSIONS_PER_POLL = 64
+
+# Seconds between termination checks (and inbox polls while idle)
+POLL_INTERVAL = 0.002
+
+# Message kinds
+_STATES = 0
+_PARENT = 1
+_STATS = 2
+_STOP = 3
+
+
+def get_owner(state_id, n_workers):
+    """
+    Get the index of the worker which owns a state. State IDs of neighbouring states are close together, so they are
+    scrambled (Fibonacci hashing) to spread each region of the state space across every worker.
+    :param state_id: state ID
+    :param n_workers: number of workers
+    :return: worker index
+    """
+    return ((state_id * 11400714819323198485) & 0xFFFFFFFFFFFFFFFF) % n_workers
+
+
+def _hda_worker(index, n_workers, game_env, heuristic, goal_id, batch_size, inboxes, results, sent, received,
+                idle, incumbent):
+    inbox = inboxes[index]
+    action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+    get_successor_ids = game_env.get_successor_ids
+
+    open_list = BucketQueue()
+    g_values = {}
+    # state ID -> (parent state ID, action index)
+    parents = {}
+    outgoing = [[] for _ in range(n_workers)]
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    def relax(state_id, g, h, parent_id, action_index):
+        if g >= g_values.get(state_id, float('inf')):
+            return
+        g_values[state_id] = g
+        parents[state_id] = (parent_id, action_index)
+        if state_id == goal_id:
+            with incumbent.get_lock():
+                if g < incumbent.value:
+                    incumbent.value = g
+        else:
+            open_list.push(g + h, (state_id, g))
+
+    def flush():
+        flushed = False
+        for owner, batch in enumerate(outgoing):
+            if batch:
+                # Count before sending, so the message is always seen as in flight until it is processed
+                sent[index] += 1
+                inboxes[owner].put((_STATES, batch))
+                outgoing[owner] = []
+                flushed = True
+        return flushed
+
+    while True:
+        has_work = len(open_list) > 0 and open_list.peek_key() < incumbent.value
+        try:
+            message = inbox.get_nowait() if has_work else inbox.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            message = None
+
+        if message is not None:
+            kind = message[0]
+            if kind == _STATES:
+                idle[index] = 0
+                for state_id, g, h, parent_id, action_index in message[1]:
+                    relax(state_id, g, h, parent_id, action_index)
+                received[index] += 1
+            elif kind == _PARENT:
+                results.put(parents.get(message[1]))
+            elif kind == _STATS:
+                results.put((nodes_expanded, nodes_generated))
+            else:
+                return
+            continue
+
+        if not has_work:
+            if not flush():
+                idle[index] = 1
+            continue
+
+        for _ in range(EXPANSIONS_PER_POLL):
+            if len(open_list) == 0:
+                break
+            f, (state_id, g) = open_list.pop()
+            if g > g_values[state_id]:
+                # Stale entry
+                continue
+            bound = incumbent.value
+            if f >= bound:
+                # No better plan through this state (keep it, in case the bound is not met)
+                open_list.push(f, (state_id, g))
+                break
+            nodes_expanded += 1
+            for action_index, next_id in get_successor_ids(state_id):
+                next_g = g + action_costs[action_index]
+                if heuristic is None:
+                    next_h = 0
+                else:
+                    next_h = heuristic(next_id)
+                    if next_h is None:
+                        continue
+                if next_g + next_h >= bound:
+                    continue
+                nodes_generated += 1
+                owner = get_owner(next_id, n_workers)
+                if owner == index:
+                    relax(next_id, next_g, next_h, state_id, action_index)
+                else:
+                    batch = outgoing[owner]
+                    batch.append((next_id, next_g, next_h, state_id, action_index))
+                    if len(batch) >= batch_size:
+                        sent[index] += 1
+                        inboxes[owner].put((_STATES, batch))
+                        outgoing[owner] = []
+        flush()
+
+
+class ParallelAStarSearch:
+    """
+    HDA* over dense state IDs (see GameEnv.encode_state), using n_workers worker processes.
+
+    Each worker runs A* over the states it owns, with its own open list, g-costs and parent pointers, pruning states
+    whose f is no lower than the cost of the best plan found so far (shared between workers). The search ends when
+    every worker is idle (no open state below that cost, and nothing left to send) and every message sent has been
+    processed, which is detected by the parent with the four-counter method: two consecutive checks must both find
+    every worker idle, and the same, equal totals of messages sent and processed. With an admissible and consistent
+    heuristic (or none, for UCS), the plan found is then optimal.
+    """
+
+    def __init__(self, game_env, n_workers=None, batch_size=DEFAULT_BATCH_SIZE, context=None):
+        """
+        :param game_env: GameEnv instance
+        :param n_workers: number of worker processes (defaults to the number of CPUs)
+        :param batch_size: number of states per message between workers
+        :param context: multiprocessing context (defaults to the platform default)
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.context = context or multiprocessing.get_context()
+        self.goal_id = game_env.get_solved_state_id()
+
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.plan_cost = None
+
+    def search(self, heuristic=None, init_state=None):
+        """
+        Find an optimal path to the solved state.
+        :param heuristic: function mapping a state ID to an admissible and consistent estimate of the remaining cost,
+            as an integer in COST_SCALE units, or to None if the solved state is unreachable from it (None for UCS).
+            It is called in the worker processes, so it must be picklable if the context starts processes by spawning
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        game_env = self.game_env
+        if init_state is None:
+            init_state = game_env.get_init_state()
+        init_id = game_env.encode_state(init_state)
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.plan_cost = None
+        n_workers = self.n_workers
+
+        init_h = heuristic(init_id) if heuristic is not None else 0
+        if init_h is None:
+            return None
+        if init_id == self.goal_id:
+            self.plan_cost = 0.0
+            return []
+
+        ctx = self.context
+        inboxes = [ctx.Queue() for _ in range(n_workers)]
+        results = ctx.Queue()
+        # One message counter per sender (the last one for the parent) and per receiver, each with a single writer
+        sent = ctx.Array('q', n_workers + 1, lock=False)
+        received = ctx.Array('q', n_workers, lock=False)
+        idle = ctx.Array('b', n_workers, lock=False)
+        incumbent = ctx.Value('d', float('inf'))
+
+        workers = [
+            ctx.Process(
+                target=_hda_worker,
+                args=(i, n_workers, game_env, heuristic, self.goal_id, self.batch_size, inboxes, results, sent,
+                      received, idle, incumbent),
+                daemon=True,
+            )
+            for i in range(n_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            sent[n_workers] += 1
+            inboxes[get_owner(init_id, n_workers)].put((_STATES, [(init_id, 0, init_h, -1, -1)]))
+            self._wait_for_termination(workers, sent, received, idle)
+
+            for inbox in inboxes:
+                inbox.put((_STATS,))
+            for _ in range(n_workers):
+                nodes_expanded, nodes_generated = results.get()
+                self.nodes_expanded += nodes_expanded
+                self.nodes_generated += nodes_generated
+
+            if incumbent.value == float('inf'):
+                return None
+            self.plan_cost = unscale_cost(int(incumbent.value))
+            return self._extract_path(init_id, inboxes, results)
+        finally:
+            for inbox in inboxes:
+                inbox.put((_STOP,))
+            for worker in workers:
+                worker.join(timeout=1.0)
+                if worker.is_alive():
+                    worker.terminate()
+
+    @staticmethod
+    def _wait_for_termination(workers, sent, received, idle):
+        previous = None
+        while True:
+            time.sleep(POLL_INTERVAL)
+            for worker in workers:
+                assert worker.exitcode is None, "/!\\ ERROR: HDA* worker process exited unexpectedly"
+            all_idle = all(idle)
+            counts = (sum(received), sum(sent))
+            if all_idle and counts[0] == counts[1]:
+                if counts == previous:
+                    return
+                previous = counts
+            else:
+                previous = None
+
+    def _extract_path(self, init_id, inboxes, results):
+        path = []
+        state_id = self.goal_id
+        while state_id != init_id:
+            inboxes[get_owner(state_id, self.n_workers)].put((_PARENT, state_id))
+            state_id, action_index = results.get()
+            path.append(self.game_env.ACTION_LIST[action_index])
+        path.reverse()
+        return path
+
+    def get_stats(self):
+        """
+        Get statistics of the most recent search, summed over the workers.
+        :return: dict of statistic name to value
+        """
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "plan_cost": self.plan_cost,
+            "n_workers": self.n_workers,
+        }
@@ -0,0 +1,275 @@
+import hashlib
+import heapq
+import os
+from array import array
+
+from heuristics import UNREACHABLE
+from search_engine import scale_cost, unscale_cost
+from transition_model import get_transition_model
+
+"""
+pattern_database.py
+
+This file contains a pattern database (PDB) heuristic for levels with many lever/trap pairs. Each pattern database
+projects a state onto (player position, status of a chosen subset of traps), and stores the exact cost of solving
+that abstraction from every abstract state. Several disjoint pattern databases are combined by taking the maximum.
+
+Pattern databases are cached on disk, keyed by a hash of the level layout and the pattern, so they are only built once
+per level. The default cache directory is in the user's cache directory ($XDG_CACHE_HOME, or ~/.cache), so it does
+not depend on the working directory and nothing is written into the source tree; pass cache_dir to use another
+directory. If it cannot be written, databases are built in memory on every run instead.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+def get_default_cache_dir():
+    """
+    Get the default pattern database cache directory, under the user's cache directory.
+    :return: absolute path
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(os.path.abspath(cache_home), "cheese_hunter", "pdb")
+
+
+DEFAULT_CACHE_DIR = get_default_cache_dir()
+DEFAULT_PATTERN_SIZE = 6
+
+# Increment when the stored format or abstraction changes, to invalidate old cache files
+CACHE_VERSION = 3
+
+
+class PatternDatabase:
+    """
+    Pattern database for a single pattern (tuple of trap indices).
+
+    Abstract states are (cell, pattern bits), where pattern bit j holds the status of trap pattern[j]. An abstract
+    move is allowed if it succeeds for some status of the traps outside the pattern, and activating a lever whose
+    trap is outside the pattern leaves the abstract state unchanged. Every concrete plan therefore maps to an abstract
+    plan of no greater cost, so the stored costs are admissible (and consistent) estimates.
+
+    Costs are found by a backwards Dijkstra search from the abstract goal (goal cell, all pattern traps activated) and
+    stored in a flat array indexed by pattern_bits * n_cells + cell, in fixed-point cost units.
+    """
+
+    def __init__(self, game_env, pattern, values=None):
+        """
+        :param game_env: GameEnv instance
+        :param pattern: tuple of trap indices
+        :param values: precomputed cost array (e.g. loaded from disk), or None to build it
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.pattern = tuple(pattern)
+        self.n_cells = game_env.n_rows * game_env.n_cols
+        self.pattern_mask = 0
+        for i in self.pattern:
+            self.pattern_mask |= 1 << i
+        self.values = values if values is not None else self._build()
+
+    def _project(self, trap_bits):
+        """
+        Project a trap bitmask onto the pattern.
+        :param trap_bits: trap bitmask
+        :return: pattern bits
+        """
+        pattern_bits = 0
+        for j, i in enumerate(self.pattern):
+            if (trap_bits >> i) & 1:
+                pattern_bits |= 1 << j
+        return pattern_bits
+
+    def _build(self):
+        game_env = self.game_env
+        n_cells = self.n_cells
+        n_patterns = 1 << len(self.pattern)
+        pattern_mask = self.pattern_mask
+        action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+
+        # Trap bitmask with exactly the pattern traps of each pattern configuration set
+        expanded = []
+        for pattern_bits in range(n_patterns):
+            trap_bits = 0
+            for j, i in enumerate(self.pattern):
+                if (pattern_bits >> j) & 1:
+                    trap_bits |= 1 << i
+            expanded.append(trap_bits)
+        # Pattern bit flipped by toggling each trap (0 for traps outside the pattern)
+        pattern_toggle = {}
+        for j, i in enumerate(self.pattern):
+            pattern_toggle[1 << i] = 1 << j
+
+        # Reverse abstract edges: predecessors[abstract id] = [(abstract id, cost), ...]
+        predecessors = [[] for _ in range(n_patterns * n_cells)]
+        for cell in range(n_cells):
+            relaxed_moves = None
+            for action_index, dep_mask, outcomes in game_env.get_cell_transitions(cell):
+                cost = action_costs[action_index]
+                if outcomes is None:
+                    # Uncompiled: assume any relaxed move or lever toggle is possible
+                    if relaxed_moves is None:
+                        relaxed_moves = {}
+                        for move_index, next_cell in game_env.get_relaxed_successors(cell):
+                            relaxed_moves.setdefault(move_index, []).append(next_cell)
+                    results = [(next_cell, 0) for next_cell in relaxed_moves.get(action_index, [])]
+                    if game_env.ACTION_LIST[action_index] == game_env.ACTIVATE:
+                        row, col = divmod(cell, game_env.n_cols)
+                        if (row, col) in game_env.lever_map_positions:
+                            trap_index = game_env.trap_positions.index(game_env.lever_map_positions[(row, col)])
+                            results = [(cell, 1 << trap_index)]
+                    groups = {0: set(results)}
+                    pattern_dep_mask = 0
+                else:
+                    # Group outcomes by the status of the pattern traps they depend on
+                    pattern_dep_mask = dep_mask & pattern_mask
+                    groups = {}
+                    for key, outcome in outcomes.items():
+                        group = groups.setdefault(key & pattern_dep_mask, set())
+                        if outcome is not None:
+                            group.add(outcome)
+
+                for pattern_bits in range(n_patterns):
+                    group = groups.get(expanded[pattern_bits] & pattern_dep_mask)
+                    if not group:
+                        continue
+                    abstract_id = pattern_bits * n_cells + cell
+                    for next_cell, toggle in group:
+                        next_pattern_bits = pattern_bits ^ pattern_toggle.get(toggle, 0)
+                        next_abstract_id = next_pattern_bits * n_cells + next_cell
+                        if next_abstract_id != abstract_id:
+                            predecessors[next_abstract_id].append((abstract_id, cost))
+
+        values = array('l', [UNREACHABLE]) * (n_patterns * n_cells)
+        goal_id = (n_patterns - 1) * n_cells + game_env.goal_row * game_env.n_cols + game_env.goal_col
+        frontier = [(0, goal_id)]
+        while frontier:
+            d, abstract_id = heapq.heappop(frontier)
+            if values[abstract_id] != UNREACHABLE:
+                continue
+            values[abstract_id] = d
+            for prev_id, cost in predecessors[abstract_id]:
+                if values[prev_id] == UNREACHABLE:
+                    heapq.heappush(frontier, (d + cost, prev_id))
+        return values
+
+    def compute_scaled(self, state_id):
+        """
+        Look up the pattern database value of a state.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: heuristic value in fixed-point cost units, or None if the abstract goal is unreachable
+        """
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        value = self.values[self._project(trap_bits) * self.n_cells + cell]
+        if value == UNREACHABLE:
+            return None
+        return value
+
+    @staticmethod
+    def get_cache_key(game_env, pattern):
+        """
+        Get the cache key for a pattern database, from a hash of the level layout (grid, goal, levers and the traps
+        they toggle) and the pattern. The layout is read from the environment rather than the level file, so the
+        key does not depend on the file's comments or targets, and the unmodified GameEnv can be used.
+        :param game_env: GameEnv instance
+        :param pattern: tuple of trap indices
+        :return: hex digest (str)
+        """
+        layout = (
+            game_env.n_rows,
+            game_env.n_cols,
+            tuple("".join(row) for row in game_env.grid_data),
+            (game_env.goal_row, game_env.goal_col),
+            tuple(game_env.lever_positions),
+            tuple(game_env.trap_positions),
+        )
+        digest = hashlib.sha1()
+        digest.update(repr((CACHE_VERSION, layout, tuple(pattern))).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def load_or_build(cls, game_env, pattern, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Load a pattern database from the cache directory, or build it and save it there if not cached.
+        :param game_env: GameEnv instance
+        :param pattern: tuple of trap indices
+        :param cache_dir: cache directory, or None to disable caching
+        :return: PatternDatabase
+        """
+        if cache_dir is None:
+            return cls(game_env, pattern)
+
+        path = os.path.join(cache_dir, cls.get_cache_key(game_env, pattern) + ".pdb")
+        n_values = (game_env.n_rows * game_env.n_cols) << len(pattern)
+        try:
+            # Raw array contents rather than pickle, so a cache file can never run code when loaded
+            with open(path, "rb") as f:
+                values = array('l')
+                values.fromfile(f, n_values)
+                if not f.read(1):
+                    return cls(game_env, pattern, values)
+        except (OSError, EOFError, ValueError):
+            # Missing, unreadable or truncated file
+            pass
+
+        pdb = cls(game_env, pattern)
+        # Write to a temporary file first, so concurrent runs never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pdb.values.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Caching is best-effort only (e.g. read-only or full directory): drop any partial file
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return pdb
+
+
+class PatternDatabaseHeuristic:
+    """
+    Maximum over a set of disjoint pattern databases. By default, trap indices are split into consecutive groups of
+    DEFAULT_PATTERN_SIZE traps.
+    """
+
+    def __init__(self, game_env, patterns=None, pattern_size=DEFAULT_PATTERN_SIZE, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        :param game_env: GameEnv instance
+        :param patterns: list of tuples of trap indices, or None to partition all traps into groups of pattern_size
+        :param pattern_size: number of traps per pattern, if patterns is None
+        :param cache_dir: cache directory for built pattern databases, or None to disable caching
+        """
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        if patterns is None:
+            n_traps = len(game_env.trap_positions)
+            patterns = [tuple(range(i, min(i + pattern_size, n_traps))) for i in range(0, n_traps, pattern_size)]
+        self.databases = [PatternDatabase.load_or_build(game_env, pattern, cache_dir) for pattern in patterns]
+
+    def compute_scaled(self, state_id):
+        """
+        Compute the heuristic value of a state.
+        :param state_id: state ID (see GameEnv.encode_state)
+        :return: heuristic value in fixed-point cost units, or None if the solved state is unreachable
+        """
+        h = 0
+        for database in self.databases:
+            value = database.compute_scaled(state_id)
+            if value is None:
+                return None
+            if value > h:
+                h = value
+        return h
+
+    def compute(self, state):
+        """
+        Compute the heuristic value of a state.
+        :param state: GameState or CompactState
+        :return: heuristic value (float), or inf if the solved state is unreachable
+        """
+        h = self.compute_scaled(self.game_env.encode_state(state))
+        if h is None:
+            return float('inf')
+        return unscale_cost(h)
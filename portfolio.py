@@ -0,0 +1,170 @@
+import multiprocessing
+import queue
+import sys
+import time
+
+from game_env import GameEnv
+from search_engine import SearchEngine
+from solution import Solver
+
+"""
+portfolio.py
+
+This file contains a portfolio solver, which races several search strategies on the same level in separate worker
+processes, returns the first plan found (or the best plan found before a deadline), and stops the remaining
+strategies. No single strategy is fastest on every level, so racing them bounds the worst-case latency.
+
+To race the default strategies on a level, use
+python portfolio.py testcase_file [deadline_seconds]
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Default strategies, as (name, heuristic weight, greedy) triples (see SearchEngine.search). A weight of 0 means no
+# heuristic (UCS); weights of at most 1 give optimal plans.
+DEFAULT_STRATEGIES = (
+    ('ucs', 0, False),
+    ('a_star', 1, False),
+    ('weighted_a_star_1.5', 1.5, False),
+    ('weighted_a_star_3', 3, False),
+    ('greedy', 1, True),
+)
+
+# Seconds between checks for results and crashed workers
+POLL_INTERVAL = 0.05
+
+
+def _portfolio_worker(game_env, heuristic, name, weight, greedy, results):
+    t0 = time.perf_counter()
+    try:
+        engine = SearchEngine(game_env)
+        path = engine.search(heuristic=heuristic if weight > 0 else None, weight=weight, greedy=greedy)
+    except Exception as e:
+        results.put((name, None, {"status": f"error: {e!r}", "time": time.perf_counter() - t0}))
+        return
+    stats = engine.get_stats()
+    stats["status"] = "solved" if path is not None else "unsolvable"
+    stats["time"] = time.perf_counter() - t0
+    results.put((name, path, stats))
+
+
+class PortfolioSolver:
+    """
+    Races a set of strategies, each run by SearchEngine in its own process.
+
+    The heuristic (Solver.heuristic) is built once in the parent process, before the workers are started. Plans are
+    received as the workers finish; the search stops at the first plan if there is no deadline, and otherwise keeps
+    the cheapest plan received until the deadline passes, a strategy with an optimality guarantee finishes, or every
+    strategy has finished. Workers still running are then terminated.
+    """
+
+    def __init__(self, game_env, strategies=DEFAULT_STRATEGIES, context=None):
+        """
+        :param game_env: GameEnv instance
+        :param strategies: sequence of (name, heuristic weight, greedy) triples (see DEFAULT_STRATEGIES)
+        :param context: multiprocessing context (defaults to the platform default)
+        """
+        self.game_env = game_env
+        self.strategies = tuple(strategies)
+        self.context = context or multiprocessing.get_context()
+
+        # Results of the most recent solve: strategy name -> stats dict (with status "solved", "unsolvable",
+        # "stopped" or "error: ..."), and the name of the strategy which found the returned plan
+        self.results = {}
+        self.best_strategy = None
+        self.plan_cost = None
+
+    def solve(self, deadline=None, on_plan=None):
+        """
+        Race the strategies.
+        :param deadline: seconds after starting to keep waiting for cheaper plans once a plan has been found (None to
+            return the first plan). If no plan has been found by the deadline, the first plan found is returned
+        :param on_plan: optional function called as on_plan(strategy name, path, plan cost) for each plan which is
+            cheaper than those received before it
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if no strategy
+            found a plan
+        """
+        t0 = time.perf_counter()
+        self.results = {}
+        self.best_strategy = None
+        self.plan_cost = None
+
+        heuristic = None
+        if any(weight > 0 for _, weight, _ in self.strategies):
+            solver = Solver(self.game_env)
+            solver.preprocess_heuristic()
+            heuristic = solver.heuristic.compute_scaled
+
+        ctx = self.context
+        results = ctx.Queue()
+        workers = {}
+        for name, weight, greedy in self.strategies:
+            workers[name] = ctx.Process(
+                target=_portfolio_worker, args=(self.game_env, heuristic, name, weight, greedy, results), daemon=True
+            )
+            workers[name].start()
+        optimal = {name for name, weight, greedy in self.strategies if weight <= 1 and not greedy}
+
+        best_path = None
+        try:
+            while len(self.results) < len(workers):
+                if best_path is not None:
+                    if deadline is None or self.best_strategy in optimal:
+                        break
+                    remaining = t0 + deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    timeout = min(remaining, POLL_INTERVAL)
+                else:
+                    timeout = POLL_INTERVAL
+                try:
+                    name, path, stats = results.get(timeout=timeout)
+                except queue.Empty:
+                    for name, worker in workers.items():
+                        if name not in self.results and worker.exitcode not in (None, 0):
+                            self.results[name] = {"status": f"error: exit code {worker.exitcode}"}
+                    continue
+                self.results[name] = stats
+                if path is not None and (self.plan_cost is None or stats["plan_cost"] < self.plan_cost):
+                    best_path = path
+                    self.best_strategy = name
+                    self.plan_cost = stats["plan_cost"]
+                    if on_plan is not None:
+                        on_plan(name, path, self.plan_cost)
+        finally:
+            for name, worker in workers.items():
+                if worker.is_alive():
+                    worker.terminate()
+                    self.results.setdefault(name, {"status": "stopped"})
+                worker.join()
+        return best_path
+
+
+def main(arglist):
+    if len(arglist) < 1:
+        print("Usage: python portfolio.py testcase_file [deadline_seconds]")
+        return
+    deadline = float(arglist[1]) if len(arglist) > 1 else None
+
+    portfolio = PortfolioSolver(GameEnv(arglist[0]))
+    t0 = time.perf_counter()
+    path = portfolio.solve(
+        deadline=deadline,
+        on_plan=lambda name, _, cost: print(f"{time.perf_counter() - t0:8.3f}s  {name}: plan cost {cost}")
+    )
+    print(f"{'strategy':<22} {'status':<12} {'plan cost':>10} {'nodes':>10} {'time (s)':>10}")
+    for name, _, _ in portfolio.strategies:
+        stats = portfolio.results.get(name, {"status": "stopped"})
+        cost = stats.get("plan_cost")
+        nodes = stats.get("nodes_expanded")
+        run_time = stats.get("time")
+        print(f"{name:<22} {stats['status']:<12} {'-' if cost is None else cost:>10} "
+              f"{'-' if nodes is None else nodes:>10} {'-' if run_time is None else round(run_time, 3):>10}")
+    if path is None:
+        print("/!\\ ERROR: No strategy found a plan")
+    else:
+        print(f"Best plan: cost {portfolio.plan_cost} ({len(path)} actions) from {portfolio.best_strategy}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
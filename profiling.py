@@ -0,0 +1,255 @@
+import cProfile
+import gc
+import linecache
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+"""
+profiling.py
+
+This file contains Profiler, which runs a function (e.g. Solver.search_ucs) under cProfile and/or tracemalloc and
+writes reports to files:
+    <prefix>.pstats      - cProfile statistics (load with pstats or snakeviz)
+    <prefix>.collapsed   - sampled call stacks in collapsed format ("outer;inner;innermost count" per line), which
+                           flamegraph.pl, speedscope and similar tools accept; for runs too short to sample, stacks
+                           are rebuilt from the cProfile call graph instead, weighted in microseconds
+    <prefix>.memory.txt  - memory allocated at the peak of the run, grouped by allocation site (file and line)
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Seconds between stack samples (in practice limited by the interpreter switch interval, 5ms by default)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# A new memory snapshot is taken once traced memory grows by this factor over the previous snapshot
+SNAPSHOT_GROWTH = 1.1
+
+# Below this many stack samples, the collapsed stacks are rebuilt from the cProfile call graph
+MIN_STACK_SAMPLES = 20
+
+# Maximum depth of the call stacks rebuilt from the cProfile call graph
+MAX_PROFILE_STACK_DEPTH = 64
+
+# Number of allocation sites listed in the memory report
+DEFAULT_TOP_SITES = 30
+
+
+def _profiled_call(func, args):
+    # Stack samples are truncated at this frame, so they start at the profiled function
+    return func(*args)
+
+
+class _Sampler(threading.Thread):
+    """
+    Background thread which periodically samples the call stack of the profiled thread, and takes a tracemalloc
+    snapshot whenever traced memory reaches a new high (so the snapshot closest to the peak is kept).
+
+    Memory is also checked from a garbage collector callback, which runs in the profiled thread every few hundred
+    container allocations, so peaks reached between two samples (or in runs shorter than one sample interval) are
+    still caught.
+    """
+
+    def __init__(self, thread_id, interval, sample_stacks, track_memory):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.sample_stacks = sample_stacks
+        self.track_memory = track_memory
+        self.stacks = Counter()
+        self.peak_snapshot = None
+        self.peak_snapshot_size = 0
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self.track_memory:
+            gc.callbacks.append(self._on_gc)
+        super().start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        if self.track_memory:
+            gc.callbacks.remove(self._on_gc)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            if self.sample_stacks:
+                self._sample_stack()
+            if self.track_memory:
+                self.check_memory()
+
+    def _sample_stack(self):
+        frame = sys._current_frames().get(self.thread_id)
+        names = []
+        while frame is not None and frame.f_code is not _profiled_call.__code__:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        if frame is not None and names:
+            # Only count samples taken inside the profiled call
+            self.stacks[";".join(reversed(names))] += 1
+
+    def _on_gc(self, phase, info):
+        if phase == "start" and threading.get_ident() == self.thread_id:
+            self.check_memory()
+
+    def check_memory(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.peak_snapshot_size * SNAPSHOT_GROWTH:
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self.peak_snapshot_size = current
+
+
+class Profiler:
+    """
+    Runs a function under cProfile and stack sampling (if cpu_prefix is given) and/or tracemalloc (if memory_prefix
+    is given), writing the reports described above. If fewer than MIN_STACK_SAMPLES stacks were sampled, the
+    collapsed stacks are rebuilt from the cProfile call graph (see _profile_stacks).
+
+    The memory report is built from the snapshot taken when traced memory was last found to be at a new high, so it
+    reflects the allocations alive near the peak rather than at the end of the run (when the search's data
+    structures may already have been freed).
+    """
+
+    def __init__(self, cpu_prefix=None, memory_prefix=None, sample_interval=DEFAULT_SAMPLE_INTERVAL,
+                 top_sites=DEFAULT_TOP_SITES):
+        """
+        :param cpu_prefix: output path prefix for the .pstats and .collapsed files (None to disable CPU profiling)
+        :param memory_prefix: output path prefix for the .memory.txt file (None to disable memory profiling)
+        :param sample_interval: seconds between samples
+        :param top_sites: number of allocation sites listed in the memory report
+        """
+        self.cpu_prefix = cpu_prefix
+        self.memory_prefix = memory_prefix
+        self.sample_interval = sample_interval
+        self.top_sites = top_sites
+        self.output_files = []
+        self.peak_memory = None
+
+    def run(self, func, *args):
+        """
+        Call func(*args) under the enabled profilers, and write the reports.
+        :return: return value of func
+        """
+        profile_cpu = self.cpu_prefix is not None
+        profile_memory = self.memory_prefix is not None
+        sampler = _Sampler(threading.get_ident(), self.sample_interval, profile_cpu, profile_memory)
+        profile = cProfile.Profile() if profile_cpu else None
+
+        if profile_memory:
+            tracemalloc.start()
+        sampler.start()
+        try:
+            if profile is not None:
+                profile.enable()
+            try:
+                result = _profiled_call(func, args)
+            finally:
+                if profile is not None:
+                    profile.disable()
+        finally:
+            sampler.stop()
+            if profile_memory:
+                # Catch a peak reached since the last sample
+                sampler.check_memory()
+                _, self.peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        self.output_files = []
+        if profile_cpu:
+            self.output_files.append(self._write_pstats(profile))
+            stacks = sampler.stacks
+            if sum(stacks.values()) < MIN_STACK_SAMPLES:
+                stacks = _profile_stacks(profile)
+            self.output_files.append(self._write_collapsed(stacks))
+        if profile_memory:
+            self.output_files.append(self._write_memory_report(sampler.peak_snapshot, sampler.peak_snapshot_size))
+        return result
+
+    def _write_pstats(self, profile):
+        path = self.cpu_prefix + ".pstats"
+        profile.dump_stats(path)
+        return path
+
+    def _write_collapsed(self, stacks):
+        path = self.cpu_prefix + ".collapsed"
+        with open(path, "w") as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _write_memory_report(self, snapshot, snapshot_size):
+        path = self.memory_prefix + ".memory.txt"
+        with open(path, "w") as f:
+            f.write(f"Peak traced memory: {self.peak_memory / 1024:.1f} KiB\n")
+            if snapshot is None:
+                f.write("No snapshot taken (run too short)\n")
+                return path
+            f.write(f"Allocations alive at snapshot closest to peak ({snapshot_size / 1024:.1f} KiB), "
+                    f"by allocation site:\n\n")
+            # Ignore allocations made by the profiling machinery itself
+            snapshot = snapshot.filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, linecache.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            f.write(f"{'KiB':>12} {'share':>7} {'blocks':>10}  site\n")
+            statistics = snapshot.statistics("lineno")
+            total = sum(stat.size for stat in statistics) or 1
+            for stat in statistics[:self.top_sites]:
+                frame = stat.traceback[0]
+                source = linecache.getline(frame.filename, frame.lineno).strip()
+                f.write(f"{stat.size / 1024:>12.1f} {stat.size / total:>7.1%} {stat.count:>10}  "
+                        f"{frame.filename}:{frame.lineno}  {source}\n")
+        return path
+
+
+def _frame_name(func):
+    filename, line, name = func
+    if filename == '~':
+        # Built-in function
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _profile_stacks(profile):
+    """
+    Rebuild collapsed call stacks from cProfile data, for runs too short to be sampled. cProfile only records
+    caller/callee pairs, so each function's time is split between the stacks reaching it in proportion to the time
+    spent under each caller; recursive calls are cut off.
+    :param profile: cProfile.Profile after the run
+    :return: Counter mapping collapsed stack to time in microseconds
+    """
+    stats = pstats.Stats(profile).stats
+    callees = {}
+    root = None
+    for func, (_, _, _, _, callers) in stats.items():
+        if func[2] == _profiled_call.__name__ and func[0] == _profiled_call.__code__.co_filename:
+            root = func
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, cumulative))
+    stacks = Counter()
+    if root is None:
+        return stacks
+
+    # Stack entries: (function, time spent in it along this stack, names from the profiled function down)
+    pending = [(func, cumulative, (_frame_name(func),)) for func, cumulative in callees.get(root, [])]
+    while pending:
+        func, time_spent, names = pending.pop()
+        _, _, own_time, cumulative, _ = stats[func]
+        share = time_spent / cumulative if cumulative > 0 else 0
+        micros = int(own_time * share * 1e6)
+        if micros > 0:
+            stacks[";".join(names)] += micros
+        if len(names) >= MAX_PROFILE_STACK_DEPTH:
+            continue
+        for callee, callee_time in callees.get(func, []):
+            if callee == root or _frame_name(callee) in names:
+                continue
+            pending.append((callee, callee_time * share, names + (_frame_name(callee),)))
+    return stacks
+
@@ -0,0 +1,477 @@
+from memory_budget import MemoryBudgetExceeded
+from state_store import StateStore
+from transition_model import get_transition_model
+
+"""
+search_engine.py
+
+This file contains a reusable UCS/A* search engine for GameEnv. Costs are handled as fixed-point integers (all
+action costs are multiples of 0.1), which avoids floating point drift and allows a bucket (Dial) priority queue with
+O(1) push and pop to be used in place of a binary heap.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+# Number of integer cost units per unit of GameEnv.ACTION_COST
+COST_SCALE = 10
+
+
+def scale_cost(cost):
+    """
+    Convert a cost to fixed-point integer units.
+    :param cost: cost (float)
+    :return: cost in COST_SCALE units (int)
+    """
+    return int(round(cost * COST_SCALE))
+
+
+def unscale_cost(scaled_cost):
+    """
+    Convert a fixed-point integer cost back to a float.
+    :param scaled_cost: cost in COST_SCALE units (int)
+    :return: cost (float)
+    """
+    return scaled_cost / COST_SCALE
+
+
+class BucketQueue:
+    """
+    Priority queue for non-negative integer keys, storing one bucket (list) of items per key.
+
+    Pushing is O(1). Popping scans forward from the smallest non-empty bucket, which is O(1) amortised when keys are
+    (mostly) popped in increasing order, as they are in UCS and A* with a consistent heuristic. Items with equal keys
+    are popped last-in, first-out, so ordering is deterministic.
+    """
+
+    def __init__(self):
+        self._buckets = []
+        self._current = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, key, item):
+        buckets = self._buckets
+        if key >= len(buckets):
+            buckets.extend([] for _ in range(key + 1 - len(buckets)))
+        buckets[key].append(item)
+        if key < self._current:
+            self._current = key
+        self._size += 1
+
+    def pop(self):
+        """
+        Remove and return the item with the smallest key.
+        :return: (key, item)
+        """
+        assert self._size > 0, "/!\\ ERROR: pop from empty BucketQueue"
+        buckets = self._buckets
+        current = self._current
+        while not buckets[current]:
+            current += 1
+        self._current = current
+        self._size -= 1
+        return current, buckets[current].pop()
+
+    def peek_key(self):
+        """
+        Get the smallest key in the queue without removing it.
+        :return: smallest key, or None if the queue is empty
+        """
+        if self._size == 0:
+            return None
+        buckets = self._buckets
+        current = self._current
+        while not buckets[current]:
+            current += 1
+        self._current = current
+        return current
+
+
+class SearchEngine:
+    """
+    UCS/A* search over dense state IDs (see GameEnv.encode_state), using GameEnv.get_successor_ids for expansion and
+    a StateStore for g-costs, parent actions and the closed set.
+
+    Open list entries are never removed when a cheaper path is found; stale entries are skipped when popped (lazy
+    deletion). Closed states are reopened if a cheaper path to them is found, so inconsistent (but admissible)
+    heuristics still give optimal plans.
+    """
+
+    def __init__(self, game_env):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.action_costs = [scale_cost(game_env.ACTION_COST[a]) for a in game_env.ACTION_LIST]
+        self.goal_id = game_env.get_solved_state_id()
+
+        self.store = None
+        self.frontier = None
+        self.memory_budget = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+        self.plan_cost = None
+
+    def search(self, heuristic=None, init_state=None, memory_budget=None, weight=1, greedy=False, is_dead=None):
+        """
+        Find an optimal path to the solved state, using UCS if no heuristic is given and A* otherwise.
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in COST_SCALE units, or to None if the solved state is unreachable from it (None for UCS)
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :param memory_budget: MemoryBudget checked during the search, or None. If it is exceeded,
+            MemoryBudgetExceeded is raised, with the partial statistics of the search (see get_stats)
+        :param weight: heuristic weight w, ordering the open list by g + w * h (weighted A*). Above 1, the plan
+            found costs at most w times the optimal cost
+        :param greedy: if True, order the open list by h alone (greedy best-first search) and never reopen states,
+            which finds a plan quickly with no bound on its cost
+        :param is_dead: optional function mapping a state ID to True if the solved state is unreachable from it
+            (e.g. DeadStateDetector.is_dead_id); such successors are dropped before they are stored or queued
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        game_env = self.game_env
+        if init_state is None:
+            init_state = game_env.get_init_state()
+        init_id = game_env.encode_state(init_state)
+
+        store = StateStore(game_env)
+        self.store = store
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+        self.plan_cost = None
+
+        get_successor_ids = game_env.get_successor_ids
+        action_costs = self.action_costs
+        goal_id = self.goal_id
+
+        frontier = BucketQueue()
+        init_h = heuristic(init_id) if heuristic is not None else 0
+        if init_h is None:
+            return None
+        store.set(init_id, 0)
+        frontier.push(init_h if greedy else int(round(weight * init_h)), init_id)
+        self.frontier = frontier
+        self.memory_budget = memory_budget
+        # The state limit is checked on every insertion; RSS is only sampled every check_interval expansions
+        state_limit = None
+        if memory_budget is not None:
+            memory_budget.start()
+            checks_until_budget = memory_budget.check_interval
+            state_limit = memory_budget.max_states
+
+        while len(frontier) > 0:
+            f, state_id = frontier.pop()
+            if store.is_closed(state_id):
+                # Stale entry (state already expanded via a cheaper path)
+                continue
+            store.close(state_id)
+
+            g = store.get_g(state_id)
+            if state_id == goal_id:
+                self.plan_cost = unscale_cost(int(g))
+                if memory_budget is not None:
+                    memory_budget.record(len(frontier), len(store))
+                return store.extract_path(state_id)
+            self.nodes_expanded += 1
+
+            if memory_budget is not None:
+                checks_until_budget -= 1
+                if checks_until_budget == 0:
+                    checks_until_budget = memory_budget.check_interval
+                    reason = memory_budget.check(len(frontier), len(store))
+                    if reason is not None:
+                        raise self._budget_exceeded(reason, state_id, f, weight, greedy)
+
+            for action_index, next_id in get_successor_ids(state_id):
+                next_g = g + action_costs[action_index]
+                if next_g < store.get_g(next_id):
+                    if is_dead is not None and is_dead(next_id):
+                        self.nodes_pruned += 1
+                        continue
+                    if heuristic is None:
+                        next_f = int(next_g)
+                    else:
+                        if greedy and next_id in store:
+                            continue
+                        next_h = heuristic(next_id)
+                        if next_h is None:
+                            continue
+                        if greedy:
+                            next_f = next_h
+                        elif weight == 1:
+                            next_f = int(next_g) + next_h
+                        else:
+                            next_f = int(next_g) + int(round(weight * next_h))
+                    store.set(next_id, next_g, action_index)
+                    self.nodes_generated += 1
+                    frontier.push(next_f, next_id)
+                    if state_limit is not None and len(frontier) + len(store) > state_limit:
+                        reason = memory_budget.check(len(frontier), len(store))
+                        raise self._budget_exceeded(reason, state_id, f, weight, greedy)
+
+        if memory_budget is not None:
+            memory_budget.record(len(frontier), len(store))
+        return None
+
+    def _budget_exceeded(self, reason, state_id, f, weight, greedy):
+        """
+        Build the MemoryBudgetExceeded raised when a search stops while expanding the given state, at the given open
+        list priority. The state is marked open again (its successors may not all have been generated), so the open
+        states left in the store cover every unexplored path (see IDAStarSearch.search).
+        """
+        store = self.store
+        store.set(state_id, store.get_g(state_id), store.get_action(state_id))
+        # f is a lower bound on the optimal plan cost (with an admissible, unweighted heuristic)
+        lower_bound = unscale_cost(f) if weight == 1 and not greedy else None
+        return MemoryBudgetExceeded(reason, self.get_stats(cost_lower_bound=lower_bound))
+
+    def search_macro(self, get_successors, heuristic=None, init_state=None, refine_edge=None):
+        """
+        Find an optimal path to the solved state over a graph of macro-edges (see corridor_compression.py and
+        hierarchical_search.py), using UCS if no heuristic is given and A* otherwise. Each edge stands for a sequence
+        of actions, so edges are kept in a dict of parents alongside the StateStore, and unfolded into the plan.
+
+        The plans found are optimal if every plan splits into segments between states of the macro graph, each no
+        cheaper than some edge (or chain of edges) between the same states: this holds for the macro-edges of both
+        callers, which are the cheapest paths between their end states.
+        :param get_successors: function mapping a state ID to a list of (next state ID, cost in COST_SCALE units,
+            edge) triples, where edge is a tuple of action indices into GameEnv.ACTION_LIST (or any label if
+            refine_edge is given)
+        :param heuristic: function mapping a state ID to an admissible estimate of the remaining cost, as an integer
+            in COST_SCALE units, or to None if the solved state is unreachable from it (None for UCS)
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :param refine_edge: optional function mapping (state ID, next state ID, edge) to the tuple of action indices
+            the edge stands for, called only for the edges of the plan found
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        game_env = self.game_env
+        if init_state is None:
+            init_state = game_env.get_init_state()
+        init_id = game_env.encode_state(init_state)
+
+        store = StateStore(game_env)
+        self.store = store
+        self.memory_budget = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+        self.plan_cost = None
+        goal_id = self.goal_id
+
+        frontier = BucketQueue()
+        self.frontier = frontier
+        init_h = heuristic(init_id) if heuristic is not None else 0
+        if init_h is None:
+            return None
+        store.set(init_id, 0)
+        # State ID -> (parent state ID, action indices of the edge which reached it)
+        parents = {init_id: None}
+        frontier.push(init_h, init_id)
+
+        while len(frontier) > 0:
+            _, state_id = frontier.pop()
+            if store.is_closed(state_id):
+                # Stale entry (state already expanded via a cheaper path)
+                continue
+            store.close(state_id)
+
+            g = store.get_g(state_id)
+            if state_id == goal_id:
+                self.plan_cost = unscale_cost(int(g))
+                edges = []
+                while parents[state_id] is not None:
+                    next_id = state_id
+                    state_id, actions = parents[state_id]
+                    if refine_edge is not None:
+                        actions = refine_edge(state_id, next_id, actions)
+                    edges.append(actions)
+                return [game_env.ACTION_LIST[a] for actions in reversed(edges) for a in actions]
+            self.nodes_expanded += 1
+
+            for next_id, cost, actions in get_successors(state_id):
+                next_g = g + cost
+                if next_g < store.get_g(next_id):
+                    if heuristic is None:
+                        next_f = int(next_g)
+                    else:
+                        next_h = heuristic(next_id)
+                        if next_h is None:
+                            continue
+                        next_f = int(next_g) + next_h
+                    store.set(next_id, next_g)
+                    parents[next_id] = (state_id, actions)
+                    self.nodes_generated += 1
+                    frontier.push(next_f, next_id)
+
+        return None
+
+    def get_stats(self, **extra):
+        """
+        Get statistics for the most recent search (which may be incomplete).
+        :param extra: additional entries to include
+        :return: dict with keys nodes_expanded, nodes_generated, nodes_pruned, frontier_size, stored_states,
+            plan_cost, and, if the search used a MemoryBudget, its recorded peaks (see MemoryBudget.get_stats)
+        """
+        stats = {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "nodes_pruned": self.nodes_pruned,
+            "frontier_size": len(self.frontier) if self.frontier is not None else 0,
+            "stored_states": len(self.store) if self.store is not None else 0,
+            "plan_cost": self.plan_cost,
+        }
+        if self.memory_budget is not None:
+            stats.update(self.memory_budget.get_stats())
+        stats.update(extra)
+        return stats
+
+    def search_bidirectional(self, heuristic=None, init_state=None):
+        """
+        Find an optimal path by searching forwards from the initial state and backwards (see
+        GameEnv.get_predecessor_ids) from the solved state at the same time, until the two searches meet.
+
+        Without a heuristic both searches are uniform cost. With a heuristic, the forward search is A* and the
+        backward search is A* guided by relaxed distances from the initial position. The side with the smaller open
+        list is expanded next, and the search stops once the cheapest path found through a meeting state is no more
+        expensive than the smallest priority on either open list (or, for UCS, their sum).
+        :param heuristic: function mapping a state ID to an admissible and consistent estimate of the remaining cost,
+            as an integer in COST_SCALE units, or to None if the solved state is unreachable from it (None for UCS)
+        :param init_state: state to search from (GameState or CompactState, defaults to the initial state)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS), or None if the
+            solved state is unreachable
+        """
+        game_env = self.game_env
+        if init_state is None:
+            init_state = game_env.get_init_state()
+        init_id = game_env.encode_state(init_state)
+        goal_id = self.goal_id
+        n_cells = game_env.n_rows * game_env.n_cols
+
+        forward_store = StateStore(game_env)
+        backward_store = StateStore(game_env)
+        self.store = forward_store
+        self.frontier = None
+        self.memory_budget = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+        self.plan_cost = None
+
+        get_successor_ids = game_env.get_successor_ids
+        get_predecessor_ids = game_env.get_predecessor_ids
+        action_costs = self.action_costs
+
+        init_h = heuristic(init_id) if heuristic is not None else 0
+        if init_h is None:
+            return None
+        # Backward estimates: relaxed cost of reaching each cell from the initial position
+        init_dist = self._relaxed_distances_from(init_id % n_cells) if heuristic is not None else None
+        if init_dist is not None and goal_id % n_cells not in init_dist:
+            return None
+
+        forward_frontier = BucketQueue()
+        backward_frontier = BucketQueue()
+        forward_store.set(init_id, 0)
+        forward_frontier.push(init_h, init_id)
+        backward_store.set(goal_id, 0)
+        backward_frontier.push(init_dist[goal_id % n_cells] if init_dist is not None else 0, goal_id)
+
+        best_cost = float('inf')
+        meeting_id = None
+        if init_id == goal_id:
+            best_cost, meeting_id = 0, init_id
+
+        while len(forward_frontier) > 0 and len(backward_frontier) > 0:
+            forward_key = forward_frontier.peek_key()
+            backward_key = backward_frontier.peek_key()
+            if best_cost <= max(forward_key, backward_key):
+                break
+            if heuristic is None and best_cost <= forward_key + backward_key:
+                break
+
+            if len(forward_frontier) <= len(backward_frontier):
+                _, state_id = forward_frontier.pop()
+                if forward_store.is_closed(state_id):
+                    # Stale entry
+                    continue
+                forward_store.close(state_id)
+                self.nodes_expanded += 1
+                g = forward_store.get_g(state_id)
+                for action_index, next_id in get_successor_ids(state_id):
+                    next_g = g + action_costs[action_index]
+                    if next_g < forward_store.get_g(next_id):
+                        if heuristic is None:
+                            next_f = int(next_g)
+                        else:
+                            next_h = heuristic(next_id)
+                            if next_h is None:
+                                continue
+                            next_f = int(next_g) + next_h
+                        forward_store.set(next_id, next_g, action_index)
+                        self.nodes_generated += 1
+                        forward_frontier.push(next_f, next_id)
+                        if next_g + backward_store.get_g(next_id) < best_cost:
+                            best_cost = next_g + backward_store.get_g(next_id)
+                            meeting_id = next_id
+            else:
+                _, state_id = backward_frontier.pop()
+                if backward_store.is_closed(state_id):
+                    continue
+                backward_store.close(state_id)
+                self.nodes_expanded += 1
+                g = backward_store.get_g(state_id)
+                for action_index, prev_id in get_predecessor_ids(state_id):
+                    prev_g = g + action_costs[action_index]
+                    if prev_g < backward_store.get_g(prev_id):
+                        if init_dist is None:
+                            prev_f = int(prev_g)
+                        else:
+                            prev_h = init_dist.get(prev_id % n_cells)
+                            if prev_h is None:
+                                continue
+                            prev_f = int(prev_g) + prev_h
+                        # Stored action is the one leading from prev_id towards the solved state
+                        backward_store.set(prev_id, prev_g, action_index)
+                        self.nodes_generated += 1
+                        backward_frontier.push(prev_f, prev_id)
+                        if prev_g + forward_store.get_g(prev_id) < best_cost:
+                            best_cost = prev_g + forward_store.get_g(prev_id)
+                            meeting_id = prev_id
+
+        if meeting_id is None:
+            return None
+        self.plan_cost = unscale_cost(int(best_cost))
+
+        # Forward half from the forward search tree, then follow the backward search tree to the solved state
+        path = forward_store.extract_path(meeting_id)
+        state_id = meeting_id
+        while state_id != goal_id:
+            action_index = backward_store.get_action(state_id)
+            path.append(game_env.ACTION_LIST[action_index])
+            for next_index, next_id in get_successor_ids(state_id):
+                if next_index == action_index:
+                    state_id = next_id
+                    break
+        return path
+
+    def _relaxed_distances_from(self, source_cell):
+        """
+        Compute the cheapest cost of reaching every cell from a cell, with traps relaxed to their most permissive
+        status (see GameEnv.get_relaxed_successors).
+        :return: dict mapping reachable cell to scaled cost
+        """
+        dist = {}
+        frontier = BucketQueue()
+        frontier.push(0, source_cell)
+        while len(frontier) > 0:
+            d, cell = frontier.pop()
+            if cell in dist:
+                continue
+            dist[cell] = d
+            for action_index, next_cell in self.game_env.get_relaxed_successors(cell):
+                if next_cell not in dist:
+                    frontier.push(d + self.action_costs[action_index], next_cell)
+        return dist
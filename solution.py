@@ -1,5 +1,18 @@
+from anytime_search import AnytimeSearch
+from corridor_compression import CorridorCompression
+from dead_states import DeadStateDetector
 from game_env import GameEnv
 from game_state import GameState
+from heuristics import MaxHeuristic, RelaxedDistanceHeuristic
+from hierarchical_search import get_hierarchy
+from keypoint_planner import KeypointPlanner
+from lever_analysis import MIN_LEVERS_FOR_HEURISTIC, LeverDependencyGraph
+from memory_bounded_search import DEFAULT_TABLE_CAPACITY, IDAStarSearch
+from memory_budget import FALLBACK, MemoryBudgetExceeded
+from move_pruning import MovePruning
+from parallel_search import ParallelAStarSearch
+from pattern_database import PatternDatabaseHeuristic
+from search_engine import SearchEngine
 
 """
 solution.py
@@ -18,12 +31,60 @@ class Solver:
     def __init__(self, game_env):
         self.game_env = game_env
 
-        #
-        #
-        # TODO: Define any class instance variables you require here (avoid performing any computationally expensive
-        #  heuristic preprocessing operations here - use the preprocess_heuristic method below for this purpose).
-        #
-        #
+        # Heuristic provider, and lever dependency analysis on levels with many levers (built by preprocess_heuristic)
+        self.heuristic = None
+        self.lever_dependencies = None
+
+        # Optional memory limits for searches (see memory_budget.py); a search exceeding them raises
+        # MemoryBudgetExceeded with partial statistics, or switches to IDA* if the budget asks for a fallback
+        self.memory_budget = None
+
+        # Number of worker processes for search_a_star; above 1, the search is distributed with HDA* (see
+        # parallel_search.py), which does not apply the memory budget
+        self.n_workers = 1
+
+        # If set (in seconds), search_a_star runs the anytime search (see anytime_search.py), returning the best plan
+        # found by the deadline, and calls on_anytime_solution (if set) with each AnytimeSolution found
+        self.anytime_deadline = None
+        self.on_anytime_solution = None
+
+        # If True, search_ucs and search_a_star search transition tables pruned of every transition into a dead state
+        # (see dead_states.py), built on first use
+        self.prune_dead_states = False
+        self.dead_states = None
+        self.pruned_env = None
+
+        # If True, search_ucs and search_a_star drop successors from which the lever dependency analysis shows some
+        # unactivated lever can no longer be reached (see LeverDependencyGraph.is_dead_id), building lever_dependencies
+        # on first use
+        self.prune_lever_dependencies = False
+
+        # If True, search_ucs and search_a_star search the graph with corridors collapsed into macro-edges (see
+        # corridor_compression.py), which does not apply the memory budget or dead state pruning
+        self.compress_corridors = False
+        self.corridor_graph = None
+
+        # If set (cluster width and height in cells), search_ucs and search_a_star run hierarchical pathfinding (see
+        # hierarchical_search.py), whose abstract graph is kept on the environment for later searches; this takes
+        # precedence over compress_corridors, and does not apply the memory budget or dead state pruning
+        self.hierarchical_cluster_size = None
+        self.hierarchy = None
+
+        # If True, search_ucs and search_a_star search forwards from the initial state and backwards from the solved
+        # state until the searches meet (see SearchEngine.search_bidirectional), which does not apply the memory
+        # budget or dead state pruning
+        self.bidirectional = False
+
+        # If True, search_ucs and search_a_star plan over the level's keypoints (initial position, levers and goal; see
+        # keypoint_planner.py), whose cheapest walks are kept for later searches; this does not apply the memory budget
+        # or dead state pruning
+        self.keypoint_planning = False
+        self.keypoint_planner = None
+
+        # Statistics from the most recent search
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.search_stats = None
 
     @staticmethod
     def get_testcases():
@@ -52,32 +113,43 @@ class Solver:
         Find a path which solves the environment using Uniform Cost Search (UCS).
         :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
         """
-
-        #
-        #
-        # TODO: Implement your UCS code here.
-        #
-        #
-
-        pass
+        if self.hierarchical_cluster_size is not None:
+            return self._search_hierarchical()
+        if self.compress_corridors:
+            return self._search_compressed()
+        if self.bidirectional:
+            return self._search_bidirectional()
+        if self.keypoint_planning:
+            return self._search_keypoints()
+        engine = SearchEngine(self._get_search_env())
+        exceeded = None
+        try:
+            path = engine.search(memory_budget=self.memory_budget, is_dead=self._get_dead_check())
+        except MemoryBudgetExceeded as e:
+            # Drop the traceback, which would keep the aborted search's data alive
+            exceeded = e.with_traceback(None)
+        self._record_stats(engine)
+        if exceeded is not None:
+            # Keep only the explored states, which the fallback search continues from
+            explored = engine.store
+            engine = None
+            return self._search_memory_bounded(exceeded, explored)
+        return path
 
     # === A* Search ====================================================================================================
     def preprocess_heuristic(self):
         """
         Perform pre-processing (e.g. pre-computing repeatedly used values) necessary for your heuristic,
         """
-
-        #
-        #
-        # TODO: (Optional) Implement code for any preprocessing required by your heuristic here (if your heuristic
-        #  requires preprocessing).
-        #
-        # If you choose to implement code here, you should call this method from your search_a_star method (e.g. once at
-        # the beginning of your search).
-        #
-        #
-
-        pass
+        # Relaxed distance tables from the goal and from each lever (see heuristics.py), tightened by lever
+        # dependencies on levels with many levers (see lever_analysis.py), combined with pattern databases over groups
+        # of lever/trap pairs (see pattern_database.py, cached on disk after the first run)
+        if len(self.game_env.lever_positions) >= MIN_LEVERS_FOR_HEURISTIC:
+            self.lever_dependencies = LeverDependencyGraph(self.game_env)
+            relaxed = self.lever_dependencies
+        else:
+            relaxed = RelaxedDistanceHeuristic(self.game_env)
+        self.heuristic = MaxHeuristic(self.game_env, [relaxed, PatternDatabaseHeuristic(self.game_env)])
 
     def compute_heuristic(self, state):
         """
@@ -85,28 +157,147 @@ class Solver:
         :param state: given state (GameState object)
         :return a real number h(n)
         """
-
-        #
-        #
-        # TODO: Implement your heuristic function for A* search here. Note that your heuristic can be tested on
-        #  gradescope even if you have not yet implemented search_a_star.
-        #
-        # You should call this method from your search_a_star method (e.g. every time you need to compute a heuristic
-        # value for a state).
-        #
-
-        pass
+        if self.heuristic is None:
+            self.preprocess_heuristic()
+        return self.heuristic.compute(state)
 
     def search_a_star(self):
         """
         Find a path which solves the environment using A* Search.
         :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
         """
+        if self.heuristic is None:
+            self.preprocess_heuristic()
+        if self.anytime_deadline is not None:
+            anytime_engine = AnytimeSearch(self.game_env)
+            path = anytime_engine.search(self.heuristic.compute_scaled, deadline=self.anytime_deadline,
+                                         on_solution=self.on_anytime_solution)
+            self._record_stats(anytime_engine)
+            return path
+        if self.n_workers > 1:
+            parallel_engine = ParallelAStarSearch(self.game_env, n_workers=self.n_workers)
+            path = parallel_engine.search(heuristic=self.heuristic.compute_scaled)
+            self._record_stats(parallel_engine)
+            return path
+        if self.hierarchical_cluster_size is not None:
+            return self._search_hierarchical(self.heuristic.compute_scaled)
+        if self.compress_corridors:
+            return self._search_compressed(self.heuristic.compute_scaled)
+        if self.bidirectional:
+            return self._search_bidirectional(self.heuristic.compute_scaled)
+        if self.keypoint_planning:
+            return self._search_keypoints(self.heuristic.compute_scaled)
+        engine = SearchEngine(self._get_search_env())
+        exceeded = None
+        try:
+            path = engine.search(heuristic=self.heuristic.compute_scaled, memory_budget=self.memory_budget,
+                                 is_dead=self._get_dead_check())
+        except MemoryBudgetExceeded as e:
+            # Drop the traceback, which would keep the aborted search's data alive
+            exceeded = e.with_traceback(None)
+        self._record_stats(engine)
+        if exceeded is not None:
+            # Keep only the explored states, which the fallback search continues from
+            explored = engine.store
+            engine = None
+            return self._search_memory_bounded(exceeded, explored)
+        return path
 
-        #
-        #
-        # TODO: Implement your A* search code here.
-        #
-        #
+    def _search_memory_bounded(self, exceeded, explored):
+        """
+        Handle a search which exceeded the memory budget: re-raise, or (if the budget asks for a fallback) find an
+        optimal plan with IDA*, using the A* heuristic and a transposition table capped at the budget's state limit.
+        IDA* continues from the open states of the aborted search, which are kept (with its stored g-costs) alongside
+        the transposition table, so the fallback holds up to about twice the state limit.
+        :param exceeded: MemoryBudgetExceeded raised by the search
+        :param explored: StateStore of the aborted search
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
+        """
+        if self.memory_budget.on_exceeded != FALLBACK:
+            raise exceeded
+        if self.heuristic is None:
+            self.preprocess_heuristic()
+        capacity = self.memory_budget.max_states or DEFAULT_TABLE_CAPACITY
+        ida_star = IDAStarSearch(self.game_env, table_capacity=capacity)
+        path = ida_star.search(heuristic=self.heuristic.compute_scaled, move_pruning=MovePruning(self.game_env),
+                               explored=explored)
+        self._record_stats(ida_star)
+        self.search_stats["fallback_reason"] = exceeded.reason
+        return path
+
+    def _search_compressed(self, heuristic=None):
+        """
+        Search the corridor-compressed graph, building it on first use.
+        :param heuristic: scaled heuristic function (None for UCS)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
+        """
+        if self.corridor_graph is None:
+            self.corridor_graph = CorridorCompression(self.game_env)
+        path = self.corridor_graph.search(heuristic=heuristic)
+        self._record_stats(self.corridor_graph)
+        return path
+
+    def _search_hierarchical(self, heuristic=None):
+        """
+        Search with hierarchical pathfinding, over the abstract graph kept for this level and cluster size (see
+        get_hierarchy).
+        :param heuristic: scaled heuristic function (None for UCS)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
+        """
+        self.hierarchy = get_hierarchy(self.game_env, cluster_size=self.hierarchical_cluster_size)
+        path = self.hierarchy.search(heuristic=heuristic)
+        self._record_stats(self.hierarchy)
+        return path
+
+    def _search_bidirectional(self, heuristic=None):
+        """
+        Search forwards and backwards at the same time (see SearchEngine.search_bidirectional).
+        :param heuristic: scaled heuristic function (None for UCS)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
+        """
+        engine = SearchEngine(self.game_env)
+        path = engine.search_bidirectional(heuristic=heuristic)
+        self._record_stats(engine)
+        return path
+
+    def _search_keypoints(self, heuristic=None):
+        """
+        Plan over the keypoint abstraction, building the planner on first use.
+        :param heuristic: scaled heuristic function (None for UCS)
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
+        """
+        if self.keypoint_planner is None:
+            self.keypoint_planner = KeypointPlanner(self.game_env)
+        path = self.keypoint_planner.search(heuristic=heuristic)
+        self._record_stats(self.keypoint_planner)
+        return path
+
+    def _get_search_env(self):
+        """
+        Get the environment for SearchEngine, building the DeadStateDetector and its pruned transition tables on
+        first use if prune_dead_states is True.
+        :return: game_env, or a TransitionModel without transitions into dead states
+        """
+        if not self.prune_dead_states:
+            return self.game_env
+        if self.pruned_env is None:
+            self.dead_states = DeadStateDetector(self.game_env)
+            self.pruned_env = self.dead_states.prune_transitions()
+        return self.pruned_env
+
+    def _get_dead_check(self):
+        """
+        Get the dead state check for SearchEngine.search, building the LeverDependencyGraph on first use if
+        prune_lever_dependencies is True.
+        :return: LeverDependencyGraph.is_dead_id, or None
+        """
+        if not self.prune_lever_dependencies:
+            return None
+        if self.lever_dependencies is None:
+            self.lever_dependencies = LeverDependencyGraph(self.game_env)
+        return self.lever_dependencies.is_dead_id
 
-        pass
+    def _record_stats(self, engine):
+        self.nodes_expanded = engine.nodes_expanded
+        self.nodes_generated = engine.nodes_generated
+        self.search_stats = engine.get_stats()
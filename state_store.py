@@ -0,0 +1,155 @@
+from array import array
+
+from transition_model import get_transition_model
+
+"""
+state_store.py
+
+This file contains a class for storing per-state search data (g-costs, parent actions and closed flags) in flat
+arrays indexed by dense state IDs (see GameEnv.encode_state), instead of dicts of GameState objects.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+class StateStore:
+    """
+    Array-backed g-cost table, parent action table and closed set, indexed by dense state ID.
+
+    Storage is split into pages, one per trap configuration (n_rows * n_cols entries each), which are only allocated
+    when a state with that trap configuration is first stored. This keeps memory proportional to the trap
+    configurations actually reached, rather than to the full n_rows * n_cols * 2^n_traps state space.
+
+    Parent actions are stored as indices into GameEnv.ACTION_LIST. Every action has a unique inverse (a fixed
+    movement, or toggling the trap of the lever being stood on), so the parent state never needs to be stored.
+    """
+
+    NO_ACTION = -1
+
+    def __init__(self, game_env):
+        game_env = get_transition_model(game_env)
+        self.game_env = game_env
+        self.page_size = game_env.n_rows * game_env.n_cols
+        self.size = 0
+        n_pages = 1 << len(game_env.trap_positions)
+        self._g_pages = [None] * n_pages
+        self._action_pages = [None] * n_pages
+        self._closed_pages = [None] * n_pages
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, state_id):
+        page, offset = divmod(state_id, self.page_size)
+        g_page = self._g_pages[page]
+        return g_page is not None and g_page[offset] != float('inf')
+
+    def _allocate_page(self, page):
+        self._g_pages[page] = array('d', [float('inf')]) * self.page_size
+        self._action_pages[page] = array('b', [self.NO_ACTION]) * self.page_size
+        self._closed_pages[page] = array('B', [0]) * self.page_size
+
+    def get_g(self, state_id):
+        """
+        Get the stored g-cost of a state.
+        :param state_id: state ID
+        :return: g-cost, or inf if the state has not been stored
+        """
+        page, offset = divmod(state_id, self.page_size)
+        g_page = self._g_pages[page]
+        if g_page is None:
+            return float('inf')
+        return g_page[offset]
+
+    def get_action(self, state_id):
+        """
+        Get the index (into GameEnv.ACTION_LIST) of the action which reached a state.
+        :param state_id: state ID
+        :return: action index, or NO_ACTION for the start state or states not stored
+        """
+        page, offset = divmod(state_id, self.page_size)
+        action_page = self._action_pages[page]
+        if action_page is None:
+            return self.NO_ACTION
+        return action_page[offset]
+
+    def set(self, state_id, g, action_index=NO_ACTION):
+        """
+        Store the g-cost of a state and the action which reached it. The state is (re)marked as open.
+        :param state_id: state ID
+        :param g: g-cost
+        :param action_index: index into GameEnv.ACTION_LIST, or NO_ACTION for the start state
+        """
+        page, offset = divmod(state_id, self.page_size)
+        g_page = self._g_pages[page]
+        if g_page is None:
+            self._allocate_page(page)
+            g_page = self._g_pages[page]
+        if g_page[offset] == float('inf'):
+            self.size += 1
+        g_page[offset] = g
+        self._action_pages[page][offset] = action_index
+        self._closed_pages[page][offset] = 0
+
+    def close(self, state_id):
+        """
+        Mark a stored state as closed (expanded).
+        :param state_id: state ID (must have been stored with set())
+        """
+        page, offset = divmod(state_id, self.page_size)
+        self._closed_pages[page][offset] = 1
+
+    def is_closed(self, state_id):
+        page, offset = divmod(state_id, self.page_size)
+        closed_page = self._closed_pages[page]
+        return closed_page is not None and closed_page[offset] == 1
+
+    def get_open_ids(self):
+        """
+        Get the stored states which are not closed (the open states of the search which filled the store).
+        :return: generator of state IDs
+        """
+        inf = float('inf')
+        for page, g_page in enumerate(self._g_pages):
+            if g_page is None:
+                continue
+            closed_page = self._closed_pages[page]
+            base = page * self.page_size
+            for offset, g in enumerate(g_page):
+                if g != inf and not closed_page[offset]:
+                    yield base + offset
+
+    def get_parent(self, state_id):
+        """
+        Get the state ID of the parent of a stored state by undoing the stored action.
+        :param state_id: state ID
+        :return: parent state ID, or None for the start state
+        """
+        action_index = self.get_action(state_id)
+        if action_index == self.NO_ACTION:
+            return None
+        action = self.game_env.ACTION_LIST[action_index]
+        trap_bits, cell = divmod(state_id, self.page_size)
+        row, col = divmod(cell, self.game_env.n_cols)
+        d_row, d_col = self.game_env.ACTION_DELTAS[action]
+        row, col = row - d_row, col - d_col
+        if action == self.game_env.ACTIVATE and (row, col) in self.game_env.lever_map_positions:
+            trap_pos = self.game_env.lever_map_positions[(row, col)]
+            trap_bits ^= 1 << self.game_env.trap_positions.index(trap_pos)
+        return (trap_bits * self.game_env.n_rows + row) * self.game_env.n_cols + col
+
+    def extract_path(self, state_id):
+        """
+        Follow stored parent actions from the given state back to the start state.
+        :param state_id: state ID
+        :return: path (list of actions, where each action is an element of GameEnv.ACTIONS)
+        """
+        path = []
+        while True:
+            action_index = self.get_action(state_id)
+            if action_index == self.NO_ACTION:
+                break
+            path.append(self.game_env.ACTION_LIST[action_index])
+            state_id = self.get_parent(state_id)
+        path.reverse()
+        return path
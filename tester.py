@@ -1,8 +1,18 @@
+import argparse
+import gc
+import glob
+import multiprocessing
+import multiprocessing.connection
+import os
+import statistics
 import sys
 import time
 
 from game_env import GameEnv
 from control.game_env import GameEnv as ControlEnv
+from hierarchical_search import DEFAULT_CLUSTER_SIZE
+from memory_budget import ABORT, FALLBACK, MemoryBudget, MemoryBudgetExceeded
+from profiling import Profiler
 from solution import Solver
 
 """
@@ -15,16 +25,46 @@ COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
 
 VISUALISE_TIME_PER_STEP = 0.7
 
+# Default time limit (in seconds) for each job in batch mode
+BATCH_TIMEOUT = 600.0
+
 
 def print_usage():
-    print("Usage: python tester.py [search_type] [testcase_file] [-v (optional)]")
+    print("Usage: python tester.py [search_type] [testcase_file] [-v (optional)] [-i (optional)] [-t (optional)]")
     print("    search_type = 'ucs' or 'a_star'")
     print("    testcase_file = filename of a valid testcase file (e.g. level_1.txt)")
     print("    if -v is specified, the solver's trajectory will be visualised")
+    print("    if -i is specified, environment call counters are reported (see GameEnv.enable_instrumentation)")
+    print("    if -t is specified, preprocessing and search are timed separately with perf_counter_ns, and timing")
+    print("    statistics are reported, with the first (cold) run's times reported separately; --trials=N,")
+    print("    --warmup=N (default 1) and --no-gc (disable garbage collection while timing) configure timing (and imply")
+    print("    -t)")
+    print("    --profile=PREFIX runs the search again under cProfile and stack sampling, writing PREFIX.pstats and")
+    print("    PREFIX.collapsed (for flame graphs); --profile-memory=PREFIX runs it again under tracemalloc, writing")
+    print("    PREFIX.memory.txt (memory near the peak, by allocation site)")
+    print("    --memory-budget=MIB and/or --max-states=N abort the search cleanly, reporting partial statistics, once")
+    print("    the process RSS or the number of states held by the search exceeds the limit; with --memory-fallback")
+    print("    the solver switches to memory-bounded IDA* instead of aborting")
+    print("    --workers=N runs A* as hash-distributed parallel A* (HDA*) across N worker processes")
+    print("    --anytime[=SECONDS] runs A* as anytime ARA*, improving the plan until the deadline (default: the level's")
+    print("    A* max score run time target) and reporting the cost bound of each plan found")
+    print("    --prune-dead drops successors from which the level cannot be solved (see dead_states.py)")
+    print("    --compress searches with corridors collapsed into macro-edges (see corridor_compression.py)")
+    print("    --hpa[=SIZE] searches with hierarchical pathfinding over SIZE x SIZE clusters (default: 8; see")
+    print("    hierarchical_search.py)")
+    print("    --bidirectional searches forwards from the initial state and backwards from the solved state at once")
+    print("    --keypoints plans over the initial position, levers and goal (see keypoint_planner.py)")
+    print("   or: python tester.py --batch [testcase_dir] [-j n_workers] [--timeout seconds] [--search ucs|a_star|both]")
+    print("                                [--memory-budget MIB] [--max-states N] [--memory-fallback]")
+    print("    runs every testcase with each search type in parallel worker processes, and prints a score table")
 
 
 def main(arglist):
-    if len(arglist) != 2 and len(arglist) != 3:
+    if len(arglist) > 0 and arglist[0] == '--batch':
+        batch_main(arglist[1:])
+        return
+
+    if len(arglist) < 2:
         print_usage()
         return
 
@@ -38,35 +78,132 @@ def main(arglist):
     testcase_file = arglist[1]
     game_env = GameEnv(testcase_file)
 
-    if len(arglist) == 3:
-        if arglist[2] == '-v':
-            visualise = True
-        else:
-            print(f"/!\\ ERROR: Invalid option given: {arglist[2]}")
+    # For small environments, take average time over multiple trials
+    trials = get_num_trials(game_env)
+
+    visualise = False
+    instrument = False
+    timing = False
+    warmup = 1
+    disable_gc = False
+    cpu_prefix = None
+    memory_prefix = None
+    max_rss = None
+    max_states = None
+    on_exceeded = ABORT
+    n_workers = 1
+    anytime_deadline = None
+    prune_dead = False
+    compress = False
+    cluster_size = None
+    bidirectional = False
+    keypoints = False
+    for option in arglist[2:]:
+        try:
+            if option == '-v':
+                visualise = True
+            elif option == '-i':
+                instrument = True
+            elif option == '-t':
+                timing = True
+            elif option.startswith('--trials='):
+                trials = int(option[len('--trials='):])
+                if trials < 1:
+                    raise ValueError
+                timing = True
+            elif option.startswith('--warmup='):
+                warmup = int(option[len('--warmup='):])
+                if warmup < 0:
+                    raise ValueError
+                timing = True
+            elif option == '--no-gc':
+                disable_gc = True
+                timing = True
+            elif option.startswith('--profile=') and len(option) > len('--profile='):
+                cpu_prefix = option[len('--profile='):]
+            elif option.startswith('--profile-memory=') and len(option) > len('--profile-memory='):
+                memory_prefix = option[len('--profile-memory='):]
+            elif option.startswith('--memory-budget='):
+                max_rss = int(float(option[len('--memory-budget='):]) * 2 ** 20)
+                if max_rss <= 0:
+                    raise ValueError
+            elif option.startswith('--max-states='):
+                max_states = int(option[len('--max-states='):])
+                if max_states <= 0:
+                    raise ValueError
+            elif option == '--memory-fallback':
+                on_exceeded = FALLBACK
+            elif option.startswith('--workers='):
+                n_workers = int(option[len('--workers='):])
+                if n_workers < 1:
+                    raise ValueError
+            elif option == '--anytime':
+                anytime_deadline = game_env.a_star_time_max_tgt
+            elif option.startswith('--anytime='):
+                anytime_deadline = float(option[len('--anytime='):])
+                if anytime_deadline < 0:
+                    raise ValueError
+            elif option == '--prune-dead':
+                prune_dead = True
+            elif option == '--compress':
+                compress = True
+            elif option == '--hpa':
+                cluster_size = DEFAULT_CLUSTER_SIZE
+            elif option.startswith('--hpa='):
+                cluster_size = int(option[len('--hpa='):])
+                if cluster_size < 1:
+                    raise ValueError
+            elif option == '--bidirectional':
+                bidirectional = True
+            elif option == '--keypoints':
+                keypoints = True
+            else:
+                raise ValueError
+        except ValueError:
+            print(f"/!\\ ERROR: Invalid option given: {option}")
             print_usage()
             return
-    else:
-        visualise = False
-
-    # For small environments, take average time over multiple trials
-    if game_env.ucs_time_min_tgt < 0.01:
-        trials = 50
-    elif game_env.ucs_time_min_tgt < 0.1:
-        trials = 5
-    else:
-        trials = 1
 
     # Run search
     actions = None
-    t0 = time.time()
-    for _ in range(trials):
-        solver = Solver(game_env)
-        if search_type == 'ucs':
-            actions = solver.search_ucs()
+    memory_budget = None
+    if max_rss is not None or max_states is not None:
+        memory_budget = MemoryBudget(max_rss=max_rss, max_states=max_states, on_exceeded=on_exceeded)
+    try:
+        if timing:
+            actions, preprocess_times, search_times = time_search(
+                game_env, search_type, trials, warmup, disable_gc, memory_budget, n_workers, anytime_deadline,
+                prune_dead, compress, cluster_size, bidirectional, keypoints
+            )
+            # The first run also compiles the transition tables and loads (or builds) the pattern databases
+            cold_preprocess_time, cold_search_time = preprocess_times[0], search_times[0]
+            preprocess_times, search_times = preprocess_times[warmup:], search_times[warmup:]
+            total_times = [p + s for p, s in zip(preprocess_times, search_times)]
+            run_time = statistics.median(total_times) / 1e9
         else:
-            solver.preprocess_heuristic()
-            actions = solver.search_a_star()
-    run_time = (time.time() - t0) / trials
+            t0 = time.time()
+            for _ in range(trials):
+                solver = Solver(game_env)
+                solver.memory_budget = memory_budget
+                solver.n_workers = n_workers
+                solver.anytime_deadline = anytime_deadline
+                solver.prune_dead_states = prune_dead
+                solver.compress_corridors = compress
+                solver.hierarchical_cluster_size = cluster_size
+                solver.bidirectional = bidirectional
+                solver.keypoint_planning = keypoints
+                if anytime_deadline is not None:
+                    solver.on_anytime_solution = print_anytime_solution
+                if search_type == 'ucs':
+                    actions = solver.search_ucs()
+                else:
+                    solver.preprocess_heuristic()
+                    actions = solver.search_a_star()
+            run_time = (time.time() - t0) / trials
+    except MemoryBudgetExceeded as e:
+        print(f"/!\\ ERROR: Search aborted: {e.reason}")
+        print_search_stats(e.stats)
+        return
 
     # Evaluate solution
     control_env = ControlEnv(testcase_file)
@@ -110,6 +247,381 @@ def main(arglist):
         print("/!\\ ERROR: Level not completed after all actions performed.")
         return
 
+    if timing:
+        print(f"Timing over {trials} trial(s) after {warmup} warm-up run(s)"
+              f"{', garbage collection disabled' if disable_gc else ''} (seconds):")
+        print(f"{'':<12} {'min':>12} {'median':>12} {'p95':>12} {'mean':>12} {'stdev':>12}")
+        rows = [('search', search_times), ('total', total_times)]
+        if search_type == 'a_star':
+            rows.insert(0, ('preprocess', preprocess_times))
+        for name, samples in rows:
+            summary = summarise_times(samples)
+            print(f"{name:<12} " + " ".join(f"{summary[key]:>12.7f}" for key in
+                                             ('min', 'median', 'p95', 'mean', 'stdev')))
+        cold_times = [('search', cold_search_time), ('total', cold_preprocess_time + cold_search_time)]
+        if search_type == 'a_star':
+            cold_times.insert(0, ('preprocess', cold_preprocess_time))
+        print(f"First (cold) run{'' if warmup > 0 else ', included in the trials'}: "
+              + ", ".join(f"{name} {t / 1e9:.7f}" for name, t in cold_times))
+
+    if instrument:
+        print_instrumentation(search_type, testcase_file)
+
+    if cpu_prefix is not None or memory_prefix is not None:
+        run_profiled(search_type, testcase_file, cpu_prefix, memory_prefix)
+
+
+def print_search_stats(stats):
+    """
+    Print (possibly partial) search statistics, as returned by SearchEngine.get_stats.
+    """
+    for key, value in stats.items():
+        if value is None:
+            continue
+        if key == 'peak_rss':
+            print(f"    {key} = {round(value / 2 ** 20, 1)} MiB")
+        else:
+            print(f"    {key} = {value}")
+
+
+def print_anytime_solution(solution):
+    """
+    Report a plan found by the anytime search (see AnytimeSolution).
+    """
+    print(f"    [{solution.elapsed:8.3f}s] weight {round(solution.weight, 3)}: plan cost {solution.plan_cost}, optimal "
+          f"cost >= {solution.lower_bound} (within {round(solution.bound, 3)}x), {solution.nodes_expanded} expanded")
+
+
+def time_search(game_env, search_type, trials, warmup, disable_gc=False, memory_budget=None, n_workers=1,
+                anytime_deadline=None, prune_dead=False, compress=False, cluster_size=None, bidirectional=False,
+                keypoints=False):
+    """
+    Time repeated searches with perf_counter_ns, timing heuristic preprocessing (A* only) and search separately. A new
+    Solver is built for each of the warmup runs and the trials which follow them. The first run is cold: it also
+    compiles the transition tables and loads (or builds) the pattern databases.
+    :param disable_gc: if True, run garbage collection before each run and disable it while timing
+    :param memory_budget: MemoryBudget for each search, or None
+    :param n_workers: number of worker processes for A* (see Solver.n_workers)
+    :param anytime_deadline: deadline in seconds for anytime A*, or None (see Solver.anytime_deadline)
+    :param prune_dead: if True, prune dead successors (see Solver.prune_dead_states)
+    :param compress: if True, search the corridor-compressed graph (see Solver.compress_corridors)
+    :param cluster_size: cluster size for hierarchical pathfinding, or None (see Solver.hierarchical_cluster_size)
+    :param bidirectional: if True, search forwards and backwards at once (see Solver.bidirectional)
+    :param keypoints: if True, plan over the keypoint abstraction (see Solver.keypoint_planning)
+    :return: (actions from the last run, preprocess times, search times), with times as lists of nanoseconds for
+        every run (warmup + trials), warm-up runs first
+    """
+    actions = None
+    preprocess_times = []
+    search_times = []
+    for run in range(warmup + trials):
+        solver = Solver(game_env)
+        solver.memory_budget = memory_budget
+        solver.n_workers = n_workers
+        solver.anytime_deadline = anytime_deadline
+        solver.prune_dead_states = prune_dead
+        solver.compress_corridors = compress
+        solver.hierarchical_cluster_size = cluster_size
+        solver.bidirectional = bidirectional
+        solver.keypoint_planning = keypoints
+        if disable_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            t0 = time.perf_counter_ns()
+            if search_type == 'a_star':
+                solver.preprocess_heuristic()
+            t1 = time.perf_counter_ns()
+            if search_type == 'ucs':
+                actions = solver.search_ucs()
+            else:
+                actions = solver.search_a_star()
+            t2 = time.perf_counter_ns()
+        finally:
+            if disable_gc:
+                gc.enable()
+        preprocess_times.append(t1 - t0)
+        search_times.append(t2 - t1)
+    return actions, preprocess_times, search_times
+
+
+def summarise_times(samples_ns):
+    """
+    Summarise a list of times.
+    :param samples_ns: list of times in nanoseconds
+    :return: dict with keys min, median, p95 (nearest rank), mean and stdev (sample standard deviation, 0 for a
+        single sample), in seconds
+    """
+    ordered = sorted(samples_ns)
+    p95_index = max(0, -(-95 * len(ordered) // 100) - 1)
+    return {
+        'min': ordered[0] / 1e9,
+        'median': statistics.median(ordered) / 1e9,
+        'p95': ordered[p95_index] / 1e9,
+        'mean': statistics.fmean(ordered) / 1e9,
+        'stdev': statistics.stdev(ordered) / 1e9 if len(ordered) > 1 else 0.0,
+    }
+
+
+def run_profiled(search_type, testcase_file, cpu_prefix, memory_prefix):
+    """
+    Repeat the search under the requested profilers (see profiling.py), separately from the timed trials, and print
+    the paths of the reports written. For A*, heuristic preprocessing is not profiled. If both CPU and memory
+    profiling are requested, the search is run once for each, since tracemalloc distorts CPU time.
+    """
+    if cpu_prefix is not None and memory_prefix is not None:
+        profilers = [Profiler(cpu_prefix=cpu_prefix), Profiler(memory_prefix=memory_prefix)]
+    else:
+        profilers = [Profiler(cpu_prefix=cpu_prefix, memory_prefix=memory_prefix)]
+    for profiler in profilers:
+        # Fresh environment and solver, so each run starts with empty caches
+        solver = Solver(GameEnv(testcase_file))
+        if search_type == 'ucs':
+            profiler.run(solver.search_ucs)
+        else:
+            solver.preprocess_heuristic()
+            profiler.run(solver.search_a_star)
+        if profiler.peak_memory is not None:
+            print(f"Peak traced memory = {round(profiler.peak_memory / 2 ** 20, 1)} MiB")
+        for path in profiler.output_files:
+            print(f"Profile written to {path}")
+
+
+def print_instrumentation(search_type, testcase_file):
+    """
+    Repeat the search once on an instrumented environment (see GameEnv.enable_instrumentation), separately from the
+    timed trials so that counting does not affect the reported runtime, and print the counters.
+    """
+    game_env = GameEnv(testcase_file)
+    game_env.enable_instrumentation()
+    solver = Solver(game_env)
+    if search_type == 'ucs':
+        solver.search_ucs()
+    else:
+        solver.preprocess_heuristic()
+        game_env.reset_instrumentation_counters()
+        solver.search_a_star()
+    counters = game_env.get_instrumentation_counters()
+
+    print(f"Nodes expanded = {getattr(solver, 'nodes_expanded', '-')} "
+          f"(targets {game_env.nodes_min_tgt:g} - {game_env.nodes_max_tgt:g}); "
+          f"States expanded = {counters['states_expanded']}; States generated = {counters['states_generated']}")
+    # The compiled transition table resolves most moves without calling check_valid_action or check_collision
+    print(f"Compiled table lookups = {counters['table_lookups']}; "
+          f"check_valid_action calls = {counters['check_valid_action']}; "
+          f"check_collision calls = {counters['check_collision']}")
+    # Performed counts both perform_action calls and evaluations during successor generation
+    print(f"{'action':<8} {'performed':>10} {'succeeded':>10} {'invalid':>10} {'collision':>10}")
+    for action in game_env.ACTION_LIST:
+        performed = counters['perform_action'][action] + counters['successor_evaluations'][action]
+        print(f"{action:<8} {performed:>10} {counters['succeeded'][action]:>10} {counters['invalid'][action]:>10} "
+              f"{counters['collision'][action]:>10}")
+
+
+def get_num_trials(game_env):
+    """
+    Get the number of trials to average the run time over (more trials for small environments).
+    """
+    if game_env.ucs_time_min_tgt < 0.01:
+        return 50
+    elif game_env.ucs_time_min_tgt < 0.1:
+        return 5
+    return 1
+
+
+def score_against_targets(value, min_tgt, max_tgt):
+    """
+    Score a value linearly between its targets (for cost, nodes and run time, lower values are better).
+    :param value: measured value, or None if no value was measured
+    :param min_tgt: value achieving the minimum score (0)
+    :param max_tgt: value achieving the maximum score (1)
+    :return: score in [0, 1]
+    """
+    if value is None:
+        return 0.0
+    if min_tgt == max_tgt:
+        return 1.0 if value <= max_tgt else 0.0
+    return min(max((min_tgt - value) / (min_tgt - max_tgt), 0.0), 1.0)
+
+
+def evaluate_job(search_type, testcase_file, max_rss=None, max_states=None, on_exceeded=ABORT):
+    """
+    Run one search on one testcase (timed as in single testcase mode), and check the resulting plan.
+    :param max_rss, max_states, on_exceeded: memory limits for the search, and what to do when they are exceeded
+        (see MemoryBudget)
+    :return: dict of results
+    """
+    game_env = GameEnv(testcase_file)
+    trials = get_num_trials(game_env)
+    memory_budget = None
+    if max_rss is not None or max_states is not None:
+        memory_budget = MemoryBudget(max_rss=max_rss, max_states=max_states, on_exceeded=on_exceeded)
+    actions = None
+    solver = None
+    t0 = time.time()
+    try:
+        for _ in range(trials):
+            solver = Solver(game_env)
+            solver.memory_budget = memory_budget
+            if search_type == 'ucs':
+                actions = solver.search_ucs()
+            else:
+                solver.preprocess_heuristic()
+                actions = solver.search_a_star()
+    except MemoryBudgetExceeded as e:
+        return {'cost': None, 'run_time': None, 'nodes_expanded': e.stats['nodes_expanded'],
+                'error': f"Aborted: {e.reason}"}
+    run_time = (time.time() - t0) / trials
+
+    control_env = ControlEnv(testcase_file)
+    persistent_state = control_env.get_init_state()
+    total_cost = 0.0
+    error = None
+    for i, a in enumerate(actions if actions is not None else []):
+        if a not in control_env.ACTIONS:
+            error = "Unrecognised action performed at step " + str(i)
+            break
+        total_cost += control_env.ACTION_COST[a]
+        success, persistent_state = control_env.perform_action(persistent_state, a)
+        if not success:
+            error = "Action resulting in Collision performed at step " + str(i)
+            break
+    if error is None and not control_env.is_solved(persistent_state):
+        error = "Level not completed after all actions performed"
+    return {
+        'cost': round(total_cost, 1) if error is None else None,
+        'run_time': run_time,
+        'nodes_expanded': getattr(solver, 'nodes_expanded', None),
+        'error': error,
+    }
+
+
+def _batch_worker(search_type, testcase_file, conn, memory_limits):
+    try:
+        result = evaluate_job(search_type, testcase_file, *memory_limits)
+    except Exception as e:
+        result = {'cost': None, 'run_time': None, 'nodes_expanded': None, 'error': f"{type(e).__name__}: {e}"}
+    conn.send(result)
+    conn.close()
+
+
+def run_batch(jobs, n_workers, timeout, memory_limits=()):
+    """
+    Run jobs in parallel, each in its own worker process (so memory is not shared between jobs, and is released
+    when each job finishes). A job which runs for longer than the timeout is terminated.
+    :param jobs: list of (search_type, testcase_file) pairs, started in order
+    :param n_workers: maximum number of jobs to run at once
+    :param timeout: time limit per job (in seconds)
+    :param memory_limits: (max_rss, max_states, on_exceeded) arguments for evaluate_job, or () for no limits
+    :return: dict mapping job to dict of results
+    """
+    pending = list(jobs)
+    running = {}
+    results = {}
+    while pending or running:
+        while pending and len(running) < n_workers:
+            job = pending.pop(0)
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_batch_worker, args=(job[0], job[1], send_conn, memory_limits), daemon=True
+            )
+            process.start()
+            send_conn.close()
+            running[recv_conn] = (job, process, time.time())
+
+        for conn in multiprocessing.connection.wait(list(running), timeout=0.1):
+            job, process, _ = running.pop(conn)
+            try:
+                results[job] = conn.recv()
+            except EOFError:
+                process.join()
+                results[job] = {'cost': None, 'run_time': None, 'nodes_expanded': None,
+                                'error': f"Worker exited with code {process.exitcode}"}
+            conn.close()
+            process.join()
+
+        now = time.time()
+        for conn, (job, process, start_time) in list(running.items()):
+            if now - start_time > timeout:
+                process.terminate()
+                process.join()
+                conn.close()
+                del running[conn]
+                results[job] = {'cost': None, 'run_time': None, 'nodes_expanded': None,
+                                'error': f"Timed out after {timeout} seconds"}
+    return results
+
+
+def print_batch_table(jobs, results):
+    """
+    Print the results of a batch run, scored against the targets in each testcase file.
+    """
+    print(f"{'testcase':<16} {'search':<7} {'cost':>8} {'score':>6} {'time (s)':>11} {'score':>6} "
+          f"{'nodes':>9} {'score':>6}  status")
+    total_score = 0.0
+    n_scores = 0
+    for search_type, testcase_file in jobs:
+        result = results[(search_type, testcase_file)]
+        game_env = GameEnv(testcase_file)
+        cost_score = score_against_targets(result['cost'], game_env.cost_min_tgt, game_env.cost_max_tgt)
+        if search_type == 'ucs':
+            time_score = score_against_targets(result['run_time'], game_env.ucs_time_min_tgt,
+                                               game_env.ucs_time_max_tgt)
+        else:
+            time_score = score_against_targets(result['run_time'], game_env.a_star_time_min_tgt,
+                                               game_env.a_star_time_max_tgt)
+        scores = [cost_score, time_score]
+        # Nodes expanded targets are used for A* heuristic evaluation only
+        nodes_score = None
+        if search_type == 'a_star':
+            nodes_score = score_against_targets(result['nodes_expanded'], game_env.nodes_min_tgt,
+                                                game_env.nodes_max_tgt)
+            scores.append(nodes_score)
+        if result['error'] is not None:
+            scores = [0.0 for _ in scores]
+            cost_score = time_score = 0.0
+            nodes_score = None if nodes_score is None else 0.0
+        total_score += sum(scores)
+        n_scores += len(scores)
+
+        cost = "-" if result['cost'] is None else f"{result['cost']:.1f}"
+        run_time = "-" if result['run_time'] is None else f"{result['run_time']:.6f}"
+        nodes = "-" if result['nodes_expanded'] is None else str(result['nodes_expanded'])
+        nodes_score = "-" if nodes_score is None else f"{nodes_score:.2f}"
+        status = "ok" if result['error'] is None else result['error']
+        print(f"{os.path.basename(testcase_file):<16} {search_type:<7} {cost:>8} {cost_score:>6.2f} {run_time:>11} "
+              f"{time_score:>6.2f} {nodes:>9} {nodes_score:>6}  {status}")
+    if n_scores > 0:
+        print(f"Mean score: {total_score / n_scores:.3f} ({n_scores} scored metrics)")
+
+
+def batch_main(arglist):
+    parser = argparse.ArgumentParser(prog="python tester.py --batch",
+                                     description="Run every testcase with each search type in parallel.")
+    parser.add_argument("testcase_dir", nargs="?", default="testcases", help="directory of testcase files")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--timeout", type=float, default=BATCH_TIMEOUT, help="time limit per job in seconds")
+    parser.add_argument("--search", choices=["ucs", "a_star", "both"], default="both", help="search types to run")
+    parser.add_argument("--memory-budget", type=float, help="RSS limit per job in MiB (search aborts cleanly)")
+    parser.add_argument("--max-states", type=int, help="limit on states held per search (search aborts cleanly)")
+    parser.add_argument("--memory-fallback", action="store_true",
+                        help="switch to memory-bounded IDA* instead of aborting when a memory limit is exceeded")
+    args = parser.parse_args(arglist)
+
+    testcase_files = sorted(glob.glob(os.path.join(args.testcase_dir, "*.txt")))
+    if not testcase_files:
+        print(f"/!\\ ERROR: No testcase files found in {args.testcase_dir}")
+        return
+    search_types = ['ucs', 'a_star'] if args.search == "both" else [args.search]
+    jobs = [(search_type, f) for f in testcase_files for search_type in search_types]
+
+    # Start the slowest jobs (by their UCS time target) first, so the run takes about as long as the slowest job
+    slowest_first = sorted(jobs, key=lambda job: -GameEnv(job[1]).ucs_time_min_tgt)
+    max_rss = int(args.memory_budget * 2 ** 20) if args.memory_budget is not None else None
+    memory_limits = (max_rss, args.max_states, FALLBACK if args.memory_fallback else ABORT)
+    results = run_batch(slowest_first, max(args.jobs, 1), args.timeout, memory_limits)
+    print_batch_table(jobs, results)
+
 
 if __name__ == '__main__':
     main(sys.argv[1:])
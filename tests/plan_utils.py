@@ -0,0 +1,42 @@
+import os
+
+from control.game_env import GameEnv as ControlEnv
+
+"""
+plan_utils.py
+
+Helpers shared by the tests: testcase paths and plan checking against the unmodified GameEnv (control/game_env.py).
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+TESTCASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "testcases")
+
+
+def level_file(level):
+    """
+    Get the path of a testcase file.
+    :param level: level number (1-6)
+    :return: path (str)
+    """
+    return os.path.join(TESTCASE_DIR, f"level_{level}.txt")
+
+
+def plan_cost(filename, actions):
+    """
+    Replay a plan on the unmodified GameEnv.
+    :param filename: testcase file
+    :param actions: list of actions (elements of GameEnv.ACTIONS)
+    :return: total cost rounded to 0.1, or None if an action fails or the level is not solved at the end
+    """
+    control_env = ControlEnv(filename)
+    state = control_env.get_init_state()
+    total_cost = 0.0
+    for action in actions:
+        success, state = control_env.perform_action(state, action)
+        if not success:
+            return None
+        total_cost += control_env.ACTION_COST[action]
+    if not control_env.is_solved(state):
+        return None
+    return round(total_cost, 1)
@@ -0,0 +1,28 @@
+import pytest
+
+from control.game_env import GameEnv as ControlEnv
+from plan_utils import level_file, plan_cost
+from solution import Solver
+from transition_model import TransitionModel, get_transition_model
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("search_type", ["ucs", "a_star"])
+def test_solver_runs_on_unmodified_env(level, search_type):
+    control_env = ControlEnv(level_file(level))
+    solver = Solver(control_env)
+    if search_type == "ucs":
+        actions = solver.search_ucs()
+    else:
+        solver.preprocess_heuristic()
+        actions = solver.search_a_star()
+    # cost_max_tgt is the optimal plan cost
+    assert plan_cost(level_file(level), actions) == control_env.cost_max_tgt
+
+
+def test_transition_model_is_built_once_per_env():
+    control_env = ControlEnv(level_file(2))
+    model = get_transition_model(control_env)
+    assert isinstance(model, TransitionModel)
+    assert get_transition_model(control_env) is model
+    assert get_transition_model(model) is model
@@ -0,0 +1,89 @@
+from collections import deque
+
+import pytest
+
+from control.game_env import GameEnv as ControlEnv
+from dead_states import DeadStateDetector
+from game_env import GameEnv
+from plan_utils import level_file, plan_cost
+from solution import Solver
+
+
+def get_live_ids(env):
+    """
+    Get every state ID from which the solved state can be reached, by a backward search from it.
+    """
+    goal_id = env.get_solved_state_id()
+    live = {goal_id}
+    queue = deque([goal_id])
+    while queue:
+        state_id = queue.popleft()
+        for _, prev_id in env.get_predecessor_ids(state_id):
+            if prev_id not in live:
+                live.add(prev_id)
+                queue.append(prev_id)
+    return live
+
+
+def get_reachable_ids(env):
+    init_id = env.encode_state(env.get_init_state())
+    reachable = {init_id}
+    queue = deque([init_id])
+    while queue:
+        for _, next_id in env.get_successor_ids(queue.popleft()):
+            if next_id not in reachable:
+                reachable.add(next_id)
+                queue.append(next_id)
+    return reachable
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4])
+def test_live_states_are_never_dead(level):
+    env = GameEnv(level_file(level))
+    detector = DeadStateDetector(env)
+    live = get_live_ids(env)
+    assert not any(detector.is_dead_id(state_id) for state_id in live)
+    reachable_dead = [state_id for state_id in get_reachable_ids(env) if state_id not in live]
+    if level == 3:
+        # Every reachable dead state on level 3 depends on a single trap
+        assert reachable_dead and all(detector.is_dead_id(state_id) for state_id in reachable_dead)
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4])
+def test_pruned_transitions_drop_only_dead_successors(level):
+    env = GameEnv(level_file(level))
+    detector = DeadStateDetector(env)
+    pruned_env = detector.prune_transitions()
+    for state_id in get_reachable_ids(env):
+        expected = [successor for successor in env.get_successor_ids(state_id) if not detector.is_dead_id(successor[1])]
+        assert sorted(pruned_env.get_successor_ids(state_id)) == sorted(expected)
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+def test_pruned_search_is_optimal(level):
+    env = GameEnv(level_file(level))
+    solver = Solver(env)
+    solver.prune_dead_states = True
+    path = solver.search_a_star() if level >= 5 else solver.search_ucs()
+    assert plan_cost(level_file(level), path) == env.cost_max_tgt
+
+
+def test_pruning_reduces_expansions():
+    env = GameEnv(level_file(3))
+    solver = Solver(env)
+    solver.search_ucs()
+    nodes_expanded = solver.nodes_expanded
+    solver.prune_dead_states = True
+    solver.search_ucs()
+    assert solver.nodes_expanded < nodes_expanded
+
+
+def test_pruning_with_the_unmodified_env():
+    env = ControlEnv(level_file(3))
+    solver = Solver(env)
+    solver.prune_dead_states = True
+    path = solver.search_ucs()
+    assert plan_cost(level_file(3), path) == env.cost_max_tgt
+    unpruned_solver = Solver(ControlEnv(level_file(3)))
+    unpruned_solver.search_ucs()
+    assert solver.nodes_expanded < unpruned_solver.nodes_expanded
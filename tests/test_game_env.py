@@ -0,0 +1,138 @@
+import copy
+import pickle
+import random
+from collections import deque
+
+import pytest
+
+from game_env import GameEnv
+from game_state import CompactState, GameState
+from plan_utils import level_file
+
+# Number of reachable states checked per level
+MAX_STATES = 20000
+
+
+def reachable_states(game_env, max_states):
+    """
+    Breadth-first search from the initial state with the reference rules.
+    :return: list of GameState
+    """
+    init_state = game_env.get_init_state()
+    seen = {init_state}
+    queue = deque([init_state])
+    states = []
+    while queue and len(states) < max_states:
+        state = queue.popleft()
+        states.append(state)
+        for action in game_env.ACTIONS:
+            success, next_state = game_env.perform_action(state, action)
+            if success and next_state not in seen:
+                seen.add(next_state)
+                queue.append(next_state)
+    return states
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+def test_compiled_actions_match_reference_rules(level):
+    reference_env = GameEnv(level_file(level))
+    compiled_env = GameEnv(level_file(level), compiled=True)
+    for state in reachable_states(reference_env, MAX_STATES):
+        for action in reference_env.ACTIONS:
+            assert compiled_env.perform_action(state, action) == reference_env.perform_action(state, action), \
+                (state, action)
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+def test_state_ids_round_trip(level):
+    game_env = GameEnv(level_file(level))
+    n_ids = game_env.get_num_state_ids()
+    state_ids = [0, n_ids - 1, game_env.get_solved_state_id()]
+    state_ids += random.Random(level).sample(range(n_ids), min(n_ids, 1000))
+    for state_id in state_ids:
+        state = game_env.decode_state(state_id)
+        assert isinstance(state, GameState)
+        assert game_env.encode_state(state) == state_id
+        compact_state = game_env.decode_compact_state(state_id)
+        assert isinstance(compact_state, CompactState)
+        assert game_env.encode_state(compact_state) == state_id
+        assert game_env.to_compact(state) == compact_state
+        assert game_env.from_compact(compact_state) == state
+    init_state = game_env.get_init_state()
+    assert game_env.decode_state(game_env.encode_state(init_state)) == init_state
+
+
+def test_compact_state_is_immutable():
+    state = CompactState(2, 3, 0b101)
+    with pytest.raises(AttributeError):
+        state.row = 4
+    with pytest.raises(AttributeError):
+        state.trap_bits ^= 1
+    with pytest.raises(AttributeError):
+        del state.col
+    with pytest.raises(AttributeError):
+        state.extra = 1
+    assert (state.row, state.col, state.trap_bits) == (2, 3, 0b101)
+    for state_copy in (copy.copy(state), copy.deepcopy(state), pickle.loads(pickle.dumps(state))):
+        assert state_copy == state and hash(state_copy) == hash(state)
+
+
+def test_instrumentation_counts_table_lookups():
+    reference_env = GameEnv(level_file(3))
+    compiled_env = GameEnv(level_file(3), compiled=True)
+    for game_env in (reference_env, compiled_env):
+        game_env.enable_instrumentation()
+        state = game_env.get_init_state()
+        for action in game_env.ACTIONS:
+            game_env.perform_action(state, action)
+    reference_counters = reference_env.get_instrumentation_counters()
+    compiled_counters = compiled_env.get_instrumentation_counters()
+    assert reference_counters["table_lookups"] == 0
+    assert reference_counters["check_valid_action"] > 0
+    assert compiled_counters["table_lookups"] == len(compiled_env.ACTIONS)
+    assert compiled_counters["check_valid_action"] == compiled_counters["check_collision"] == 0
+
+    # Every action from an expanded state is resolved by the table on this level
+    compiled_env.reset_instrumentation_counters()
+    compiled_env.get_successor_ids(compiled_env.encode_state(state))
+    compiled_env.get_successors(state)
+    compiled_env.get_successors(state)
+    counters = compiled_env.get_instrumentation_counters()
+    assert counters["states_expanded"] == 3
+    assert counters["table_lookups"] == 2 * len(compiled_env.ACTIONS)
+
+
+@pytest.mark.parametrize("level", [3, 5])
+def test_batched_successors_match_single_state_calls(level):
+    game_env = GameEnv(level_file(level))
+    state_ids = game_env.get_reachable_ids(MAX_STATES)
+    assert len(state_ids) == len(set(state_ids))
+    if level == 3:
+        # Small enough to compare every reachable state with the reference rules
+        reference_states = reachable_states(GameEnv(level_file(level)), MAX_STATES)
+        assert len(reference_states) < MAX_STATES
+        assert set(state_ids) == {game_env.encode_state(state) for state in reference_states}
+    expected = [(position, action_index, next_id) for position, state_id in enumerate(state_ids)
+                for action_index, next_id in game_env.get_successor_ids(state_id)]
+    assert list(zip(*game_env.get_successor_ids_batch(state_ids))) == expected
+    assert game_env.get_successor_ids_batch([]) == ([], [], [])
+
+
+def test_successors_match_reference_rules_and_cache_state_ids():
+    reference_env = GameEnv(level_file(3))
+    game_env = GameEnv(level_file(3))
+    for state in reachable_states(reference_env, MAX_STATES):
+        expected = []
+        for action in game_env.ACTION_LIST:
+            success, next_state = reference_env.perform_action(state, action)
+            if success:
+                expected.append((action, next_state, game_env.ACTION_COST[action]))
+        for _ in range(2):
+            assert list(game_env.get_successors(state)) == expected
+            compact_state = game_env.to_compact(state)
+            assert [(action, game_env.from_compact(next_state), cost)
+                    for action, next_state, cost in game_env.get_successors(compact_state)] == expected
+    assert game_env.get_successor_cache_info()["hits"] > 0
+    for state_id, successor_ids in game_env._successor_cache.values():
+        assert isinstance(state_id, int)
+        assert all(isinstance(next_id, int) for _, next_id in successor_ids)
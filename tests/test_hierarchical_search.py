@@ -0,0 +1,73 @@
+import pytest
+
+from game_env import GameEnv
+from game_state import GameState
+from hierarchical_search import HierarchicalSearch, get_hierarchy
+from plan_utils import level_file, plan_cost
+from search_engine import SearchEngine
+from solution import Solver
+
+
+def write_building(path, floors, width):
+    """
+    Write a level without traps: floors of open rooms joined by ladders, with the exit in the bottom right corner.
+    :return: path of the level file
+    """
+    rows = ["X" * width]
+    for floor in range(floors):
+        rows.append("X" + " " * (width - 2) + "X")
+        tiles = ["X"] * width
+        if floor < floors - 1:
+            for col in range(3 + (floor % 2) * 5, width - 1, 10):
+                tiles[col] = "="
+        rows.append("".join(tiles))
+    rows[1] = "XP" + rows[1][2:]
+    rows[-2] = rows[-2][:-2] + "GX"
+    with open(path, "w") as f:
+        f.write(f"# num rows, num cols\n{len(rows)}, {width}\n")
+        f.write("# targets\n1, 1\n1, 1\n1, 1\n1, 1\n# grid data\n")
+        f.write("\n".join(rows) + "\n# Schematic\n\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("level", [3, 4, 5])
+def test_refined_plans_are_optimal(level):
+    game_env = GameEnv(level_file(level))
+    hierarchy = HierarchicalSearch(game_env)
+    solver = Solver(game_env)
+    solver.preprocess_heuristic()
+    path = hierarchy.search(heuristic=solver.heuristic.compute_scaled)
+    assert plan_cost(level_file(level), path) == game_env.cost_max_tgt
+    assert hierarchy.refined_edges > 0
+
+
+def test_abstraction_is_kept_per_level():
+    game_env = GameEnv(level_file(4))
+    first = Solver(game_env)
+    first.hierarchical_cluster_size = 8
+    first.search_ucs()
+    second = Solver(game_env)
+    second.hierarchical_cluster_size = 8
+    second.search_ucs()
+    assert second.hierarchy is first.hierarchy is get_hierarchy(game_env, 8)
+    assert second.hierarchy.cache_misses == 1
+    assert get_hierarchy(game_env, 4) is not first.hierarchy
+
+
+def test_query_work_follows_path_length(tmp_path):
+    expanded = []
+    # Both sizes keep the cluster borders and ladders at the same offsets from the exit
+    for floors, width in [(12, 120), (20, 200)]:
+        game_env = GameEnv(write_building(tmp_path / f"building_{width}.txt", floors, width))
+        hierarchy = get_hierarchy(game_env)
+        for distance in [10, 40]:
+            init_state = GameState(game_env.goal_row, game_env.goal_col - distance, ())
+            path = hierarchy.search(init_state=init_state)
+            engine = SearchEngine(game_env)
+            engine.search(init_state=init_state)
+            assert hierarchy.plan_cost == engine.plan_cost
+            assert len(path) == distance // 2
+            expanded.append(hierarchy.nodes_expanded)
+    # The same queries on a map three times larger expand the same abstract states
+    assert expanded[:2] == expanded[2:]
+    assert expanded[0] < expanded[1]
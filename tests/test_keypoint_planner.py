@@ -0,0 +1,25 @@
+import pytest
+
+from game_env import GameEnv
+from keypoint_planner import KeypointPlanner
+from plan_utils import level_file, plan_cost
+from solution import Solver
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+def test_keypoint_plans_match_a_star(level):
+    game_env = GameEnv(level_file(level))
+    solver = Solver(game_env)
+    a_star_cost = plan_cost(level_file(level), solver.search_a_star())
+
+    planner = KeypointPlanner(game_env)
+    actions = planner.search(heuristic=solver.heuristic.compute_scaled)
+    assert plan_cost(level_file(level), actions) == a_star_cost
+    assert planner.plan_cost == a_star_cost
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4])
+def test_keypoint_plans_without_heuristic_match_a_star(level):
+    game_env = GameEnv(level_file(level))
+    a_star_cost = plan_cost(level_file(level), Solver(game_env).search_a_star())
+    assert plan_cost(level_file(level), KeypointPlanner(game_env).search()) == a_star_cost
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from game_env import GameEnv
+from lever_analysis import LeverDependencyGraph
+from plan_utils import level_file, plan_cost
+from solution import Solver
+
+
+@pytest.mark.parametrize("level", [3, 5, 6])
+def test_dead_check_matches_heuristic(level):
+    game_env = GameEnv(level_file(level))
+    dependencies = LeverDependencyGraph(game_env)
+    n_ids = game_env.get_num_state_ids()
+    for state_id in random.Random(level).sample(range(n_ids), min(n_ids, 5000)):
+        assert dependencies.is_dead_id(state_id) == (dependencies.compute_scaled(state_id) is None), state_id
+        for j, i in dependencies.get_dependencies(state_id):
+            assert not (state_id // dependencies.n_cells >> j) & 1 and not (state_id // dependencies.n_cells >> i) & 1
+
+
+def test_pruned_ucs_is_optimal_and_expands_fewer_states():
+    game_env = GameEnv(level_file(3))
+    solver = Solver(game_env)
+    solver.search_ucs()
+    baseline_expanded = solver.nodes_expanded
+    solver.prune_lever_dependencies = True
+    path = solver.search_ucs()
+    assert plan_cost(level_file(3), path) == game_env.cost_max_tgt
+    assert solver.search_stats["nodes_pruned"] > 0
+    assert solver.nodes_expanded < baseline_expanded
@@ -0,0 +1,68 @@
+import pytest
+
+from game_env import GameEnv
+from memory_bounded_search import IDAStarSearch
+from memory_budget import FALLBACK, MemoryBudget, MemoryBudgetExceeded
+from move_pruning import MovePruning
+from plan_utils import level_file, plan_cost
+from search_engine import SearchEngine
+from solution import Solver
+
+
+@pytest.mark.parametrize("level", [1, 2, 3])
+def test_uninformed_search_is_optimal_in_few_iterations(level):
+    env = GameEnv(level_file(level))
+    ida_star = IDAStarSearch(env)
+    path = ida_star.search()
+    assert plan_cost(level_file(level), path) == env.cost_max_tgt
+    # Raising the threshold to the smallest f cut off would take one iteration per 0.1 of plan cost
+    assert ida_star.iterations <= 30
+
+
+@pytest.mark.parametrize("capacity", [10, 50])
+def test_small_table_keeps_plans_optimal(capacity):
+    env = GameEnv(level_file(2))
+    ida_star = IDAStarSearch(env, table_capacity=capacity)
+    path = ida_star.search()
+    assert plan_cost(level_file(2), path) == env.cost_max_tgt
+    assert len(ida_star.table) <= capacity
+    assert ida_star.table.evictions > 0
+
+
+def test_continuing_from_explored_states_is_optimal_and_cheaper():
+    env = GameEnv(level_file(3))
+    engine = SearchEngine(env)
+    with pytest.raises(MemoryBudgetExceeded):
+        engine.search(memory_budget=MemoryBudget(max_states=400))
+    continued = IDAStarSearch(env, table_capacity=400)
+    path = continued.search(explored=engine.store)
+    assert plan_cost(level_file(3), path) == env.cost_max_tgt
+    restarted = IDAStarSearch(env, table_capacity=400)
+    restarted.search()
+    assert 10 * continued.nodes_expanded < restarted.nodes_expanded
+
+
+@pytest.mark.parametrize("level", [2, 3])
+def test_move_pruning_reduces_expansions(level):
+    env = GameEnv(level_file(level))
+    unpruned = IDAStarSearch(env)
+    unpruned.search()
+    pruned = IDAStarSearch(env)
+    path = pruned.search(move_pruning=MovePruning(env))
+    assert plan_cost(level_file(level), path) == env.cost_max_tgt
+    assert pruned.nodes_pruned > 0
+    assert pruned.nodes_expanded < unpruned.nodes_expanded
+
+
+@pytest.mark.parametrize("search", ["search_ucs", "search_a_star"])
+def test_fallback_is_optimal(search):
+    env = GameEnv(level_file(4))
+    solver = Solver(env)
+    solver.memory_budget = MemoryBudget(max_states=50, on_exceeded=FALLBACK)
+    path = getattr(solver, search)()
+    assert plan_cost(level_file(4), path) == env.cost_max_tgt
+    assert "fallback_reason" in solver.search_stats
+    # The A* heuristic is close to exact on level 4, so the fallback costs about as much as A* itself
+    engine = SearchEngine(env)
+    engine.search(heuristic=solver.heuristic.compute_scaled)
+    assert solver.nodes_expanded <= 2 * engine.nodes_expanded
@@ -0,0 +1,26 @@
+import pytest
+
+from game_env import GameEnv
+from memory_budget import MemoryBudget, MemoryBudgetExceeded
+from plan_utils import level_file
+from search_engine import SearchEngine
+
+
+@pytest.mark.parametrize("level", [4, 5])
+@pytest.mark.parametrize("max_states", [50, 200, 1000])
+def test_state_limit_is_checked_on_every_insertion(level, max_states):
+    engine = SearchEngine(GameEnv(level_file(level)))
+    with pytest.raises(MemoryBudgetExceeded) as exc_info:
+        engine.search(memory_budget=MemoryBudget(max_states=max_states))
+    stats = exc_info.value.stats
+    # One insertion adds an open list entry and (at most) one stored state
+    assert max_states < stats["frontier_size"] + stats["stored_states"] <= max_states + 2
+
+
+def test_peaks_are_recorded_for_short_searches():
+    engine = SearchEngine(GameEnv(level_file(2)))
+    budget = MemoryBudget()
+    assert engine.search(memory_budget=budget) is not None
+    stats = engine.get_stats()
+    assert budget.peak_stored_states == stats["stored_states"] > 0
+    assert budget.peak_frontier_size > 0
@@ -0,0 +1,63 @@
+import functools
+
+import pytest
+
+from anytime_search import AnytimeSearch
+from game_env import GameEnv
+from plan_utils import level_file, plan_cost
+from solution import Solver
+
+# Solver settings for each search mode
+MODES = {
+    "a_star": {},
+    "bidirectional": {"bidirectional": True},
+    "keypoint": {"keypoint_planning": True},
+    "compress": {"compress_corridors": True},
+    "lever_pruning": {"prune_lever_dependencies": True},
+    "hpa": {"hierarchical_cluster_size": 8},
+    "hda": {"n_workers": 2},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def ucs_cost(level):
+    """
+    Cost of the plan found by the baseline UCS (SearchEngine with no heuristic), computed once per level.
+    """
+    return plan_cost(level_file(level), Solver(GameEnv(level_file(level))).search_ucs())
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+def test_ucs_is_optimal(level):
+    # cost_max_tgt is the optimal plan cost
+    assert ucs_cost(level) == GameEnv(level_file(level)).cost_max_tgt
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+@pytest.mark.parametrize("mode", list(MODES))
+def test_a_star_modes_match_ucs(level, mode):
+    solver = Solver(GameEnv(level_file(level)))
+    for name, value in MODES[mode].items():
+        setattr(solver, name, value)
+    assert plan_cost(level_file(level), solver.search_a_star()) == ucs_cost(level)
+
+
+# Without a heuristic, the keypoint planner takes over a minute on level 6
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("mode", ["bidirectional", "keypoint", "compress", "lever_pruning", "hpa"])
+def test_ucs_modes_match_ucs(level, mode):
+    solver = Solver(GameEnv(level_file(level)))
+    for name, value in MODES[mode].items():
+        setattr(solver, name, value)
+    assert plan_cost(level_file(level), solver.search_ucs()) == ucs_cost(level)
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+def test_anytime_search_at_weight_one_matches_ucs(level):
+    game_env = GameEnv(level_file(level))
+    solver = Solver(game_env)
+    solver.preprocess_heuristic()
+    anytime_engine = AnytimeSearch(game_env, initial_weight=1)
+    path = anytime_engine.search(solver.heuristic.compute_scaled)
+    assert len(anytime_engine.solutions) == 1
+    assert plan_cost(level_file(level), path) == ucs_cost(level)
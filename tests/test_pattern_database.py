@@ -0,0 +1,83 @@
+import os
+
+import pattern_database
+from game_env import GameEnv
+from pattern_database import PatternDatabase
+from plan_utils import level_file
+
+PATTERN = (0, 1)
+
+
+def cache_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith(".pdb"))
+
+
+def test_cached_database_is_loaded_without_building(tmp_path, monkeypatch):
+    game_env = GameEnv(level_file(4))
+    built = PatternDatabase.load_or_build(game_env, PATTERN, str(tmp_path))
+    assert cache_files(tmp_path) == [PatternDatabase.get_cache_key(game_env, PATTERN) + ".pdb"]
+
+    def fail_build(self):
+        raise AssertionError("cached pattern database was rebuilt")
+
+    monkeypatch.setattr(PatternDatabase, "_build", fail_build)
+    loaded = PatternDatabase.load_or_build(GameEnv(level_file(4)), PATTERN, str(tmp_path))
+    assert loaded.values == built.values
+
+
+def test_cache_key_changes_with_layout_pattern_and_version(monkeypatch):
+    game_env = GameEnv(level_file(4))
+    key = PatternDatabase.get_cache_key(game_env, PATTERN)
+    assert PatternDatabase.get_cache_key(GameEnv(level_file(4)), PATTERN) == key
+    assert PatternDatabase.get_cache_key(game_env, (0, 2)) != key
+    assert PatternDatabase.get_cache_key(GameEnv(level_file(5)), PATTERN) != key
+
+    # Change one tile of the grid
+    changed_env = GameEnv(level_file(4))
+    row = changed_env.grid_data[changed_env.n_rows - 2]
+    row[1] = changed_env.SOLID_TILE if row[1] != changed_env.SOLID_TILE else changed_env.AIR_TILE
+    assert PatternDatabase.get_cache_key(changed_env, PATTERN) != key
+
+    monkeypatch.setattr(pattern_database, "CACHE_VERSION", pattern_database.CACHE_VERSION + 1)
+    assert PatternDatabase.get_cache_key(game_env, PATTERN) != key
+
+
+def test_truncated_cache_file_is_rebuilt(tmp_path):
+    game_env = GameEnv(level_file(4))
+    built = PatternDatabase.load_or_build(game_env, PATTERN, str(tmp_path))
+    path = os.path.join(tmp_path, cache_files(tmp_path)[0])
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) // 2)
+    rebuilt = PatternDatabase.load_or_build(game_env, PATTERN, str(tmp_path))
+    assert rebuilt.values == built.values
+    assert os.path.getsize(path) == len(built.values) * built.values.itemsize
+
+
+def test_default_cache_dir_is_outside_the_source_tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    assert pattern_database.get_default_cache_dir() == str(tmp_path / "home" / ".cache" / "cheese_hunter" / "pdb")
+    monkeypatch.setenv("XDG_CACHE_HOME", "cache")
+    assert pattern_database.get_default_cache_dir() == str(tmp_path / "cache" / "cheese_hunter" / "pdb")
+
+
+def test_unwritable_cache_dir_falls_back_to_building(tmp_path, monkeypatch):
+    game_env = GameEnv(level_file(4))
+    expected = PatternDatabase(game_env, PATTERN).values
+
+    # A cache directory which cannot be created
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    pdb = PatternDatabase.load_or_build(game_env, PATTERN, str(blocked / "cache"))
+    assert pdb.values == expected
+
+    # A cache directory whose files cannot be written
+    def deny(*args):
+        raise PermissionError("read-only directory")
+
+    monkeypatch.setattr(os, "replace", deny)
+    cache_dir = tmp_path / "cache"
+    pdb = PatternDatabase.load_or_build(game_env, PATTERN, str(cache_dir))
+    assert pdb.values == expected
+    assert os.listdir(cache_dir) == []
@@ -0,0 +1,61 @@
+import multiprocessing
+
+from game_env import GameEnv
+from plan_utils import level_file, plan_cost
+from portfolio import PortfolioSolver
+
+
+class RecordingContext:
+    """
+    Multiprocessing context which keeps every process it creates, so tests can check that they were joined.
+    """
+
+    def __init__(self):
+        self.context = multiprocessing.get_context()
+        self.processes = []
+
+    def Queue(self):
+        return self.context.Queue()
+
+    def Process(self, *args, **kwargs):
+        process = self.context.Process(*args, **kwargs)
+        self.processes.append(process)
+        return process
+
+
+def assert_workers_joined(context, portfolio):
+    assert len(context.processes) == len(portfolio.strategies)
+    for process in context.processes:
+        # exitcode is only set once the process has been waited for
+        assert not process.is_alive() and process.exitcode is not None
+
+
+def test_first_plan_is_valid_and_workers_are_joined():
+    context = RecordingContext()
+    portfolio = PortfolioSolver(GameEnv(level_file(4)), context=context)
+    path = portfolio.solve()
+    assert plan_cost(level_file(4), path) == portfolio.plan_cost
+    assert portfolio.results[portfolio.best_strategy]["status"] == "solved"
+    assert_workers_joined(context, portfolio)
+
+
+def test_plan_is_optimal_once_an_optimal_strategy_finishes():
+    context = RecordingContext()
+    game_env = GameEnv(level_file(4))
+    portfolio = PortfolioSolver(game_env, context=context)
+    plans = []
+    path = portfolio.solve(deadline=60, on_plan=lambda name, _, cost: plans.append((name, cost)))
+    assert plan_cost(level_file(4), path) == portfolio.plan_cost == game_env.cost_max_tgt
+    assert any(portfolio.results.get(name, {}).get("status") == "solved" for name in ("ucs", "a_star"))
+    # Each reported plan is cheaper than the last
+    assert [cost for _, cost in plans] == sorted({cost for _, cost in plans}, reverse=True)
+    assert_workers_joined(context, portfolio)
+
+
+def test_optimal_strategies_alone_return_an_optimal_plan():
+    context = RecordingContext()
+    game_env = GameEnv(level_file(3))
+    portfolio = PortfolioSolver(game_env, strategies=[("ucs", 0, False), ("a_star", 1, False)], context=context)
+    path = portfolio.solve()
+    assert plan_cost(level_file(3), path) == game_env.cost_max_tgt
+    assert_workers_joined(context, portfolio)
@@ -0,0 +1,44 @@
+from collections import deque
+
+import pytest
+
+from control.game_env import GameEnv as ControlEnv
+from game_env import GameEnv
+from plan_utils import level_file
+from transition_model import get_transition_model
+
+# Number of reachable states checked per level
+N_STATES = 5000
+
+
+def reachable_state_ids(game_env, n_states):
+    init_id = game_env.encode_state(game_env.get_init_state())
+    seen = {init_id}
+    queue = deque([init_id])
+    while queue and len(seen) < n_states:
+        state_id = queue.popleft()
+        for _, next_id in game_env.get_successor_ids(state_id):
+            if next_id not in seen:
+                seen.add(next_id)
+                queue.append(next_id)
+    return sorted(seen)
+
+
+@pytest.mark.parametrize("level", [1, 2, 3, 4, 5, 6])
+@pytest.mark.parametrize("env_class", [GameEnv, ControlEnv])
+def test_predecessors_match_successors(level, env_class):
+    game_env = get_transition_model(env_class(level_file(level)))
+    for state_id in reachable_state_ids(game_env, N_STATES):
+        # Every predecessor leads forward to the state
+        for action_index, prev_id in game_env.get_predecessor_ids(state_id):
+            assert (action_index, state_id) in game_env.get_successor_ids(prev_id)
+        # Every successor lists the state as a predecessor
+        for action_index, next_id in game_env.get_successor_ids(state_id):
+            assert (action_index, state_id) in game_env.get_predecessor_ids(next_id)
+
+
+def test_get_predecessors_inverts_get_successors():
+    game_env = GameEnv(level_file(3))
+    state = game_env.get_init_state()
+    for action, next_state, cost in game_env.get_successors(state):
+        assert (state, action, cost) in game_env.get_predecessors(next_state)
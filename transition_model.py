@@ -0,0 +1,444 @@
+from game_state import CompactState
+
+"""
+transition_model.py
+
+This file contains a compiled transition model for a GameEnv level, built using only the API of the unmodified
+GameEnv (ACTIONS, ACTION_COST, perform_action, the level layout and the targets). It provides the dense state IDs and
+ID-based successor and predecessor functions used by the search modules, so that the solver also works with the
+GameEnv used for evaluation.
+
+COMP3702 Assignment 1 "Cheese Hunter" Support Code, 2025
+"""
+
+
+def get_transition_model(game_env):
+    """
+    Get an object providing the compiled transition API (ACTION_LIST, encode_state, get_successor_ids, etc., see
+    TransitionModel) for a level. An environment which already provides this API (such as game_env.GameEnv, or a
+    TransitionModel) is returned unchanged. Otherwise a TransitionModel is built on first use and kept on the
+    environment, so it is only compiled once per environment.
+    :param game_env: GameEnv instance (modified or unmodified)
+    :return: TransitionModel or GameEnv
+    """
+    if hasattr(game_env, "get_successor_ids"):
+        return game_env
+    model = game_env.__dict__.get("_transition_model")
+    if model is None:
+        model = TransitionModel(game_env)
+        game_env._transition_model = model
+    return model
+
+
+class StateIdEncoding:
+    """
+    Fixed action ordering and dense state IDs for a level, shared by GameEnv and TransitionModel. Subclasses call
+    _init_encoding once the level layout is loaded.
+    """
+
+    def _init_encoding(self, game_env):
+        """
+        :param game_env: GameEnv instance (only its unmodified API is used)
+        """
+        # Fixed ordering of ACTIONS (sets have no stable iteration order between runs)
+        self.ACTION_LIST = (
+            game_env.WALK_LEFT,
+            game_env.WALK_RIGHT,
+            game_env.CLIMB,
+            game_env.DROP,
+            game_env.ACTIVATE,
+            game_env.JUMP,
+            game_env.SPRINT_LEFT,
+            game_env.SPRINT_RIGHT,
+        )
+        assert set(self.ACTION_LIST) == set(game_env.ACTIONS), "/!\\ ERROR: Unexpected GameEnv.ACTIONS"
+        # Change in (row, col) caused by each action, when successful
+        self.ACTION_DELTAS = {
+            game_env.WALK_LEFT: (0, -1),
+            game_env.WALK_RIGHT: (0, 1),
+            game_env.CLIMB: (-1, 0),
+            game_env.DROP: (1, 0),
+            game_env.ACTIVATE: (0, 0),
+            game_env.JUMP: (-1, 0),
+            game_env.SPRINT_LEFT: (0, -2),
+            game_env.SPRINT_RIGHT: (0, 2),
+        }
+
+        self.n_cols = game_env.n_cols
+        self.n_cells = game_env.n_rows * game_env.n_cols
+        self.n_traps = len(game_env.trap_positions)
+        self.goal_cell = game_env.goal_row * game_env.n_cols + game_env.goal_col
+        self.state_class = type(game_env.get_init_state())
+
+    # === State IDs ====================================================================================================
+    def get_num_state_ids(self):
+        """
+        Get the number of dense state IDs (see encode_state), i.e. n_rows * n_cols * 2^n_traps.
+        :return: number of state IDs
+        """
+        return self.n_cells << self.n_traps
+
+    def get_solved_state_id(self):
+        """
+        Get the state ID (see encode_state) of the solved state, i.e. the player at the exit with every lever activated.
+        :return: state ID (int)
+        """
+        return ((1 << self.n_traps) - 1) * self.n_cells + self.goal_cell
+
+    def encode_state(self, state):
+        """
+        Map a state to a dense integer ID in range(get_num_state_ids()). The ID is
+        trap_bits * (n_rows * n_cols) + row * n_cols + col, so all states sharing a trap configuration are contiguous.
+        :param state: GameState or CompactState
+        :return: state ID (int)
+        """
+        if isinstance(state, CompactState):
+            trap_bits = state.trap_bits
+        else:
+            trap_bits = 0
+            for i, status in enumerate(state.trap_status):
+                if status != 0:
+                    trap_bits |= 1 << i
+        return trap_bits * self.n_cells + state.row * self.n_cols + state.col
+
+    def decode_state(self, state_id):
+        """
+        Map a dense integer ID (see encode_state) back to a state.
+        :param state_id: state ID (int)
+        :return: state of the environment's GameState class
+        """
+        assert 0 <= state_id < self.get_num_state_ids(), "/!\\ ERROR: Invalid state ID given to decode_state()"
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        row, col = divmod(cell, self.n_cols)
+        return self.state_class(row, col, tuple((trap_bits >> i) & 1 for i in range(self.n_traps)))
+
+    def decode_compact_state(self, state_id):
+        """
+        Map a dense integer ID (see encode_state) back to a state.
+        :param state_id: state ID (int)
+        :return: CompactState
+        """
+        assert 0 <= state_id < self.get_num_state_ids(), "/!\\ ERROR: Invalid state ID given to decode_state()"
+        trap_bits, cell = divmod(state_id, self.n_cells)
+        row, col = divmod(cell, self.n_cols)
+        return CompactState(row, col, trap_bits)
+
+
+class TransitionModel(StateIdEncoding):
+    """
+    Table-driven transition model for a level, compiled from GameEnv.perform_action.
+
+    For each (cell, action) pair, perform_action is evaluated once for every combination of the trap statuses the
+    game rules can read from that cell, and the outcome is stored as (next cell, toggled trap bitmask), or None if the
+    action fails. Pairs for which perform_action raises an error (e.g. reading beyond the grid border) are left
+    uncompiled, and perform_action is called directly for them.
+
+    Attributes not defined here (grid layout, ACTION_COST, ACTIVATE, get_init_state, is_solved, targets, etc.) are
+    read from the wrapped environment.
+    """
+
+    def __init__(self, game_env, simulate=None):
+        """
+        :param game_env: GameEnv instance (only its unmodified API is used)
+        :param simulate: function (state, action) -> (success, next_state) giving the reference rules, or None to use
+            game_env.perform_action
+        """
+        self.game_env = game_env
+        self.simulate = simulate if simulate is not None else game_env.perform_action
+        self._init_encoding(game_env)
+        self._compile()
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the model; game_env is checked so unpickling cannot recurse
+        if name.startswith("__") or name == "game_env":
+            raise AttributeError(name)
+        return getattr(self.game_env, name)
+
+    # === Compilation ==================================================================================================
+    def _compile(self):
+        game_env = self.game_env
+        n_rows, n_cols = game_env.n_rows, game_env.n_cols
+
+        # Mirror trap_positions.index(), which returns the first matching index
+        trap_index = {}
+        for i, trap_pos in enumerate(game_env.trap_positions):
+            trap_index.setdefault(trap_pos, i)
+
+        # action_transitions[action][cell]: (dependency bitmask, dependency indices, {trap bits: outcome}) or None,
+        # where outcome is (next_row, next_col, toggled trap index or -1), or None if the action fails
+        action_transitions = {}
+        for action in self.ACTION_LIST:
+            action_transitions[action] = [
+                self._compile_transition(r, c, action, trap_index)
+                for r in range(n_rows)
+                for c in range(n_cols)
+            ]
+        self.action_transitions = action_transitions
+
+        # Per-cell view of the same table, used by get_successor_ids
+        cell_transitions = []
+        for cell in range(self.n_cells):
+            cell_entries = []
+            for action_index, action in enumerate(self.ACTION_LIST):
+                entry = action_transitions[action][cell]
+                if entry is None:
+                    cell_entries.append((action_index, None, None))
+                    continue
+                dep_mask, _, outcomes = entry
+                id_outcomes = {}
+                for key, outcome in outcomes.items():
+                    if outcome is None:
+                        id_outcomes[key] = None
+                    else:
+                        next_row, next_col, toggled = outcome
+                        id_outcomes[key] = (next_row * n_cols + next_col, 1 << toggled if toggled >= 0 else 0)
+                if all(outcome is None for outcome in id_outcomes.values()):
+                    # Action never succeeds from this cell
+                    continue
+                cell_entries.append((action_index, dep_mask, id_outcomes))
+            cell_transitions.append(tuple(cell_entries))
+        self.cell_transitions = cell_transitions
+
+        # Reverse view, used by get_predecessor_ids: reverse_transitions[next_cell] lists every
+        # (cell, action index, dependency bitmask, trap bits & dependency bitmask, toggled trap bitmask) reaching it.
+        # The player can never be in a solid cell, so transitions from or into one are left out
+        grid_data = game_env.grid_data
+        reverse_transitions = [[] for _ in range(self.n_cells)]
+        for cell, cell_entries in enumerate(cell_transitions):
+            row, col = divmod(cell, n_cols)
+            if grid_data[row][col] == game_env.SOLID_TILE:
+                continue
+            for action_index, dep_mask, outcomes in cell_entries:
+                if outcomes is None:
+                    # Uncompiled - the target cell is still fixed by the action, so record it for checking later
+                    d_row, d_col = self.ACTION_DELTAS[self.ACTION_LIST[action_index]]
+                    next_row, next_col = row + d_row, col + d_col
+                    if (
+                        0 <= next_row < n_rows
+                        and 0 <= next_col < n_cols
+                        and grid_data[next_row][next_col] != game_env.SOLID_TILE
+                    ):
+                        reverse_transitions[next_row * n_cols + next_col].append(
+                            (cell, action_index, None, None, None)
+                        )
+                    continue
+                for key, outcome in outcomes.items():
+                    if outcome is not None:
+                        next_cell, toggle = outcome
+                        if grid_data[next_cell // n_cols][next_cell % n_cols] == game_env.SOLID_TILE:
+                            continue
+                        reverse_transitions[next_cell].append((cell, action_index, dep_mask, key, toggle))
+        self.reverse_transitions = [tuple(entries) for entries in reverse_transitions]
+
+    def _compile_transition(self, row, col, action, trap_index):
+        """
+        Compile the outcomes of performing the given action from the given cell.
+        :param row, col: grid coordinates of the player
+        :param action: an element of GameEnv.ACTIONS
+        :param trap_index: mapping from trap position to index in trap_status
+        :return: (dependency bitmask, dependency indices, {trap bits: outcome}), or None if uncompilable
+        """
+        game_env = self.game_env
+        # Every trap position check_valid_action or check_collision may read from this cell
+        read_positions = (
+            (row + 1, col - 1),
+            (row + 1, col),
+            (row + 1, col + 1),
+            (row + 1, col - 2),
+            (row + 1, col + 2),
+            (row + 2, col),
+            (row, col),
+        )
+        deps = {trap_index[pos] for pos in read_positions if pos in trap_index}
+        if (row, col) in game_env.lever_map_positions:
+            lever_trap_pos = game_env.lever_map_positions[(row, col)]
+            if lever_trap_pos in trap_index:
+                deps.add(trap_index[lever_trap_pos])
+        deps = tuple(sorted(deps))
+
+        outcomes = {}
+        for combo in range(1 << len(deps)):
+            trap_status = [0] * self.n_traps
+            key = 0
+            for j, i in enumerate(deps):
+                if combo & (1 << j):
+                    trap_status[i] = 1
+                    key |= 1 << i
+            try:
+                success, next_state = self.simulate(self.state_class(row, col, tuple(trap_status)), action)
+            except (IndexError, ValueError):
+                # Reference rules cannot be evaluated here - always use them directly
+                return None
+
+            if not success:
+                outcomes[key] = None
+                continue
+            toggled = -1
+            for i in deps:
+                if next_state.trap_status[i] != trap_status[i]:
+                    toggled = i
+            outcomes[key] = (next_state.row, next_state.col, toggled)
+
+        dep_mask = 0
+        for i in deps:
+            dep_mask |= 1 << i
+        return dep_mask, deps, outcomes
+
+    def _simulate_id(self, state_id, action_index):
+        """
+        Apply the reference rules to a state ID, for transitions which could not be compiled.
+        :return: next state ID, or None if the action fails
+        """
+        try:
+            success, next_state = self.simulate(self.decode_state(state_id), self.ACTION_LIST[action_index])
+        except (IndexError, ValueError):
+            return None
+        return self.encode_state(next_state) if success else None
+
+    # === Successors and predecessors ==================================================================================
+    def get_successor_ids(self, state_id):
+        """
+        Get the outcome of every valid, collision free action from the given state, on dense state IDs (see
+        encode_state).
+        :param state_id: current state ID
+        :return: list of (action index into ACTION_LIST, next state ID) pairs
+        """
+        n_cells = self.n_cells
+        trap_bits, cell = divmod(state_id, n_cells)
+        successors = []
+        for action_index, dep_mask, outcomes in self.cell_transitions[cell]:
+            if outcomes is None:
+                next_id = self._simulate_id(state_id, action_index)
+                if next_id is not None:
+                    successors.append((action_index, next_id))
+                continue
+            outcome = outcomes[trap_bits & dep_mask]
+            if outcome is not None:
+                next_cell, toggle = outcome
+                successors.append((action_index, (trap_bits ^ toggle) * n_cells + next_cell))
+        return successors
+
+    def get_successor_ids_batch(self, state_ids):
+        """
+        Batched equivalent of get_successor_ids, for expanding many states per call (e.g. a breadth-first layer).
+        :param state_ids: sequence of state IDs
+        :return: (sources, action indices, next state IDs) parallel lists, with one entry per successor, where
+            sources[k] is the position in state_ids of the state which next_ids[k] was generated from
+        """
+        n_cells = self.n_cells
+        cell_transitions = self.cell_transitions
+        sources = []
+        action_indices = []
+        next_ids = []
+        add_source = sources.append
+        add_action = action_indices.append
+        add_next = next_ids.append
+        for position, state_id in enumerate(state_ids):
+            trap_bits, cell = divmod(state_id, n_cells)
+            for action_index, dep_mask, outcomes in cell_transitions[cell]:
+                if outcomes is None:
+                    next_id = self._simulate_id(state_id, action_index)
+                    if next_id is None:
+                        continue
+                else:
+                    outcome = outcomes[trap_bits & dep_mask]
+                    if outcome is None:
+                        continue
+                    next_id = (trap_bits ^ outcome[1]) * n_cells + outcome[0]
+                add_source(position)
+                add_action(action_index)
+                add_next(next_id)
+        return sources, action_indices, next_ids
+
+    def get_reachable_ids(self, max_states=None):
+        """
+        Breadth-first search from the initial state, one layer per get_successor_ids_batch call.
+        :param max_states: maximum number of state IDs to return, or None for every reachable state
+        :return: list of state IDs in breadth-first order (the initial state first)
+        """
+        init_id = self.encode_state(self.get_init_state())
+        seen = {init_id}
+        reachable = [init_id]
+        layer = [init_id]
+        while layer and (max_states is None or len(reachable) < max_states):
+            next_layer = []
+            for next_id in self.get_successor_ids_batch(layer)[2]:
+                if next_id not in seen:
+                    seen.add(next_id)
+                    next_layer.append(next_id)
+            reachable.extend(next_layer)
+            layer = next_layer
+        return reachable if max_states is None else reachable[:max_states]
+
+    def get_cell_transitions(self, cell):
+        """
+        Get the compiled transitions from the given cell.
+        :param cell: cell index (row * n_cols + col)
+        :return: tuple of (action index into ACTION_LIST, dependency bitmask, outcomes) triples, where outcomes maps
+            (trap bits & dependency bitmask) to (next cell index, toggled trap bitmask), or to None if the action
+            fails. outcomes is None if the action could not be compiled for this cell. Actions which never succeed
+            from this cell are omitted.
+        """
+        return self.cell_transitions[cell]
+
+    def get_relaxed_successors(self, cell):
+        """
+        Get every cell reachable in one action from the given cell under at least one trap configuration (i.e. with
+        traps relaxed to their most permissive status). Lever activations are omitted, as they do not move the player.
+        :param cell: cell index (row * n_cols + col)
+        :return: list of (action index into ACTION_LIST, next cell index) pairs
+        """
+        game_env = self.game_env
+        row, col = divmod(cell, game_env.n_cols)
+        successors = []
+        for action_index, dep_mask, outcomes in self.cell_transitions[cell]:
+            action = self.ACTION_LIST[action_index]
+            if action == game_env.ACTIVATE:
+                continue
+            if outcomes is None:
+                # Uncompiled - assume the move succeeds whenever its target is an in-bounds non-solid cell
+                d_row, d_col = self.ACTION_DELTAS[action]
+                next_row, next_col = row + d_row, col + d_col
+                if (
+                    0 <= next_row < game_env.n_rows
+                    and 0 <= next_col < game_env.n_cols
+                    and game_env.grid_data[next_row][next_col] != game_env.SOLID_TILE
+                ):
+                    successors.append((action_index, next_row * game_env.n_cols + next_col))
+                continue
+            next_cells = {outcome[0] for outcome in outcomes.values() if outcome is not None}
+            for next_cell in sorted(next_cells):
+                successors.append((action_index, next_cell))
+        return successors
+
+    def get_predecessor_ids(self, state_id):
+        """
+        Get every (action, previous state) pair for which performing the action in the previous state successfully
+        leads to the given state, on dense state IDs (see encode_state).
+        :param state_id: current state ID
+        :return: list of (action index into ACTION_LIST, previous state ID) pairs
+        """
+        n_cells = self.n_cells
+        trap_bits, next_cell = divmod(state_id, n_cells)
+        predecessors = []
+        for cell, action_index, dep_mask, key, toggle in self.reverse_transitions[next_cell]:
+            if dep_mask is None:
+                # Uncompiled - check the trap status the action could have toggled using the reference rules
+                prev_id = self._previous_trap_bits(cell, action_index, trap_bits) * n_cells + cell
+                if self._simulate_id(prev_id, action_index) == state_id:
+                    predecessors.append((action_index, prev_id))
+                continue
+            prev_trap_bits = trap_bits ^ toggle
+            if prev_trap_bits & dep_mask == key:
+                predecessors.append((action_index, prev_trap_bits * n_cells + cell))
+        return predecessors
+
+    def _previous_trap_bits(self, cell, action_index, trap_bits):
+        game_env = self.game_env
+        if self.ACTION_LIST[action_index] != game_env.ACTIVATE:
+            return trap_bits
+        row, col = divmod(cell, game_env.n_cols)
+        if (row, col) not in game_env.lever_map_positions:
+            return trap_bits
+        trap_pos = game_env.lever_map_positions[(row, col)]
+        return trap_bits ^ (1 << game_env.trap_positions.index(trap_pos))